@@ -1,7 +1,7 @@
+import argparse
 import ast
 import logging
 from pathlib import Path
-import shutil
 from tempfile import TemporaryDirectory, mkdtemp  # noqa: F401
 
 import libcst as cst
@@ -10,17 +10,21 @@ from ecooptimizer.utils.output_manager import LoggingManager
 from ecooptimizer.utils.output_manager import save_file, save_json_files, copy_file_to_output
 
 
-from ecooptimizer.api.routes.refactor_smell import ChangedFile, RefactoredData
+from ecooptimizer.data_types.refactored_data import ChangedFile, RefactoredData
 
-from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+from ecooptimizer.measurements.energy_meters import get_energy_meter
+from ecooptimizer.measurements.workloads import WORKLOADS, workload_script
 
 from ecooptimizer.analyzers.analyzer_controller import AnalyzerController
 
 from ecooptimizer.refactorers.refactorer_controller import RefactorerController
 
+from ecooptimizer.utils.workspace import Workspace
+
 from ecooptimizer import (
     SAMPLE_PROJ_DIR,
     SOURCE,
+    TEST_FILE,
 )
 
 from ecooptimizer.config import CONFIG
@@ -40,13 +44,37 @@ CONFIG["refactorLogger"] = refactor_logger
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Refactor the sample project's source file")
+    parser.add_argument(
+        "--workload",
+        choices=WORKLOADS,
+        default=CONFIG["workload"],
+        help="Measure the source file by executing it, its project's tests, or a command",
+    )
+    parser.add_argument(
+        "--workload-tests",
+        default=CONFIG["workloadTests"] or TEST_FILE.relative_to(SAMPLE_PROJ_DIR).as_posix(),
+        help="Pytest arguments run by the tests workload, by default the sample project's tests",
+    )
+    parser.add_argument(
+        "--workload-command",
+        default=CONFIG["workloadCommand"],
+        help="Command run from the project by the command workload; {file} is replaced by "
+        "the source file",
+    )
+    args = parser.parse_args()
+
+    CONFIG["workload"] = args.workload
+    CONFIG["workloadTests"] = args.workload_tests
+    CONFIG["workloadCommand"] = args.workload_command
+
     # Save ast
     save_file("source_ast.txt", ast.dump(ast.parse(SOURCE.read_text()), indent=4), "w")
     save_file("source_cst.txt", str(cst.parse_module(SOURCE.read_text())), "w")
 
     # Measure initial energy
-    energy_meter = CodeCarbonEnergyMeter()
-    energy_meter.measure_energy(Path(SOURCE))
+    energy_meter = get_energy_meter()
+    energy_meter.measure_energy(workload_script(SOURCE, SAMPLE_PROJ_DIR), SAMPLE_PROJ_DIR)
     initial_emissions = energy_meter.emissions
 
     if not initial_emissions:
@@ -83,17 +111,21 @@ def main():
 
             # source_copy = project_copy / SOURCE.name
 
-            shutil.copytree(SAMPLE_PROJ_DIR, source_copy)
+            # Files are cloned where the file system supports it, so the copy is cheap
+            Workspace.create(SAMPLE_PROJ_DIR, source_copy)
 
             try:
                 modified_files: list[Path] = refactorer_controller.run_refactorer(
-                    target_file_copy, source_copy, smell, overwrite=False
+                    target_file_copy,
+                    source_copy,
+                    smell,
+                    overwrite=False,
                 )
             except NotImplementedError as e:
                 print(e)
                 continue
 
-            energy_meter.measure_energy(target_file_copy)
+            energy_meter.measure_energy(workload_script(target_file_copy, source_copy), source_copy)
             final_emissions = energy_meter.emissions
 
             if not final_emissions:
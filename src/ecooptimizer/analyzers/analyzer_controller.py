@@ -1,33 +1,65 @@
 """Controller class for coordinating multiple code analysis tools."""
 
 # pyright: reportOptionalMemberAccess=false
+import ast
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import os
 from pathlib import Path
 import traceback
-from typing import Callable, Any
+from typing import TYPE_CHECKING, Callable, Any
 
 from ecooptimizer.data_types.smell_record import SmellRecord
 from ecooptimizer.config import CONFIG
+from ecooptimizer.data_types.project_analysis import ProjectAnalysis
 from ecooptimizer.data_types.smell import Smell
-from ecooptimizer.analyzers.pylint_analyzer import PylintAnalyzer
 from ecooptimizer.analyzers.ast_analyzer import ASTAnalyzer
 from ecooptimizer.analyzers.astroid_analyzer import AstroidAnalyzer
+from ecooptimizer.refactorers.multi_file_refactorer import (
+    collect_python_files,
+    load_ignore_patterns,
+)
+from ecooptimizer.utils.edit_ranges import EditRange, shift_line
+from ecooptimizer.utils.parsed_module import get_parsed_module
 from ecooptimizer.utils.smells_registry import retrieve_smell_registry
 
+if TYPE_CHECKING:
+    from ecooptimizer.analyzers.pylint_analyzer import PylintAnalyzer
+
 logger = CONFIG["detectLogger"]
 
+# Number of chunks each worker process receives on average during a project scan
+CHUNKS_PER_JOB = 4
+
+EnabledSmells = dict[str, dict[str, int | str]] | list[str]
+
+# Top-level statements whose smells are independent of the rest of the module
+ISOLATED_STATEMENTS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
 
 class AnalyzerController:
     """Orchestrates multiple code analysis tools and aggregates their results."""
 
     def __init__(self):
-        """Initializes analyzers for Pylint, AST, and Astroid analysis methods."""
-        self.pylint_analyzer = PylintAnalyzer()
+        """Initializes analyzers for AST and Astroid analysis methods.
+
+        The Pylint analyzer is created on first use, so the native analysis
+        backend never imports Pylint.
+        """
+        self._pylint_analyzer: PylintAnalyzer | None = None
         self.ast_analyzer = ASTAnalyzer()
         self.astroid_analyzer = AstroidAnalyzer()
 
-    def run_analysis(
-        self, file_path: Path, enabled_smells: dict[str, dict[str, int | str]] | list[str]
-    ) -> list[Smell]:
+    @property
+    def pylint_analyzer(self) -> "PylintAnalyzer":
+        """Analyzer running Pylint, created the first time a Pylint smell is detected."""
+        if self._pylint_analyzer is None:
+            from ecooptimizer.analyzers.pylint_analyzer import PylintAnalyzer
+
+            self._pylint_analyzer = PylintAnalyzer()
+        return self._pylint_analyzer
+
+    def run_analysis(self, file_path: Path, enabled_smells: EnabledSmells) -> list[Smell]:
         """Runs configured analyzers on a file and returns aggregated results.
 
         Args:
@@ -56,6 +88,9 @@ class AnalyzerController:
             logger.info("🟢 Starting analysis process")
             logger.info(f"📂 Analyzing file: {file_path}")
 
+            # Read and hash the file once; each parse tree is then built at most once
+            parsed_module = get_parsed_module(file_path) if ast_smells or astroid_smells else None
+
             if pylint_smells:
                 logger.info(f"🔍 Running Pylint analysis on {file_path}")
                 pylint_options = self.generate_pylint_options(pylint_smells)
@@ -66,14 +101,18 @@ class AnalyzerController:
             if ast_smells:
                 logger.info(f"🔍 Running AST analysis on {file_path}")
                 ast_options = self.generate_custom_options(ast_smells)
-                ast_results = self.ast_analyzer.analyze(file_path, ast_options)  # type: ignore
+                ast_results = self.ast_analyzer.analyze(file_path, ast_options, parsed_module)  # type: ignore
                 smells_data.extend(ast_results)
                 logger.info(f"✅ AST analysis completed. {len(ast_results)} smells detected.")
 
             if astroid_smells:
                 logger.info(f"🔍 Running Astroid analysis on {file_path}")
                 astroid_options = self.generate_custom_options(astroid_smells)
-                astroid_results = self.astroid_analyzer.analyze(file_path, astroid_options)  # type: ignore
+                astroid_results = self.astroid_analyzer.analyze(
+                    file_path,
+                    astroid_options,  # type: ignore
+                    parsed_module,
+                )
                 smells_data.extend(astroid_results)
                 logger.info(
                     f"✅ Astroid analysis completed. {len(astroid_results)} smells detected."
@@ -104,6 +143,164 @@ class AnalyzerController:
 
         return smells_data
 
+    def run_incremental_analysis(
+        self,
+        file_path: Path,
+        enabled_smells: EnabledSmells,
+        previous_smells: list[Smell] | None,
+        edit_ranges: list[EditRange] | None,
+    ) -> list[Smell]:
+        """Re-analyzes a file after an edit, visiting only the definitions it touched.
+
+        Smells from the previous analysis that lie outside the edited top-level
+        definitions are kept with their lines shifted to the new file. Detectors
+        only run over the definitions that overlap an edit. Falls back to a full
+        `run_analysis` whenever the shortcut could give a different result: no
+        previous results or edit ranges, smells not detected by the AST analyzer,
+        or edits touching module-level code outside any function or class.
+
+        Args:
+            file_path: Path to the edited Python file
+            enabled_smells: Dictionary or list specifying which smells to detect
+            previous_smells: Smells detected in the file before the edit
+            edit_ranges: Line ranges changed by the edit
+
+        Returns:
+            list[Smell]: All detected code smells, ordered by position in the file
+
+        Raises:
+            TypeError: If no smells are selected for detection
+        """
+        if not enabled_smells:
+            raise TypeError("At least one smell must be selected for detection.")
+
+        if previous_smells is None or edit_ranges is None:
+            return self.run_analysis(file_path, enabled_smells)
+
+        SMELL_REGISTRY = retrieve_smell_registry(enabled_smells)
+        ast_smells = self.filter_smells_by_method(SMELL_REGISTRY, "ast")
+        if not ast_smells or len(ast_smells) != sum(
+            smell["enabled"] for smell in SMELL_REGISTRY.values()
+        ):
+            return self.run_analysis(file_path, enabled_smells)
+
+        tree = get_parsed_module(file_path).ast_tree
+        changed: list[ast.stmt] = []
+        changed_spans: list[tuple[int, int]] = []
+        for stmt in tree.body:
+            start = min([stmt.lineno] + [dec.lineno for dec in getattr(stmt, "decorator_list", [])])
+            end = stmt.end_lineno or stmt.lineno
+            # A deletion leaves an empty range, which touches the statements around it,
+            # including one whose last lines were deleted and which now ends just before it
+            if not any(
+                start <= edit.new_end and edit.new_start - 1 <= end
+                if edit.new_start == edit.new_end
+                else start < edit.new_end and edit.new_start <= end
+                for edit in edit_ranges
+            ):
+                continue
+            if not isinstance(stmt, ISOLATED_STATEMENTS):
+                return self.run_analysis(file_path, enabled_smells)
+            changed.append(stmt)
+            changed_spans.append((start, end))
+
+        kept: list[Smell] = []
+        for smell in previous_smells:
+            occurences = []
+            for occurence in smell.occurences:
+                line = shift_line(occurence.line, edit_ranges)
+                end_line = (
+                    shift_line(occurence.endLine, edit_ranges)
+                    if occurence.endLine is not None
+                    else None
+                )
+                if line is None or (occurence.endLine is not None and end_line is None):
+                    break
+                if any(start <= line <= end for start, end in changed_spans):
+                    break
+                occurences.append(occurence.model_copy(update={"line": line, "endLine": end_line}))
+            else:
+                kept.append(smell.model_copy(update={"occurences": occurences}))
+
+        logger.info(
+            f"🔍 Re-analyzing {len(changed)} changed definition(s) in {file_path}, "
+            f"keeping {len(kept)} smell(s)"
+        )
+        ast_options = self.generate_custom_options(ast_smells)
+        new_smells = self.ast_analyzer.analyze_tree(
+            file_path,
+            ast_options,  # type: ignore
+            ast.Module(body=changed, type_ignores=[]),
+        )
+
+        return sorted(
+            kept + new_smells,
+            key=lambda smell: (
+                (smell.occurences[0].line, smell.occurences[0].column)
+                if smell.occurences
+                else (0, 0)
+            ),
+        )
+
+    def run_analysis_project(
+        self, root: Path, enabled_smells: EnabledSmells, jobs: int | None = None
+    ) -> ProjectAnalysis:
+        """Runs configured analyzers on every Python file of a project.
+
+        Files are discovered with the same ignore rules as `MultiFileRefactorer`.
+        With more than one job, files are split into chunks, largest files first,
+        and analyzed in a process pool.
+
+        Args:
+            root: Root directory of the project
+            enabled_smells: Dictionary or list specifying which smells to detect
+            jobs: Number of worker processes; defaults to the CPU count, 1 analyzes in-process
+
+        Returns:
+            ProjectAnalysis: Per-file results, per-file errors and aggregate counts
+
+        Raises:
+            TypeError: If no smells are selected for detection
+        """
+        if not enabled_smells:
+            raise TypeError("At least one smell must be selected for detection.")
+
+        files = collect_python_files(root, load_ignore_patterns())
+        files.sort(key=lambda file: file.stat().st_size, reverse=True)
+
+        jobs = min(jobs or os.cpu_count() or 1, len(files))
+        logger.info(f"📂 Analyzing {len(files)} files under {root} with {max(jobs, 1)} job(s)")
+
+        if jobs <= 1:
+            results = _analyze_files(self, files, enabled_smells)
+        else:
+            results = []
+            chunk_size = max(1, len(files) // (jobs * CHUNKS_PER_JOB))
+            chunks = [files[i : i + chunk_size] for i in range(0, len(files), chunk_size)]
+
+            # Spawned workers avoid inheriting locks held by other threads of this process
+            with ProcessPoolExecutor(
+                max_workers=jobs, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _analyze_chunk, chunk, enabled_smells, CONFIG["analysisBackend"]
+                    )
+                    for chunk in chunks
+                ]
+                for future in as_completed(futures):
+                    results.extend(future.result())
+
+        files_data = {path: smells for path, smells, error in results if error is None}
+        errors = {path: error for path, _, error in results if error is not None}
+
+        analysis = ProjectAnalysis.from_results(str(root), files_data, errors)  # type: ignore
+        logger.info(
+            f"🏁 Project analysis completed. {analysis.total_smells} smells found in "
+            f"{len(files_data)} files, {len(errors)} failed."
+        )
+        return analysis
+
     @staticmethod
     def filter_smells_by_method(
         smell_registry: dict[str, SmellRecord], method: str
@@ -159,3 +356,36 @@ class AnalyzerController:
             list[tuple]: List of (checker_function, options_dict) pairs
         """
         return [(smell["checker"], smell["analyzer_options"]) for smell in filtered_smells.values()]
+
+
+# Controller reused by every chunk a worker process analyzes
+_worker_controller: AnalyzerController | None = None
+
+
+def _analyze_files(
+    controller: AnalyzerController, files: list[Path], enabled_smells: EnabledSmells
+) -> list[tuple[str, list[Smell] | None, str | None]]:
+    """Analyzes files one by one, recording failures instead of raising.
+
+    Returns:
+        list[tuple]: (file path, detected smells, error message) for each file
+    """
+    results: list[tuple[str, list[Smell] | None, str | None]] = []
+    for file in files:
+        try:
+            results.append((str(file), controller.run_analysis(file, enabled_smells), None))
+        except Exception as e:
+            results.append((str(file), None, str(e)))
+    return results
+
+
+def _analyze_chunk(
+    files: list[Path], enabled_smells: EnabledSmells, backend: str
+) -> list[tuple[str, list[Smell] | None, str | None]]:
+    """Worker process entry point analyzing one chunk of a project scan."""
+    global _worker_controller
+    # Spawned workers start from the default configuration
+    CONFIG["analysisBackend"] = backend
+    if _worker_controller is None:
+        _worker_controller = AnalyzerController()
+    return _analyze_files(_worker_controller, files, enabled_smells)
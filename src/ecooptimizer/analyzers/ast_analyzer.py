@@ -1,24 +1,168 @@
 """AST-based code analysis framework for detecting code smells."""
 
-from typing import Callable, Any
+import ast
+from collections import deque
+from typing import Callable, Any, NamedTuple, TypeVar
 from pathlib import Path
-from ast import AST, parse
 
 from ecooptimizer.analyzers.base_analyzer import Analyzer
 from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.utils.parsed_module import ParsedModule, get_parsed_module
+
+# Statements that repeat the code nested under them
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+# Definitions that name the code nested under them, as in Pylint's message objects
+FRAME_NODES = (*FUNCTION_NODES, ast.ClassDef, ast.Lambda)
+
+
+class TraversalContext(NamedTuple):
+    """Position of a node within the module, as seen by detector callbacks.
+
+    A context is shared by every node under the same scope and is only rebuilt
+    when the traversal enters a function, class, lambda or loop.
+
+    Attributes:
+        loop_depth: Number of loops enclosing the node within its function
+        function: Innermost function definition enclosing the node, if any
+        scopes: Enclosing function and loop nodes, outermost first
+        frames: Enclosing function, class and lambda nodes, outermost first
+    """
+
+    loop_depth: int = 0
+    function: ast.FunctionDef | ast.AsyncFunctionDef | None = None
+    scopes: tuple[ast.AST, ...] = ()
+    frames: tuple[ast.AST, ...] = ()
+
+    @property
+    def qualified_name(self) -> str:
+        """Dotted names of the enclosing frames, with lambdas shown as `<lambda>`."""
+        return ".".join(getattr(frame, "name", "<lambda>") for frame in self.frames)
+
+    def enter(self, node: ast.AST) -> "TraversalContext":
+        """Builds the context seen by the children of a node.
+
+        Args:
+            node: Node whose children are about to be visited
+
+        Returns:
+            TraversalContext: The children's context, or this one if the node opens no scope
+        """
+        if isinstance(node, FUNCTION_NODES):
+            return TraversalContext(0, node, (*self.scopes, node), (*self.frames, node))
+        if isinstance(node, LOOP_NODES):
+            return TraversalContext(
+                self.loop_depth + 1, self.function, (*self.scopes, node), self.frames
+            )
+        if isinstance(node, FRAME_NODES):
+            return self._replace(frames=(*self.frames, node))
+        return self
+
+
+class ASTDetector:
+    """Base class for detectors driven by the shared single-pass traversal.
+
+    Subclasses define `visit_<NodeType>(node, context)` callbacks. Nodes are
+    delivered in the same breadth-first order as `ast.walk`, and `finish` is
+    called once the whole module has been visited.
+
+    Attributes:
+        file_path: Path of the module being analyzed
+        results: Smells reported so far
+    """
+
+    def __init__(self, file_path: Path):
+        """Initializes the detector for one module.
+
+        Args:
+            file_path: Path of the module being analyzed
+        """
+        self.file_path = file_path
+        self.results: list[Smell] = []
+
+    def finish(self) -> list[Smell]:
+        """Completes detection after the traversal and returns the detected smells."""
+        return self.results
+
+    def run(self, tree: ast.AST) -> list[Smell]:
+        """Runs this detector alone over a tree.
+
+        Args:
+            tree: Root of the module to analyze
+
+        Returns:
+            list[Smell]: Smells detected in the tree
+        """
+        return run_detectors(tree, [self])[0]
+
+
+DetectorT = TypeVar("DetectorT", bound=ASTDetector)
+
+
+def run_detectors(tree: ast.AST, detectors: list[ASTDetector]) -> list[list[Smell]]:
+    """Drives several detectors with a single breadth-first traversal of a tree.
+
+    Args:
+        tree: Root of the module to analyze
+        detectors: Detector instances to notify
+
+    Returns:
+        list[list[Smell]]: Smells found by each detector, in the order given
+    """
+    dispatch: dict[str, list[Callable[[ast.AST, TraversalContext], None]]] = {}
+    for detector in detectors:
+        for attr in dir(detector):
+            if attr.startswith("visit_"):
+                dispatch.setdefault(attr[6:], []).append(getattr(detector, attr))
+
+    if dispatch:
+        queue: deque[tuple[ast.AST, TraversalContext]] = deque([(tree, TraversalContext())])
+        while queue:
+            node, context = queue.popleft()
+            for callback in dispatch.get(node.__class__.__name__, ()):
+                callback(node, context)
+
+            child_context = context.enter(node)
+            queue.extend((child, child_context) for child in ast.iter_child_nodes(node))
+
+    return [detector.finish() for detector in detectors]
+
+
+def fused_detector(
+    detector_class: type[DetectorT],
+) -> Callable[[Callable[..., list[Any]]], Callable[..., list[Any]]]:
+    """Marks a detector function as an adapter around a fused detector class.
+
+    `ASTAnalyzer` instantiates the class with the function's options and runs it
+    in its shared traversal instead of calling the function.
+
+    Args:
+        detector_class: Detector class constructed as `detector_class(file_path, **options)`
+
+    Returns:
+        Callable: Decorator recording the class on the function
+    """
+
+    def decorator(func: Callable[..., list[Any]]) -> Callable[..., list[Any]]:
+        func.detector_class = detector_class  # type: ignore
+        return func
+
+    return decorator
 
 
 class ASTAnalyzer(Analyzer):
     """Analyzes Python source code using AST traversal to detect code smells.
 
-    This analyzer executes multiple detection functions on a parsed AST and
-    aggregates their results.
+    Detectors backed by an `ASTDetector` class share one traversal of the tree;
+    any other detector function is called on the tree directly. Results are
+    aggregated in the order the detectors were configured.
     """
 
     def analyze(
         self,
         file_path: Path,
-        extra_options: list[tuple[Callable[[Path, AST], list[Smell]], dict[str, Any]]],
+        extra_options: list[tuple[Callable[[Path, ast.AST], list[Smell]], dict[str, Any]]],
+        parsed_module: ParsedModule | None = None,
     ) -> list[Smell]:
         """Runs all configured detectors on the given source file.
 
@@ -26,17 +170,53 @@ class ASTAnalyzer(Analyzer):
             file_path: Path to the Python source file to analyze
             extra_options: List of detector functions with their parameters,
                           each as a tuple (detector_function, params_dict)
+            parsed_module: Already parsed source of the file; loaded from the shared
+                          cache when omitted
 
         Returns:
             list[Smell]: Aggregated list of all smells found by all detectors
         """
-        smells_data: list[Smell] = []
-        source_code = file_path.read_text()
-        tree = parse(source_code)
+        if parsed_module is None:
+            parsed_module = get_parsed_module(file_path)
+        return self.analyze_tree(file_path, extra_options, parsed_module.ast_tree)
 
+    def analyze_tree(
+        self,
+        file_path: Path,
+        extra_options: list[tuple[Callable[[Path, ast.AST], list[Smell]], dict[str, Any]]],
+        tree: ast.Module,
+    ) -> list[Smell]:
+        """Runs all configured detectors on an already parsed module or part of one.
+
+        Args:
+            file_path: Path to the Python source file the tree belongs to
+            extra_options: List of detector functions with their parameters,
+                          each as a tuple (detector_function, params_dict)
+            tree: Module to analyze; may hold only a subset of the file's statements
+
+        Returns:
+            list[Smell]: Aggregated list of all smells found by all detectors
+        """
+
+        # Each slot holds either a fused detector or the results of a standalone one
+        slots: list[ASTDetector | list[Smell]] = []
+        fused: list[ASTDetector] = []
         for detector, params in extra_options:
-            if callable(detector):
-                result = detector(file_path, tree, **params)
-                smells_data.extend(result)
+            if not callable(detector):
+                continue
+
+            detector_class = getattr(detector, "detector_class", None)
+            if isinstance(detector_class, type) and issubclass(detector_class, ASTDetector):
+                instance = detector_class(file_path, **params)
+                fused.append(instance)
+                slots.append(instance)
+            else:
+                slots.append(detector(file_path, tree, **params))
+
+        fused_results = dict(zip(map(id, fused), run_detectors(tree, fused)))
+
+        smells_data: list[Smell] = []
+        for slot in slots:
+            smells_data.extend(fused_results[id(slot)] if isinstance(slot, ASTDetector) else slot)
 
         return smells_data
@@ -1,47 +1,40 @@
 import ast
 from pathlib import Path
 
+from ecooptimizer.analyzers.ast_analyzer import ASTDetector, TraversalContext, fused_detector
 from ecooptimizer.utils.smell_enums import CustomSmell
 
 from ecooptimizer.data_types.smell import LECSmell
 from ecooptimizer.data_types.custom_fields import AdditionalInfo, Occurence
 
 
-def detect_long_element_chain(file_path: Path, tree: ast.AST, threshold: int = 5) -> list[LECSmell]:
-    """
-    Detects long element chains in the given Python code and returns a list of Smell objects.
-
-    Args:
-        file_path (Path): The file path to analyze.
-        tree (ast.AST): The Abstract Syntax Tree (AST) of the source code.
-        threshold (int): The minimum length of a dictionary chain. Default is 3.
+class LongElementChainDetector(ASTDetector):
+    """Reports subscript chains at least `threshold` elements long, once per line."""
 
-    Returns:
-        list[Smell]: A list of Smell objects, each containing details about a detected long chain.
-    """
-    # Initialize an empty list to store detected Smell objects
-    results: list[LECSmell] = []
-    used_lines = set()
+    def __init__(self, file_path: Path, threshold: int = 5):
+        super().__init__(file_path)
+        self.threshold = threshold
+        self.used_lines: set[int] = set()
 
-    # Function to calculate the length of a dictionary chain and detect long chains
-    def check_chain(node: ast.Subscript, chain_length: int = 0):
+    def visit_Subscript(self, node: ast.Subscript, context: TraversalContext):  # noqa: ARG002
         # Ensure each line is only reported once
-        if node.lineno in used_lines:
+        if node.lineno in self.used_lines:
             return
 
+        chain_length = 0
         current = node
         # Traverse through the chain to count its length
         while isinstance(current, ast.Subscript):
             chain_length += 1
             current = current.value
 
-        if chain_length >= threshold:
+        if chain_length >= self.threshold:
             # Create a descriptive message for the detected long chain
-            message = f"Dictionary chain too long ({chain_length}/{threshold})"
+            message = f"Dictionary chain too long ({chain_length}/{self.threshold})"
             # Instantiate a Smell object with details about the detected issue
             smell = LECSmell(
-                path=str(file_path),
-                module=file_path.stem,
+                path=str(self.file_path),
+                module=self.file_path.stem,
                 obj=None,
                 type="convention",
                 symbol="long-element-chain",
@@ -59,13 +52,21 @@ def detect_long_element_chain(file_path: Path, tree: ast.AST, threshold: int = 5
                 additionalInfo=AdditionalInfo(),
             )
 
-            used_lines.add(node.lineno)
-            results.append(smell)
+            self.used_lines.add(node.lineno)
+            self.results.append(smell)
 
-    # Traverse the AST to identify nodes representing dictionary chains
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Subscript):
-            check_chain(node)
 
-    # Return the list of detected Smell objects
-    return results
+@fused_detector(LongElementChainDetector)
+def detect_long_element_chain(file_path: Path, tree: ast.AST, threshold: int = 5) -> list[LECSmell]:
+    """
+    Detects long element chains in the given Python code and returns a list of Smell objects.
+
+    Args:
+        file_path (Path): The file path to analyze.
+        tree (ast.AST): The Abstract Syntax Tree (AST) of the source code.
+        threshold (int): The minimum length of a dictionary chain. Default is 3.
+
+    Returns:
+        list[Smell]: A list of Smell objects, each containing details about a detected long chain.
+    """
+    return LongElementChainDetector(file_path, threshold).run(tree)  # type: ignore
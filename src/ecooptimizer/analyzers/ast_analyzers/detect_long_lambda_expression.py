@@ -1,6 +1,7 @@
 import ast
 from pathlib import Path
 
+from ecooptimizer.analyzers.ast_analyzer import ASTDetector, TraversalContext, fused_detector
 from ecooptimizer.utils.smell_enums import CustomSmell
 
 from ecooptimizer.data_types.smell import LLESmell
@@ -51,30 +52,16 @@ def get_lambda_code(lambda_node: ast.Lambda) -> str:
     return f"lambda {args}: {body}"
 
 
-def detect_long_lambda_expression(
-    file_path: Path,
-    tree: ast.AST,
-    threshold_length: int = 100,
-    threshold_count: int = 5,
-) -> list[LLESmell]:
-    """
-    Detects lambda functions that are too long, either by the number of expressions or the total length in characters.
-
-    Args:
-        file_path (Path): The file path to analyze.
-        tree (ast.AST): The Abstract Syntax Tree (AST) of the source code.
-        threshold_length (int): The maximum number of characters allowed in the lambda expression.
-        threshold_count (int): The maximum number of expressions allowed inside the lambda function.
+class LongLambdaExpressionDetector(ASTDetector):
+    """Reports lambdas with too many sub-expressions or too many characters, once per line."""
 
-    Returns:
-        list[Smell]: A list of Smell objects, each containing details about detected long lambda functions.
-    """
-    # Initialize an empty list to store detected Smell objects
-    results: list[LLESmell] = []
-    used_lines = set()
+    def __init__(self, file_path: Path, threshold_length: int = 100, threshold_count: int = 5):
+        super().__init__(file_path)
+        self.threshold_length = threshold_length
+        self.threshold_count = threshold_count
+        self.used_lines: set[int] = set()
 
-    # Function to check the length of lambda expressions
-    def check_lambda(node: ast.Lambda):
+    def visit_Lambda(self, node: ast.Lambda, context: TraversalContext):  # noqa: ARG002
         """
         Analyzes a lambda node to check if it exceeds the specified thresholds
         for the number of expressions or total character length.
@@ -82,6 +69,10 @@ def detect_long_lambda_expression(
         Args:
             node (ast.Lambda): The lambda node to analyze.
         """
+        file_path = self.file_path
+        threshold_count = self.threshold_count
+        threshold_length = self.threshold_length
+
         # Count the number of expressions in the lambda body
         lambda_length = count_expressions(node.body)
 
@@ -109,10 +100,10 @@ def detect_long_lambda_expression(
                 additionalInfo=AdditionalInfo(),
             )
 
-            if node.lineno in used_lines:
+            if node.lineno in self.used_lines:
                 return
-            used_lines.add(node.lineno)
-            results.append(smell)
+            self.used_lines.add(node.lineno)
+            self.results.append(smell)
 
         # Convert the lambda function to a string and check its total length in characters
         lambda_code = get_lambda_code(node)
@@ -140,15 +131,29 @@ def detect_long_lambda_expression(
                 additionalInfo=AdditionalInfo(),
             )
 
-            if node.lineno in used_lines:
+            if node.lineno in self.used_lines:
                 return
-            used_lines.add(node.lineno)
-            results.append(smell)
+            self.used_lines.add(node.lineno)
+            self.results.append(smell)
 
-    # Walk through the AST to find lambda expressions
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Lambda):
-            check_lambda(node)
 
-    # Return the list of detected Smell objects
-    return results
+@fused_detector(LongLambdaExpressionDetector)
+def detect_long_lambda_expression(
+    file_path: Path,
+    tree: ast.AST,
+    threshold_length: int = 100,
+    threshold_count: int = 5,
+) -> list[LLESmell]:
+    """
+    Detects lambda functions that are too long, either by the number of expressions or the total length in characters.
+
+    Args:
+        file_path (Path): The file path to analyze.
+        tree (ast.AST): The Abstract Syntax Tree (AST) of the source code.
+        threshold_length (int): The maximum number of characters allowed in the lambda expression.
+        threshold_count (int): The maximum number of expressions allowed inside the lambda function.
+
+    Returns:
+        list[Smell]: A list of Smell objects, each containing details about detected long lambda functions.
+    """
+    return LongLambdaExpressionDetector(file_path, threshold_length, threshold_count).run(tree)  # type: ignore
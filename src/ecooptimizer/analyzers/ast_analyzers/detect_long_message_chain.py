@@ -1,6 +1,7 @@
 import ast
 from pathlib import Path
 
+from ecooptimizer.analyzers.ast_analyzer import ASTDetector, TraversalContext, fused_detector
 from ecooptimizer.utils.smell_enums import CustomSmell
 
 from ecooptimizer.data_types.smell import LMCSmell
@@ -29,6 +30,51 @@ def compute_chain_length(node: ast.expr) -> int:
         return 0
 
 
+class LongMessageChainDetector(ASTDetector):
+    """Reports method call chains at least `threshold` calls long, once per line."""
+
+    def __init__(self, file_path: Path, threshold: int = 5):
+        super().__init__(file_path)
+        self.threshold = threshold
+        self.used_lines: set[int] = set()
+
+    def visit_Call(self, node: ast.Call, context: TraversalContext):  # noqa: ARG002
+        # Check only method calls (Call node whose func is an Attribute)
+        if not isinstance(node.func, ast.Attribute):
+            return
+
+        length = compute_chain_length(node)
+        if length >= self.threshold:
+            line = node.lineno
+            # Make sure we haven’t already reported on this line
+            if line not in self.used_lines:
+                self.used_lines.add(line)
+
+                message = f"Method chain too long ({length}/{self.threshold})"
+                # Create the smell object
+                smell = LMCSmell(
+                    path=str(self.file_path),
+                    module=self.file_path.stem,
+                    obj=None,
+                    type="convention",
+                    symbol="long-message-chain",
+                    message=message,
+                    messageId=CustomSmell.LONG_MESSAGE_CHAIN.value,
+                    confidence="UNDEFINED",
+                    occurences=[
+                        Occurence(
+                            line=node.lineno,
+                            endLine=node.end_lineno,
+                            column=node.col_offset,
+                            endColumn=node.end_col_offset,
+                        )
+                    ],
+                    additionalInfo=AdditionalInfo(),
+                )
+                self.results.append(smell)
+
+
+@fused_detector(LongMessageChainDetector)
 def detect_long_message_chain(file_path: Path, tree: ast.AST, threshold: int = 5) -> list[LMCSmell]:
     """
     Detects long message chains in the given Python code.
@@ -41,43 +87,4 @@ def detect_long_message_chain(file_path: Path, tree: ast.AST, threshold: int = 5
     Returns:
         list[Smell]: A list of Smell objects, each containing details about the detected long chains.
     """
-    # Initialize an empty list to store detected Smell objects
-    results: list[LMCSmell] = []
-    used_lines = set()
-
-    # Walk through the AST to find method calls and attribute chains
-    for node in ast.walk(tree):
-        # Check only method calls (Call node whose func is an Attribute)
-        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-            length = compute_chain_length(node)
-            if length >= threshold:
-                line = node.lineno
-                # Make sure we haven’t already reported on this line
-                if line not in used_lines:
-                    used_lines.add(line)
-
-                    message = f"Method chain too long ({length}/{threshold})"
-                    # Create the smell object
-                    smell = LMCSmell(
-                        path=str(file_path),
-                        module=file_path.stem,
-                        obj=None,
-                        type="convention",
-                        symbol="long-message-chain",
-                        message=message,
-                        messageId=CustomSmell.LONG_MESSAGE_CHAIN.value,
-                        confidence="UNDEFINED",
-                        occurences=[
-                            Occurence(
-                                line=node.lineno,
-                                endLine=node.end_lineno,
-                                column=node.col_offset,
-                                endColumn=node.end_col_offset,
-                            )
-                        ],
-                        additionalInfo=AdditionalInfo(),
-                    )
-                    results.append(smell)
-
-    # Return the list of detected Smell objects
-    return results
+    return LongMessageChainDetector(file_path, threshold).run(tree)  # type: ignore
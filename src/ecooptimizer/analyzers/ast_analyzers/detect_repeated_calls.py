@@ -3,8 +3,10 @@ from collections import defaultdict
 from pathlib import Path
 import astor
 
+from ecooptimizer.analyzers.ast_analyzer import ASTDetector, TraversalContext, fused_detector
 from ecooptimizer.data_types.custom_fields import CRCInfo, Occurence
 from ecooptimizer.data_types.smell import CRCSmell
+from ecooptimizer.utils.parsed_module import get_source
 from ecooptimizer.utils.smell_enums import CustomSmell
 
 
@@ -31,115 +33,231 @@ def is_primitive_expression(node: ast.AST):
     return False
 
 
+def match_quote_style(source: str, function_call: str):
+    """Detect whether the function call uses single or double quotes in the source."""
+    if function_call.replace('"', "'") in source:
+        return "'"
+    return '"'
+
+
+# Fields that do not change how a node renders as source
+IGNORED_FIELDS = frozenset({"ctx", "kind", "type_comment"})
+
+
+class _ScopeCalls:
+    """Calls, call assignments and attribute writes collected for one function or loop.
+
+    Calls and objects are identified by structural keys rather than by their source.
+    """
+
+    def __init__(self):
+        self.assigned_calls: set[int] = set()
+        self.modified_objects: dict[int, int] = {}
+        self.calls: list[tuple[ast.Call, int, int | None, bool]] = []
+
+
+class RepeatedCallsDetector(ASTDetector):
+    """Reports calls repeated at least `threshold` times within a function or loop.
+
+    Every function and loop is a scope that sees all nodes nested under it.
+    Candidate calls are classified once when visited and counted per scope
+    once the traversal has collected every assignment in that scope.
+
+    Expressions are compared by structural keys: two nodes get the same key
+    exactly when they have the same type and fields, which is when they render
+    to the same source. Keys are interned, so each node is keyed once, in time
+    proportional to its own fields, and source is only rendered for reported calls.
+    """
+
+    def __init__(self, file_path: Path, threshold: int = 2):
+        super().__init__(file_path)
+        self.threshold = threshold
+        self.tree: ast.AST | None = None
+        self.scopes: dict[ast.AST, _ScopeCalls] = {}
+        self.keys: dict[ast.AST, int] = {}
+        self.interned: dict[tuple[object, ...], int] = {}
+        self.call_strings: dict[int, str] = {}
+        self._source_code: str | None = None
+
+    @property
+    def source_code(self) -> str:
+        """Source of the analyzed module, loaded the first time a call string is normalized."""
+        if self._source_code is None:
+            self._source_code = get_source(self.file_path, self.tree)  # type: ignore
+        return self._source_code
+
+    def structural_key(self, node: ast.AST) -> int:
+        """Returns the interned key of a node, computing it from its children's keys once."""
+        key = self.keys.get(node)
+        if key is None:
+            parts: list[object] = [node.__class__]
+            for name, value in ast.iter_fields(node):
+                if name not in IGNORED_FIELDS:
+                    parts.append(self._field_key(value))
+            key = self.interned.setdefault(tuple(parts), len(self.interned))
+            self.keys[node] = key
+        return key
+
+    def _field_key(self, value: object) -> object:
+        if isinstance(value, ast.AST):
+            return self.structural_key(value)
+        if isinstance(value, list):
+            return tuple(map(self._field_key, value))
+        # Keep the type so that equal values of different types (1, 1.0, True) stay distinct
+        return (value.__class__, value)
+
+    def call_string(self, call_key: int, call: ast.Call) -> str:
+        """Renders a reported call with the source's quote style, once per distinct call.
+
+        Args:
+            call_key: Structural key of the call
+            call: Any call with that key
+
+        Returns:
+            str: The call's source, quoted as in the analyzed module
+        """
+        call_string = self.call_strings.get(call_key)
+        if call_string is None:
+            call_string = astor.to_source(call).strip()
+            # The source is only searched for calls containing quotes
+            if "'" in call_string or '"' in call_string:
+                preferred_quote = match_quote_style(self.source_code, call_string)
+                call_string = call_string.replace("'", preferred_quote).replace(
+                    '"', preferred_quote
+                )
+            self.call_strings[call_key] = call_string
+        return call_string
+
+    def enclosing_scopes(self, context: TraversalContext) -> list[_ScopeCalls]:
+        return [self.scopes[scope] for scope in context.scopes if scope in self.scopes]
+
+    def visit_Module(self, node: ast.Module, context: TraversalContext):  # noqa: ARG002
+        self.tree = node
+
+    def visit_FunctionDef(self, node: ast.FunctionDef, context: TraversalContext):  # noqa: ARG002
+        self.scopes[node] = _ScopeCalls()
+
+    visit_For = visit_FunctionDef
+    visit_While = visit_FunctionDef
+
+    def visit_Assign(self, node: ast.Assign, context: TraversalContext):
+        scopes = self.enclosing_scopes(context)
+        if not scopes:
+            return
+
+        # Track assignments (only calls assigned to a variable should be considered)
+        if isinstance(node.value, ast.Call):
+            call_key = self.structural_key(node.value)
+            for scope in scopes:
+                scope.assigned_calls.add(call_key)
+
+        # Track object attribute modifications (e.g., obj.value = 10)
+        if isinstance(node.targets[0], ast.Attribute):
+            obj_key = self.structural_key(node.targets[0].value)
+            for scope in scopes:
+                scope.modified_objects[obj_key] = node.lineno
+
+    def visit_Call(self, node: ast.Call, context: TraversalContext):
+        scopes = self.enclosing_scopes(context)
+        if not scopes:
+            return
+
+        candidate = self.classify_call(node)
+        if candidate is None:
+            return
+
+        for scope in scopes:
+            scope.calls.append((node, *candidate))
+
+    def classify_call(self, node: ast.Call) -> tuple[int, int | None, bool] | None:
+        """Decides how a call is counted, independently of the scope it appears in.
+
+        Returns:
+            tuple: (call key, calling object key, counted unconditionally), or None to ignore
+                the call
+        """
+        # Ignore built-in functions when their argument is a primitive
+        if isinstance(node.func, ast.Name):
+            func_name = node.func.id
+
+            if func_name in IGNORED_CONSTRUCTORS:
+                return None
+
+            if func_name in IGNORED_PRIMITIVE_BUILTINS:
+                if len(node.args) == 1 and is_primitive_expression(node.args[0]):
+                    return None
+
+            if func_name in EXPENSIVE_BUILTINS:
+                if len(node.args) == 1 and not is_primitive_expression(node.args[0]):
+                    return self.structural_key(node), None, True
+                return None
+
+            # Check if it's a class by looking for capitalized names (heuristic)
+            if func_name[0].isupper():
+                return None
+
+        obj_key = (
+            self.structural_key(node.func.value) if isinstance(node.func, ast.Attribute) else None
+        )
+        return self.structural_key(node), obj_key, False
+
+    def finish(self) -> list[CRCSmell]:  # type: ignore
+        for scope in self.scopes.values():
+            call_counts: dict[int, list[ast.Call]] = defaultdict(list)
+
+            for call, call_key, obj_key, always_counted in scope.calls:
+                if always_counted:
+                    call_counts[call_key].append(call)
+                    continue
+
+                if obj_key is not None:
+                    if (
+                        obj_key in scope.modified_objects
+                        and scope.modified_objects[obj_key] < call.lineno
+                    ):
+                        continue
+
+                if call_key in scope.assigned_calls:
+                    call_counts[call_key].append(call)
+
+            self.report_repeated_calls(call_counts)
+
+        return self.results  # type: ignore
+
+    def report_repeated_calls(self, call_counts: dict[int, list[ast.Call]]):
+        file_path = self.file_path
+        threshold = self.threshold
+
+        # Identify repeated calls
+        for call_key, occurrences in call_counts.items():
+            if len(occurrences) >= threshold:
+                normalized_callString = self.call_string(call_key, occurrences[0])
+
+                smell = CRCSmell(
+                    path=str(file_path),
+                    type="performance",
+                    obj=None,
+                    module=file_path.stem,
+                    symbol="cached-repeated-calls",
+                    message=f"Repeated function call detected ({len(occurrences)}/{threshold}). Consider caching the result: {normalized_callString}",
+                    messageId=CustomSmell.CACHE_REPEATED_CALLS.value,
+                    confidence="HIGH" if len(occurrences) > threshold else "MEDIUM",
+                    occurences=[
+                        Occurence(
+                            line=occ.lineno,
+                            endLine=occ.end_lineno,
+                            column=occ.col_offset,
+                            endColumn=occ.end_col_offset,
+                        )
+                        for occ in occurrences
+                    ],
+                    additionalInfo=CRCInfo(
+                        repetitions=len(occurrences), callString=normalized_callString
+                    ),
+                )
+                self.results.append(smell)
+
+
+@fused_detector(RepeatedCallsDetector)
 def detect_repeated_calls(file_path: Path, tree: ast.AST, threshold: int = 2):
-    results: list[CRCSmell] = []
-
-    source_code = file_path.read_text()
-
-    def match_quote_style(source: str, function_call: str):
-        """Detect whether the function call uses single or double quotes in the source."""
-        if function_call.replace('"', "'") in source:
-            return "'"
-        return '"'
-
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.For, ast.While)):
-            call_counts: dict[str, list[ast.Call]] = defaultdict(list)
-            assigned_calls = set()
-            modified_objects = {}
-            call_lines = {}
-
-            # Track assignments (only calls assigned to a variable should be considered)
-            for subnode in ast.walk(node):
-                if isinstance(subnode, ast.Assign) and isinstance(subnode.value, ast.Call):
-                    call_repr = astor.to_source(subnode.value).strip()
-                    assigned_calls.add(call_repr)
-
-            # Track object attribute modifications (e.g., obj.value = 10)
-            for subnode in ast.walk(node):
-                if isinstance(subnode, ast.Assign) and isinstance(
-                    subnode.targets[0], ast.Attribute
-                ):
-                    obj_name = astor.to_source(subnode.targets[0].value).strip()
-                    modified_objects[obj_name] = subnode.lineno
-
-            # Track function calls
-            for subnode in ast.walk(node):
-                if isinstance(subnode, ast.Call):
-                    raw_call_string = astor.to_source(subnode).strip()
-                    call_line = subnode.lineno
-
-                    preferred_quote = match_quote_style(source_code, raw_call_string)
-                    callString = raw_call_string.replace("'", preferred_quote).replace(
-                        '"', preferred_quote
-                    )
-
-                    # Ignore built-in functions when their argument is a primitive
-                    if isinstance(subnode.func, ast.Name):
-                        func_name = subnode.func.id
-
-                        if func_name in IGNORED_CONSTRUCTORS:
-                            continue
-
-                        if func_name in IGNORED_PRIMITIVE_BUILTINS:
-                            if len(subnode.args) == 1 and is_primitive_expression(subnode.args[0]):
-                                continue
-
-                        if func_name in EXPENSIVE_BUILTINS:
-                            if len(subnode.args) == 1 and not is_primitive_expression(
-                                subnode.args[0]
-                            ):
-                                call_counts[callString].append(subnode)
-                            continue
-
-                        # Check if it's a class by looking for capitalized names (heuristic)
-                        if func_name[0].isupper():
-                            continue
-
-                    obj_name = (
-                        astor.to_source(subnode.func.value).strip()
-                        if isinstance(subnode.func, ast.Attribute)
-                        else None
-                    )
-
-                    if obj_name:
-                        if obj_name in modified_objects and modified_objects[obj_name] < call_line:
-                            continue
-
-                    if raw_call_string in assigned_calls:
-                        call_counts[raw_call_string].append(subnode)
-                        call_lines[raw_call_string] = call_line
-
-            # Identify repeated calls
-            for callString, occurrences in call_counts.items():
-                if len(occurrences) >= threshold:
-                    preferred_quote = match_quote_style(source_code, callString)
-                    normalized_callString = callString.replace("'", preferred_quote).replace(
-                        '"', preferred_quote
-                    )
-
-                    smell = CRCSmell(
-                        path=str(file_path),
-                        type="performance",
-                        obj=None,
-                        module=file_path.stem,
-                        symbol="cached-repeated-calls",
-                        message=f"Repeated function call detected ({len(occurrences)}/{threshold}). Consider caching the result: {normalized_callString}",
-                        messageId=CustomSmell.CACHE_REPEATED_CALLS.value,
-                        confidence="HIGH" if len(occurrences) > threshold else "MEDIUM",
-                        occurences=[
-                            Occurence(
-                                line=occ.lineno,
-                                endLine=occ.end_lineno,
-                                column=occ.col_offset,
-                                endColumn=occ.end_col_offset,
-                            )
-                            for occ in occurrences
-                        ],
-                        additionalInfo=CRCInfo(
-                            repetitions=len(occurrences), callString=normalized_callString
-                        ),
-                    )
-                    results.append(smell)
-
-    return results
+    return RepeatedCallsDetector(file_path, threshold).run(tree)
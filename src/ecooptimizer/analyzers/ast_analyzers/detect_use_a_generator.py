@@ -0,0 +1,94 @@
+import ast
+from pathlib import Path
+
+from ecooptimizer.analyzers.ast_analyzer import ASTDetector, TraversalContext, fused_detector
+from ecooptimizer.utils.module_names import dotted_module_name
+from ecooptimizer.utils.smell_enums import PylintSmell
+
+from ecooptimizer.data_types.smell import UGESmell
+from ecooptimizer.data_types.custom_fields import AdditionalInfo, Occurence
+
+# Builtins that consume an iterable lazily and can stop early
+GENERATOR_CALLS = frozenset({"any", "all"})
+
+
+def is_asynchronous_comprehension(comp: ast.ListComp) -> bool:
+    """Checks whether a comprehension would become an asynchronous generator.
+
+    That is the case when it uses `async for`, or awaits anywhere but in its
+    outermost iterable, the only part evaluated outside of the generator.
+    """
+    if any(generator.is_async for generator in comp.generators):
+        return True
+
+    outermost_iterable = comp.generators[0].iter
+    outermost_nodes = set(map(id, ast.walk(outermost_iterable)))
+    return any(
+        isinstance(node, ast.Await) and id(node) not in outermost_nodes for node in ast.walk(comp)
+    )
+
+
+class UseAGeneratorDetector(ASTDetector):
+    """Reports `any`/`all` calls whose only positional argument is a list comprehension.
+
+    Mirrors Pylint's `use-a-generator` (R1729) check, including its message,
+    position and object name.
+    """
+
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        self.module = dotted_module_name(file_path)
+
+    def visit_Call(self, node: ast.Call, context: TraversalContext):
+        if not (
+            isinstance(node.func, ast.Name)
+            and node.func.id in GENERATOR_CALLS
+            and len(node.args) == 1
+            and isinstance(node.args[0], ast.ListComp)
+        ):
+            return
+
+        comp = node.args[0]
+        if is_asynchronous_comprehension(comp):
+            return
+
+        inside_comp = ast.unparse(comp)[1:-1]  # remove square brackets '[]'
+        if node.keywords:
+            inside_comp = f"({inside_comp}), " + ", ".join(map(ast.unparse, node.keywords))
+
+        self.results.append(
+            UGESmell(
+                path=str(self.file_path.absolute()),
+                module=self.module,
+                obj=context.qualified_name,
+                type="refactor",
+                symbol="use-a-generator",
+                message=f"Use a generator instead '{node.func.id}({inside_comp})'",
+                messageId=PylintSmell.USE_A_GENERATOR.value,
+                confidence="HIGH",
+                occurences=[
+                    Occurence(
+                        line=node.lineno,
+                        endLine=node.end_lineno,
+                        column=node.col_offset,
+                        endColumn=node.end_col_offset,
+                    )
+                ],
+                additionalInfo=AdditionalInfo(),
+            )
+        )
+
+
+@fused_detector(UseAGeneratorDetector)
+def detect_use_a_generator(file_path: Path, tree: ast.AST) -> list[UGESmell]:
+    """
+    Detects `any`/`all` calls over list comprehensions that could use a generator.
+
+    Args:
+        file_path (Path): The file path to analyze.
+        tree (ast.AST): The Abstract Syntax Tree (AST) of the source code.
+
+    Returns:
+        list[Smell]: A list of Smell objects, one per call that should use a generator.
+    """
+    return UseAGeneratorDetector(file_path).run(tree)
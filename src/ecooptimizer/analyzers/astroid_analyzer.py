@@ -2,10 +2,11 @@
 
 from typing import Callable, Any
 from pathlib import Path
-from astroid import nodes, parse
+from astroid import nodes
 
 from ecooptimizer.analyzers.base_analyzer import Analyzer
 from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.utils.parsed_module import ParsedModule, get_parsed_module
 
 
 class AstroidAnalyzer(Analyzer):
@@ -24,6 +25,7 @@ class AstroidAnalyzer(Analyzer):
                 dict[str, Any],
             ]
         ],
+        parsed_module: ParsedModule | None = None,
     ) -> list[Smell]:
         """Runs all configured detectors on the given source file.
 
@@ -31,13 +33,16 @@ class AstroidAnalyzer(Analyzer):
             file_path: Path to the Python source file to analyze
             extra_options: List of detector functions with their parameters as
                           tuples of (detector_function, params_dict)
+            parsed_module: Already parsed source of the file; loaded from the shared
+                          cache when omitted
 
         Returns:
             list[Smell]: Combined list of all smells detected by all detectors
         """
         smells_data: list[Smell] = []
-        source_code = file_path.read_text()
-        tree = parse(source_code)
+        if parsed_module is None:
+            parsed_module = get_parsed_module(file_path)
+        tree = parsed_module.astroid_module
 
         for detector, params in extra_options:
             if callable(detector):
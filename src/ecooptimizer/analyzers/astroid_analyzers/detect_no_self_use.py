@@ -0,0 +1,153 @@
+from pathlib import Path
+
+from astroid import InferenceError, nodes
+
+from ecooptimizer.analyzers.astroid_analyzers.detect_too_many_arguments import (
+    frame_name,
+    function_occurence,
+)
+from ecooptimizer.data_types.custom_fields import AdditionalInfo
+from ecooptimizer.data_types.smell import MIMSmell
+from ecooptimizer.utils.module_names import dotted_module_name
+from ecooptimizer.utils.smell_enums import PylintSmell
+
+PROPERTY_CLASSES = frozenset({"builtins.property", "functools.cached_property"})
+OVERLOAD_DECORATORS = frozenset({"typing.overload", "overload"})
+TYPING_PROTOCOLS = frozenset({"typing.Protocol", "typing_extensions.Protocol", ".Protocol"})
+
+
+def _is_special_method(name: str) -> bool:
+    return len(name) > 4 and name.startswith("__") and name.endswith("__")
+
+
+def _uses_first_argument(node: nodes.FunctionDef, first_arg: str) -> bool:
+    """Checks whether a method body names its first argument.
+
+    Methods of nested classes are skipped, since they have their own first argument.
+    """
+    stack = list(node.get_children())
+    while stack:
+        child = stack.pop()
+        if isinstance(child, nodes.Name) and child.name == first_arg:
+            return True
+        if isinstance(child, nodes.FunctionDef) and child.is_method():
+            continue
+        stack.extend(child.get_children())
+    return False
+
+
+def _inferred_decorators(node: nodes.FunctionDef) -> list[nodes.NodeNG]:
+    inferred: list[nodes.NodeNG] = []
+    for decorator in node.decorators.nodes if node.decorators else []:
+        if isinstance(decorator, nodes.Call):
+            decorator = decorator.func
+        try:
+            inferred.extend(decorator.infer())
+        except InferenceError:
+            continue
+    return inferred
+
+
+def _is_property_or_overload(node: nodes.FunctionDef) -> bool:
+    for inferred in _inferred_decorators(node):
+        if isinstance(inferred, nodes.ClassDef) and (
+            inferred.qname() in PROPERTY_CLASSES
+            or any(
+                ancestor.name == "property" and ancestor.root().name == "builtins"
+                for ancestor in inferred.ancestors()
+            )
+        ):
+            return True
+        if isinstance(inferred, (nodes.ClassDef, nodes.FunctionDef)) and (
+            inferred.name in OVERLOAD_DECORATORS or inferred.qname() in OVERLOAD_DECORATORS
+        ):
+            return True
+    return False
+
+
+def _overrides_a_method(class_node: nodes.ClassDef, name: str) -> bool:
+    return any(
+        ancestor.name != "object"
+        and name in ancestor
+        and isinstance(ancestor[name], nodes.FunctionDef)
+        for ancestor in class_node.ancestors()
+    )
+
+
+def _is_protocol_class(class_node: nodes.ClassDef) -> bool:
+    if class_node.qname() in TYPING_PROTOCOLS:
+        return True
+    for base in class_node.bases:
+        try:
+            if any(inferred.qname() in TYPING_PROTOCOLS for inferred in base.infer()):
+                return True
+        except InferenceError:
+            continue
+    return False
+
+
+def _has_bare_super_call(node: nodes.FunctionDef) -> bool:
+    return any(
+        isinstance(call.func, nodes.Name) and call.func.name == "super" and not call.args
+        for call in node.nodes_of_class(nodes.Call)
+    )
+
+
+def detect_no_self_use(file_path: Path, tree: nodes.Module) -> list[MIMSmell]:
+    """
+    Detects methods that never use their instance and could be functions.
+
+    Mirrors Pylint's `no-self-use` (R6301) extension: special, abstract, property,
+    overload and protocol methods, methods overriding a base class method and
+    methods calling `super()` are not reported.
+
+    Args:
+        file_path (Path): The file path to analyze.
+        tree (nodes.Module): The parsed Astroid tree of the source code.
+
+    Returns:
+        list[Smell]: A list of Smell objects, one per method that ignores its instance.
+    """
+    smells: list[MIMSmell] = []
+    module = dotted_module_name(file_path)
+
+    for node in tree.nodes_of_class(nodes.FunctionDef):
+        if not node.is_method() or node.type != "method" or _is_special_method(node.name):
+            continue
+
+        if node.args.posonlyargs:
+            first_arg = node.args.posonlyargs[0].name
+        elif node.args.args:
+            first_arg = node.argnames()[0]
+        else:
+            continue
+
+        if _uses_first_argument(node, first_arg):
+            continue
+
+        class_node = node.parent.frame()
+        if (
+            node.is_abstract()
+            or _overrides_a_method(class_node, node.name)
+            or _is_property_or_overload(node)
+            or _has_bare_super_call(node)
+            or _is_protocol_class(class_node)
+        ):
+            continue
+
+        smells.append(
+            MIMSmell(
+                path=str(file_path.absolute()),
+                module=module,
+                obj=frame_name(node),
+                type="refactor",
+                symbol="no-self-use",
+                message="Method could be a function",
+                messageId=PylintSmell.NO_SELF_USE.value,
+                confidence="INFERENCE",
+                occurences=[function_occurence(node)],
+                additionalInfo=AdditionalInfo(),
+            )
+        )
+
+    return smells
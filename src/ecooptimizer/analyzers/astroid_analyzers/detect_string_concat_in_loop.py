@@ -1,15 +1,75 @@
+from collections import defaultdict
 from pathlib import Path
 import re
-from typing import Any
-from astroid import nodes, util, parse, extract_node, AttributeInferenceError
+from typing import Any, Callable
+from astroid import nodes, util, extract_node, AttributeInferenceError
 
 from ecooptimizer.config import CONFIG
 from ecooptimizer.data_types.custom_fields import Occurence, SCLInfo
 from ecooptimizer.data_types.smell import SCLSmell
+from ecooptimizer.utils.parsed_module import get_source, parse_source
 from ecooptimizer.utils.smell_enums import CustomSmell
+from ecooptimizer.utils.tracing import get_tracer
 
 logger = CONFIG["detectLogger"]
 
+# Nodes that can name a concatenation target, by how they are bucketed in a reference index
+_NAME_NODES = (nodes.Name, nodes.AssignName, nodes.DelName)
+_ATTRIBUTE_NODES = (nodes.Attribute, nodes.AssignAttr, nodes.DelAttr)
+
+
+class ReferenceIndex:
+    """Every use of a name, attribute or subscript within one function, class or module.
+
+    The frame's tree is walked once; nodes are bucketed by the name or attribute
+    they end with, so the uses of a target are found with one lookup and a
+    comparison of the few nodes sharing its last name. Nested frames are
+    included, as code in them can read the target too.
+    """
+
+    def __init__(self, frame: nodes.NodeNG, node_string: Callable[[nodes.NodeNG], str]):
+        """Indexes a frame.
+
+        Args:
+            frame: Function, class or module whose uses are indexed
+            node_string: Memoized renderer for nodes of the frame
+        """
+        self.node_string = node_string
+        self.names: dict[str, list[nodes.NodeNG]] = defaultdict(list)
+        self.attributes: dict[str, list[nodes.NodeNG]] = defaultdict(list)
+        self.subscripts: list[nodes.Subscript] = []
+
+        stack = [frame]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _NAME_NODES):
+                self.names[node.name].append(node)
+            elif isinstance(node, _ATTRIBUTE_NODES):
+                self.attributes[node.attrname].append(node)
+            elif isinstance(node, nodes.Subscript):
+                self.subscripts.append(node)
+            stack.extend(node.get_children())
+
+    def references(self, target: nodes.NodeNG) -> list[nodes.NodeNG]:
+        """Returns the nodes naming the same variable, attribute or element as a target.
+
+        Args:
+            target: Assignment target to look up
+
+        Returns:
+            list[NodeNG]: Loads, stores and deletions of the target, in no particular order
+        """
+        if isinstance(target, _NAME_NODES):
+            return self.names.get(target.name, [])
+
+        if isinstance(target, _ATTRIBUTE_NODES):
+            candidates = self.attributes.get(target.attrname, [])
+        else:
+            candidates = self.subscripts
+
+        target_string = self.node_string(target)
+        return [node for node in candidates if self.node_string(node) == target_string]
+
 
 def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
     """
@@ -24,18 +84,30 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
     """
     smells: list[SCLSmell] = []
     in_loop_counter = 0
+    node_strings: dict[nodes.NodeNG, str] = {}
+    reference_indexes: dict[nodes.NodeNG, ReferenceIndex] = {}
     current_loops: list[nodes.NodeNG] = []
     current_smells: dict[str, tuple[int, int]] = {}
+    trace = get_tracer("string-concat-loop", logger)
 
-    logger.debug(f"Starting analysis of file: {file_path}")
-    logger.debug(
-        f"Initial state - smells: {smells}, in_loop_counter: {in_loop_counter}, current_loops: {current_loops}, current_smells: {current_smells}"
+    trace(lambda: f"Starting analysis of file: {file_path}")
+    trace(
+        lambda: (
+            f"Initial state - smells: {smells}, in_loop_counter: {in_loop_counter}, current_loops: {current_loops}, current_smells: {current_smells}"
+        )
     )
 
+    def node_string(node: nodes.NodeNG) -> str:
+        """Renders a node as source, once per node."""
+        rendered = node_strings.get(node)
+        if rendered is None:
+            rendered = node_strings[node] = node.as_string()
+        return rendered
+
     def create_smell(node: nodes.Assign):
         nonlocal current_loops, current_smells
 
-        logger.debug(f"Creating smell for node: {node.as_string()}")
+        trace(lambda: f"Creating smell for node: {node_string(node)}", line=node.lineno)
         if node.lineno and node.col_offset:
             smell = SCLSmell(
                 path=str(file_path),
@@ -49,16 +121,16 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
                 occurences=[create_smell_occ(node)],
                 additionalInfo=SCLInfo(
                     innerLoopLine=current_loops[
-                        current_smells[node.targets[0].as_string()][1]
+                        current_smells[node_string(node.targets[0])][1]
                     ].lineno,  # type: ignore
-                    concatTarget=node.targets[0].as_string(),
+                    concatTarget=node_string(node.targets[0]),
                 ),
             )
             smells.append(smell)
-            logger.debug(f"Added smell: {smell}")
+            trace(lambda: f"Added smell: {smell}")
 
     def create_smell_occ(node: nodes.Assign | nodes.AugAssign) -> Occurence:
-        logger.debug(f"Creating occurrence for node: {node.as_string()}")
+        trace(lambda: f"Creating occurrence for node: {node_string(node)}")
         return Occurence(
             line=node.lineno,  # type: ignore
             endLine=node.end_lineno,
@@ -69,26 +141,28 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
     def visit(node: nodes.NodeNG):
         nonlocal smells, in_loop_counter, current_loops, current_smells
 
-        logger.debug(f"Visiting node: {node.as_string()}")
+        trace(lambda: f"Visiting {node.__class__.__name__} node at line {node.lineno}")
         if isinstance(node, (nodes.For, nodes.While)):
             in_loop_counter += 1
             current_loops.append(node)
-            logger.debug(
-                f"Entered loop. in_loop_counter: {in_loop_counter}, current_loops: {current_loops}"
+            trace(
+                lambda: (
+                    f"Entered loop. in_loop_counter: {in_loop_counter}, current_loops: {current_loops}"
+                )
             )
 
             for stmt in node.body:
                 visit(stmt)
 
             in_loop_counter -= 1
-            logger.debug(f"Exited loop. in_loop_counter: {in_loop_counter}")
+            trace(lambda: f"Exited loop. in_loop_counter: {in_loop_counter}")
 
             current_smells = {
                 key: val for key, val in current_smells.items() if val[1] != in_loop_counter
             }
             current_loops.pop()
-            logger.debug(
-                f"Updated current_smells: {current_smells}, current_loops: {current_loops}"
+            trace(
+                lambda: f"Updated current_smells: {current_smells}, current_loops: {current_loops}"
             )
 
         elif in_loop_counter > 0 and isinstance(node, nodes.Assign):
@@ -96,36 +170,40 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
             value = None
 
             if len(node.targets) != 1:
-                logger.debug(f"Skipping node due to multiple targets: {node.as_string()}")
+                trace(lambda: f"Skipping node due to multiple targets: {node_string(node)}")
                 return
 
             target = node.targets[0]
             value = node.value
-            logger.debug(
-                f"Processing assignment node. target: {target.as_string()}, value: {value.as_string()}"
+            trace(
+                lambda: (
+                    f"Processing assignment node. target: {node_string(target)}, value: {node_string(value)}"
+                )
             )
 
             if target and isinstance(value, nodes.BinOp) and value.op == "+":
-                logger.debug(
-                    f"Found binary operation with '+' in loop. target: {target.as_string()}, value: {value.as_string()}"
+                trace(
+                    lambda: (
+                        f"Found binary operation with '+' in loop. target: {node_string(target)}, value: {node_string(value)}"
+                    )
                 )
                 if (
-                    target.as_string() not in current_smells
+                    node_string(target) not in current_smells
                     and is_string_type(node)
                     and is_concatenating_with_self(value, target)
                     and is_not_referenced(node)
                 ):
-                    current_smells[target.as_string()] = (
+                    current_smells[node_string(target)] = (
                         len(smells),
                         in_loop_counter - 1,
                     )
-                    logger.debug(f"Adding new smell to current_smells: {current_smells}")
+                    trace(lambda: f"Adding new smell to current_smells: {current_smells}")
                     create_smell(node)
-                elif target.as_string() in current_smells and is_concatenating_with_self(
+                elif node_string(target) in current_smells and is_concatenating_with_self(
                     value, target
                 ):
-                    smell_id = current_smells[target.as_string()][0]
-                    logger.debug(f"Updating existing smell with id: {smell_id}")
+                    smell_id = current_smells[node_string(target)][0]
+                    trace(lambda: f"Updating existing smell with id: {smell_id}")
                     smells[smell_id].occurences.append(create_smell_occ(node))
         else:
             for child in node.get_children():
@@ -134,40 +212,56 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
     def is_not_referenced(node: nodes.Assign):
         nonlocal current_loops
 
-        logger.debug(f"Checking if node is referenced: {node.as_string()}")
-        loop_source_str = current_loops[-1].as_string()
-        loop_source_str = loop_source_str.replace(node.as_string(), "", 1)
-        lines = loop_source_str.splitlines()
-        for line in lines:
-            if (
-                line.find(node.targets[0].as_string()) != -1
-                and re.search(rf"\b{re.escape(node.targets[0].as_string())}\b\s*=", line) is None
+        loop = current_loops[-1]
+        frame = loop.frame()
+        index = reference_indexes.get(frame)
+        if index is None:
+            index = reference_indexes[frame] = ReferenceIndex(frame, node_string)
+
+        target_name = node_string(node.targets[0])
+        for reference in index.references(node.targets[0]):
+            if not loop.parent_of(reference):
+                continue
+
+            # Reassignments of the target, including this one, do not read it
+            statement = reference.statement()
+            if isinstance(statement, nodes.Assign) and any(
+                node_string(target) == target_name for target in statement.targets
             ):
-                logger.debug(f"Node is referenced in line: {line}")
-                return False
-        logger.debug("Node is not referenced in loop")
+                continue
+
+            if trace:
+                trace(
+                    f"{target_name} is referenced at line {reference.lineno}",
+                    line=reference.lineno,
+                )
+            return False
+
+        trace(lambda: f"{target_name} is not referenced in loop")
         return True
 
     def is_concatenating_with_self(binop_node: nodes.BinOp, target: nodes.NodeNG):
         """Check if the BinOp node includes the target variable being added."""
-        logger.debug(
-            f"Checking if binop_node is concatenating with self: {binop_node.as_string()}, target: {target.as_string()}"
+        trace(
+            lambda: (
+                f"Checking if binop_node is concatenating with self: {node_string(binop_node)}, target: {node_string(target)}"
+            )
         )
 
         def is_same_variable(var1: nodes.NodeNG, var2: nodes.NodeNG):
             if isinstance(var1, nodes.Name) and isinstance(var2, nodes.AssignName):
                 return var1.name == var2.name
             if isinstance(var1, nodes.Attribute) and isinstance(var2, nodes.AssignAttr):
-                return var1.as_string() == var2.as_string()
+                return node_string(var1) == node_string(var2)
             if isinstance(var1, nodes.Subscript) and isinstance(var2, nodes.Subscript):
                 if isinstance(var1.slice, nodes.Const) and isinstance(var2.slice, nodes.Const):
-                    return var1.as_string() == var2.as_string()
+                    return node_string(var1) == node_string(var2)
             if isinstance(var1, nodes.BinOp) and var1.op == "+":
                 return is_same_variable(var1.left, target) or is_same_variable(var1.right, target)
             return False
 
         left, right = binop_node.left, binop_node.right
-        logger.debug(f"Left: {left.as_string()}, Right: {right.as_string()}")
+        trace(lambda: f"Left: {node_string(left)}, Right: {node_string(right)}")
         return is_same_variable(left, target) or is_same_variable(right, target)
 
     def is_string_type(
@@ -178,17 +272,17 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
             visited = set()
 
         target = node.targets[0]
-        target_name = target.as_string()
+        target_name = node_string(target)
         scope = node.scope()
 
         if (target_name, scope) in visited:
-            logger.debug(f"Cycle detected for {target_name}")
+            trace(lambda: f"Cycle detected for {target_name}")
             return False
 
-        logger.debug(f"Checking string type for {target_name}")
+        trace(lambda: f"Checking string type for {target_name}")
 
         # Check explicit type hints first
-        logger.debug("Checking explicit type hints")
+        trace("Checking explicit type hints")
         if has_type_hints_str(node, target, visited):
             return True
 
@@ -196,10 +290,10 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
         # Check for string format with % operator
         if has_percent_format(node.value):
-            logger.debug(f"String format with % operator found: {node.as_string()}")
+            trace(lambda: f"String format with % operator found: {node_string(node)}")
             return True
 
-        logger.debug("Checking inferred types")
+        trace("Checking inferred types")
         # Check inferred type
         try:
             inferred_types = list(node.value.infer())
@@ -218,17 +312,19 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
         # Recursive check for RHS variables
         rhs_vars = get_top_level_rhs_vars(node.value)
-        logger.debug(f"RHS Vars: {rhs_vars}")
+        trace(lambda: f"RHS Vars: {rhs_vars}")
         for rhs_node in rhs_vars:
             if isinstance(rhs_node, nodes.Const):
                 if rhs_node.pytype() == "builtins.str":
-                    logger.debug(f"String literal found in RHS: {rhs_node.as_string()}")
+                    if trace:
+                        trace(f"String literal found in RHS: {node_string(rhs_node)}")
                     return True
                 else:
                     return False
 
             if has_str_operation(rhs_node):
-                logger.debug(f"String operation found in RHS: {rhs_node.as_string()}")
+                if trace:
+                    trace(f"String operation found in RHS: {node_string(rhs_node)}")
                 return True
 
             try:
@@ -239,11 +335,12 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
             if not any(isinstance(t, util.UninferableBase) for t in inferred_types):
                 return is_inferred_string(rhs_node, inferred_types)
 
-            var_name = rhs_node.as_string()
+            var_name = node_string(rhs_node)
             if var_name == target_name:
                 continue
 
-            logger.debug(f"Checking RHS variable: {var_name}")
+            if trace:
+                trace(f"Checking RHS variable: {var_name}")
             if has_type_hints_str(node, rhs_node, visited):  # Pass new visited set
                 return True
 
@@ -251,10 +348,10 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
     def is_inferred_string(node: nodes.NodeNG, inferred_types: list[Any]) -> bool:
         if all(t.repr_name() == "str" for t in inferred_types):
-            logger.debug(f"Definitively inferred as string: {node.as_string()}")
+            trace(lambda: f"Definitively inferred as string: {node_string(node)}")
             return True
         else:
-            logger.debug(f"Definitively non-string: {node.as_string()}")
+            trace(lambda: f"Definitively non-string: {node_string(node)}")
             return False
 
     def has_type_hints_str(
@@ -264,7 +361,7 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
         def check_annotation(annotation: nodes.NodeNG) -> bool:
             """Check if annotation is strictly a string type."""
-            annotation_str = annotation.as_string()
+            annotation_str = node_string(annotation)
 
             if re.search(r"(^|[^|\w])str($|[^|\w])", annotation_str):
                 # Ensure it's not part of a union or optional
@@ -279,11 +376,11 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
             - var[subscript]
             - simple_var
             """
-            logger.debug(f"Checking if target is allowed: {node}")
-            node_string = node.as_string()
+            trace(lambda: f"Checking if target is allowed: {node}")
+            node_str = node_string(node)
 
-            if node_string.startswith("self."):
-                base_var = extract_node(node_string.removeprefix("self."))
+            if node_str.startswith("self."):
+                base_var = extract_node(node_str.removeprefix("self."))
                 if isinstance(base_var, nodes.NodeNG):
                     return is_allowed_target(base_var)
 
@@ -293,7 +390,7 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
             # Case 2: Direct self attribute (self.var)
             if isinstance(node, (nodes.AssignAttr, nodes.Attribute)):
-                return node.expr.as_string().count(".") == 0
+                return node_string(node.expr).count(".") == 0
 
             # Case 3: Simple subscript (var[sub] or self.var[sub])
             if isinstance(node, nodes.Subscript):
@@ -301,16 +398,16 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
             return False
 
-        target_name = target.as_string()
+        target_name = node_string(target)
 
         # First: Filter complex targets according to rules
         if not is_allowed_target(target):
-            logger.debug(f"Skipping complex target: {target_name}")
+            trace(lambda: f"Skipping complex target: {target_name}")
             return False
 
         # Get the object name of the subscripted target
         base_name = (
-            target.value.as_string().partition("[")[0]
+            node_string(target.value).partition("[")[0]
             if isinstance(target, nodes.Subscript)
             else target_name
         )
@@ -323,7 +420,7 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
                     return True
 
         # 2. Check class attributes for self.* targets
-        if not context.as_string().startswith("self.") and target_name.startswith("self."):
+        if not node_string(context).startswith("self.") and target_name.startswith("self."):
             class_def = next(
                 (n for n in context.node_ancestors() if isinstance(n, nodes.ClassDef)), None
             )
@@ -387,7 +484,7 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
                 child
                 for child in reversed(scope_nodes)
                 if isinstance(child, nodes.Assign)
-                and any(target.as_string() == target_name for target in child.targets)
+                and any(node_string(target) == target_name for target in child.targets)
             ),
             None,
         )
@@ -415,19 +512,19 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
     def has_str_operation(node: nodes.NodeNG) -> bool:
         """Check for string-specific operations."""
-        logger.debug(f"Checking string operation for node: {node}")
+        trace(lambda: f"Checking string operation for node: {node}")
         if isinstance(node, nodes.JoinedStr):
-            logger.debug(f"Found f-string: {node.as_string()}")
+            trace(lambda: f"Found f-string: {node_string(node)}")
             return True
 
         if isinstance(node, nodes.Call) and isinstance(node.func, nodes.Attribute):
             if node.func.attrname == "format":
-                logger.debug(f"Found .format() call: {node.as_string()}")
+                trace(lambda: f"Found .format() call: {node_string(node)}")
                 return True
 
         if isinstance(node, nodes.Call) and isinstance(node.func, nodes.Name):
             if node.func.name == "str":
-                logger.debug(f"Found str() call: {node.as_string()}")
+                trace(lambda: f"Found str() call: {node_string(node)}")
                 return True
 
         return False
@@ -439,7 +536,7 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
         :param code_file: The source code file as a string
         :return: The same string source code with all AugAssign stmts changed to Assign
         """
-        logger.debug("Transforming AugAssign to Assign in code file")
+        trace("Transforming AugAssign to Assign in code file")
         str_code = code_file.splitlines()
 
         for i in range(len(str_code)):
@@ -452,18 +549,19 @@ def detect_string_concat_in_loop(file_path: Path, tree: nodes.Module):
 
             # Replace '+=' with '=' to form an Assign string
             str_code[i] = str_code[i].replace("+=", f"= {target_var} +", 1)
-            logger.debug(f"Transformed line {i}: {str_code[i]}")
+            if trace:
+                trace(f"Transformed line {i}: {str_code[i]}")
 
         return "\n".join(str_code)
 
     # Change all AugAssigns to Assigns
-    logger.debug(f"Transforming AugAssign to Assign in file: {file_path}")
-    tree = parse(transform_augassign_to_assign(file_path.read_text()))
+    trace(lambda: f"Transforming AugAssign to Assign in file: {file_path}")
+    tree = parse_source(transform_augassign_to_assign(get_source(file_path, tree))).astroid_module
 
     # Entry Point
-    logger.debug("Starting AST traversal")
+    trace("Starting AST traversal")
     for child in tree.get_children():
         visit(child)
 
-    logger.debug(f"Analysis complete. Detected smells: {smells}")
+    trace(lambda: f"Analysis complete. Detected smells: {smells}")
     return smells
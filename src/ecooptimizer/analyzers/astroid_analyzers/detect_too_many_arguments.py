@@ -0,0 +1,89 @@
+from pathlib import Path
+import re
+
+from astroid import nodes
+
+from ecooptimizer.data_types.custom_fields import AdditionalInfo, Occurence
+from ecooptimizer.data_types.smell import LPLSmell
+from ecooptimizer.utils.module_names import dotted_module_name
+from ecooptimizer.utils.smell_enums import PylintSmell
+
+# Pylint's default `ignored-argument-names`
+IGNORED_ARGUMENT_NAMES = re.compile("_.*|^ignored_|^unused_")
+
+
+def frame_name(node: nodes.NodeNG) -> str:
+    """Returns the dotted names of the frames enclosing a node, as Pylint reports `obj`."""
+    names: list[str] = []
+    frame = node.frame()
+    while not isinstance(frame, nodes.Module):
+        names.append(getattr(frame, "name", "<lambda>"))
+        frame = frame.parent.frame()
+    return ".".join(reversed(names))
+
+
+def function_occurence(node: nodes.FunctionDef) -> Occurence:
+    """Locates a function by its `def` keyword and name, as Pylint does."""
+    position = node.position
+    if position is None:
+        return Occurence(
+            line=node.fromlineno,
+            endLine=node.end_lineno,
+            column=node.col_offset,  # type: ignore
+            endColumn=node.end_col_offset,
+        )
+    return Occurence(
+        line=position.lineno,
+        endLine=position.end_lineno,
+        column=position.col_offset,
+        endColumn=position.end_col_offset,
+    )
+
+
+def detect_too_many_arguments(
+    file_path: Path, tree: nodes.Module, max_args: int = 6
+) -> list[LPLSmell]:
+    """
+    Detects functions taking more than `max_args` arguments.
+
+    Mirrors Pylint's `too-many-arguments` (R0913) check: the bound first argument
+    of methods and class methods and arguments matching Pylint's default
+    `ignored-argument-names` are not counted.
+
+    Args:
+        file_path (Path): The file path to analyze.
+        tree (nodes.Module): The parsed Astroid tree of the source code.
+        max_args (int): The maximum number of arguments allowed. Default is 6.
+
+    Returns:
+        list[Smell]: A list of Smell objects, one per function with too many arguments.
+    """
+    smells: list[LPLSmell] = []
+    module = dotted_module_name(file_path)
+
+    for node in tree.nodes_of_class(nodes.FunctionDef):
+        pos_args = node.args.posonlyargs + node.args.args
+        if node.type in {"method", "classmethod"}:
+            pos_args = pos_args[1:]
+        args = pos_args + node.args.kwonlyargs
+
+        args_num = sum(1 for arg in args if not IGNORED_ARGUMENT_NAMES.match(arg.name))
+        if args_num <= int(max_args):
+            continue
+
+        smells.append(
+            LPLSmell(
+                path=str(file_path.absolute()),
+                module=module,
+                obj=frame_name(node),
+                type="refactor",
+                symbol="too-many-arguments",
+                message=f"Too many arguments ({args_num}/{max_args})",
+                messageId=PylintSmell.LONG_PARAMETER_LIST.value,
+                confidence="UNDEFINED",
+                occurences=[function_occurence(node)],
+                additionalInfo=AdditionalInfo(),
+            )
+        )
+
+    return smells
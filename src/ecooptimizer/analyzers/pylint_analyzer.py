@@ -1,25 +1,162 @@
 """Pylint-based analyzer for detecting code smells."""
 
-from io import StringIO
-import json
+from collections import OrderedDict
 from pathlib import Path
-from pylint.lint import Run
-from pylint.reporters.json_reporter import JSON2Reporter
+import threading
+
+from pylint import config
+from pylint.checkers.clear_lru_cache import clear_lru_caches
+from pylint.config.config_initialization import _config_initialization
+from pylint.config.utils import _preprocess_options
+from pylint.lint import PyLinter, Run
+from pylint.lint.base_options import _make_run_options
+from pylint.lint.pylinter import MANAGER
+from pylint.message import Message
+from pylint.reporters import CollectingReporter
 
 from ecooptimizer.config import CONFIG
 from ecooptimizer.data_types.custom_fields import AdditionalInfo, Occurence
 from ecooptimizer.analyzers.base_analyzer import Analyzer
 from ecooptimizer.data_types.smell import Smell
 
+# Maximum number of configured linters kept alive at once
+DEFAULT_POOL_SIZE = 8
+
+# Pylint checkers and astroid's module cache are process-wide, so checks run one at a time
+_PYLINT_LOCK = threading.Lock()
+
+
+class _LinterSetup(Run):
+    """Performs the configuration steps of `pylint.lint.Run` without linting anything.
+
+    Pylint has no public API for configuring a linter from command-line options
+    and configuration files, so this mirrors `Run.__init__` with its private
+    helpers. The pylint versions it supports are pinned in `pyproject.toml`.
+    """
+
+    def __init__(self, args: list[str]):
+        self._rcfile: str | None = None
+        self._output: str | None = None
+        self._plugins: list[str] = []
+        self.verbose = False
+
+        args = _preprocess_options(self, args)
+
+        if self._rcfile is None:
+            default_file = next(config.find_default_config_files(), None)
+            if default_file:
+                self._rcfile = str(default_file)
+
+        self.linter = self.LinterClass(_make_run_options(self), option_groups=self.option_groups)
+        self.linter.load_default_plugins()
+        self.linter.load_plugin_modules(self._plugins)
+
+        _config_initialization(
+            self.linter,
+            args,
+            CollectingReporter(),
+            config_file=self._rcfile,
+            verbose_mode=self.verbose,
+        )
+
+
+class PylintLinterPool:
+    """Keeps configured `PyLinter` instances alive between analyses.
+
+    Linters are keyed by their command-line options, so option parsing, plugin
+    loading and checker registration happen once per distinct option set.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_POOL_SIZE):
+        """Initializes an empty pool.
+
+        Args:
+            maxsize: Maximum number of linters kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._linters: OrderedDict[tuple[str, ...], PyLinter] = OrderedDict()
+
+    def get(self, options: list[str]) -> PyLinter:
+        """Returns the linter configured with the given options, creating it on first use.
+
+        Args:
+            options: Pylint command-line options, without files to lint
+
+        Returns:
+            PyLinter: A linter ready to check files
+        """
+        key = tuple(options)
+
+        linter = self._linters.get(key)
+        if linter is not None:
+            self._linters.move_to_end(key)
+            return linter
+
+        linter = _LinterSetup(list(options)).linter
+        self._linters[key] = linter
+        while len(self._linters) > self.maxsize:
+            self._linters.popitem(last=False)
+
+        return linter
+
+    def clear(self) -> None:
+        """Drops every pooled linter."""
+        self._linters.clear()
+
+    def __len__(self) -> int:
+        return len(self._linters)
+
+
+class AstroidCacheGuard:
+    """Invalidates astroid's module cache when a cached module's file changes on disk.
+
+    `pylint.lint.Run` clears the cache after every run; keeping it across runs is
+    only safe as long as no module it holds has been modified, moved or deleted.
+    """
+
+    def __init__(self):
+        self._snapshot: dict[str, tuple[int, int, int]] = {}
+
+    def refresh(self) -> None:
+        """Clears astroid's caches if any module file seen in the last check has changed."""
+        for file, signature in self._snapshot.items():
+            if _file_signature(file) != signature:
+                clear_lru_caches()
+                MANAGER.clear_cache()
+                self._snapshot = {}
+                return
+
+    def record(self) -> None:
+        """Remembers the on-disk state of every module currently in astroid's cache."""
+        for module in list(MANAGER.astroid_cache.values()):
+            file = module.file
+            if file and file not in self._snapshot:
+                signature = _file_signature(file)
+                if signature is not None:
+                    self._snapshot[file] = signature
+
+
+def _file_signature(file: str) -> tuple[int, int, int] | None:
+    try:
+        stat = Path(file).stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+# Process-wide linter pool and cache guard shared by every PylintAnalyzer
+LINTER_POOL = PylintLinterPool()
+ASTROID_CACHE_GUARD = AstroidCacheGuard()
+
 
 class PylintAnalyzer(Analyzer):
     """Analyzer that detects code smells using Pylint."""
 
-    def _build_smells(self, pylint_smells: dict) -> list[Smell]:  # type: ignore
-        """Convert Pylint JSON output to Eco Optimizer smell objects.
+    def _build_smells(self, pylint_smells: list[Message]) -> list[Smell]:
+        """Convert Pylint messages to Eco Optimizer smell objects.
 
         Args:
-            pylint_smells: Dictionary of smells from Pylint JSON report
+            pylint_smells: Messages collected by Pylint's reporter
 
         Returns:
             list[Smell]: List of converted smell objects
@@ -29,20 +166,20 @@ class PylintAnalyzer(Analyzer):
         for smell in pylint_smells:
             smells.append(
                 Smell(
-                    confidence=smell["confidence"],
-                    message=smell["message"],
-                    messageId=smell["messageId"],
-                    module=smell["module"],
-                    obj=smell["obj"],
-                    path=smell["absolutePath"],
-                    symbol=smell["symbol"],
-                    type=smell["type"],
+                    confidence=smell.confidence.name,
+                    message=smell.msg or "",
+                    messageId=smell.msg_id,
+                    module=smell.module,
+                    obj=smell.obj,
+                    path=smell.abspath,
+                    symbol=smell.symbol,
+                    type=smell.category,
                     occurences=[
                         Occurence(
-                            line=smell["line"],
-                            endLine=smell["endLine"],
-                            column=smell["column"],
-                            endColumn=smell["endColumn"],
+                            line=smell.line,
+                            endLine=smell.end_line,
+                            column=smell.column,
+                            endColumn=smell.end_column,
                         )
                     ],
                     additionalInfo=AdditionalInfo(),
@@ -62,21 +199,24 @@ class PylintAnalyzer(Analyzer):
             list[Smell]: Detected code smells
 
         Note:
-            Catches and logs Pylint execution and JSON parsing errors
+            Catches and logs Pylint configuration and execution errors
         """
         smells_data: list[Smell] = []
-        pylint_options = [str(file_path), *extra_options, "--clear-cache-post-run=True"]
-
-        with StringIO() as buffer:
-            reporter = JSON2Reporter(buffer)
-
-            try:
-                Run(pylint_options, reporter=reporter, exit=False)
-                buffer.seek(0)
-                smells_data.extend(self._build_smells(json.loads(buffer.getvalue())["messages"]))
-            except json.JSONDecodeError as e:
-                CONFIG["detectLogger"].error(f"❌ Failed to parse JSON output from pylint: {e}")
-            except Exception as e:
-                CONFIG["detectLogger"].error(f"❌ An error occurred during pylint analysis: {e}")
+        reporter = CollectingReporter()
+
+        try:
+            with _PYLINT_LOCK:
+                linter = LINTER_POOL.get(extra_options)
+                linter.set_reporter(reporter)
+
+                ASTROID_CACHE_GUARD.refresh()
+                linter.check([str(file_path)])
+                ASTROID_CACHE_GUARD.record()
+
+            smells_data.extend(self._build_smells(reporter.messages))
+        except SystemExit as e:
+            CONFIG["detectLogger"].error(f"❌ Invalid pylint options {extra_options}: exit {e}")
+        except Exception as e:
+            CONFIG["detectLogger"].error(f"❌ An error occurred during pylint analysis: {e}")
 
         return smells_data
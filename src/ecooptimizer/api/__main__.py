@@ -6,6 +6,11 @@ import uvicorn
 
 from ecooptimizer.api.app import app
 from ecooptimizer.config import CONFIG
+from ecooptimizer.measurements.energy_meters import ENERGY_METERS
+from ecooptimizer.measurements.script_runners import SCRIPT_RUNNERS
+from ecooptimizer.measurements.statistics import SIGNIFICANCE_TESTS
+from ecooptimizer.measurements.workloads import WORKLOADS
+from ecooptimizer.utils.smells_registry import ANALYSIS_BACKENDS
 
 
 class HealthCheckFilter(logging.Filter):
@@ -66,9 +71,101 @@ def main():
     parser.add_argument("--dev", action="store_true", help="Run in development mode")
     parser.add_argument("--port", type=int, default=8000, help="Port to run on")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
+    parser.add_argument(
+        "--analysis-backend",
+        choices=ANALYSIS_BACKENDS,
+        default=CONFIG["analysisBackend"],
+        help="Detect Pylint's smells with Pylint or with the native detectors",
+    )
+    parser.add_argument(
+        "--energy-meter",
+        choices=ENERGY_METERS,
+        default=CONFIG["energyMeter"],
+        help="Measure energy with CodeCarbon, with Linux RAPL counters, or estimate it from "
+        "CPU time and memory",
+    )
+    parser.add_argument(
+        "--runner",
+        choices=SCRIPT_RUNNERS,
+        default=CONFIG["measurementRunner"],
+        help="Run measured files in new interpreters or in children of a warm fork server",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=CONFIG["measurementTimeout"],
+        help="Seconds a measured file may run before it is killed, 0 for no limit",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=CONFIG["measurementMemoryLimit"],
+        help="Megabytes of address space a measured file may allocate, 0 (the default) for no limit",
+    )
+    parser.add_argument(
+        "--workload",
+        choices=WORKLOADS,
+        default=CONFIG["workload"],
+        help="Measure a refactored module by executing it, its project's tests, or a command",
+    )
+    parser.add_argument(
+        "--workload-tests",
+        default=CONFIG["workloadTests"],
+        help="Pytest arguments run by the tests workload, by default the tests importing "
+        "the refactored module",
+    )
+    parser.add_argument(
+        "--workload-command",
+        default=CONFIG["workloadCommand"],
+        help="Command run from the project by the command workload; {file} is replaced by "
+        "the refactored module",
+    )
+    parser.add_argument(
+        "--measurement-cache-ttl",
+        type=float,
+        default=CONFIG["measurementCacheTtl"],
+        help="Seconds to reuse energy measurements of unchanged code, 0 to always measure",
+    )
+    parser.add_argument(
+        "--repetitions",
+        type=int,
+        default=CONFIG["measurementRepetitions"],
+        help="Energy measurements per program, compared with a significance test when above 1",
+    )
+    parser.add_argument(
+        "--warmups",
+        type=int,
+        default=CONFIG["measurementWarmups"],
+        help="Energy measurements discarded before the repeated ones",
+    )
+    parser.add_argument(
+        "--significance-test",
+        choices=SIGNIFICANCE_TESTS,
+        default=CONFIG["significanceTest"],
+        help="Test deciding whether repeated measurements show energy savings",
+    )
+    parser.add_argument(
+        "--significance-level",
+        type=float,
+        default=CONFIG["significanceLevel"],
+        help="Largest p-value for which a refactoring is accepted",
+    )
     args = parser.parse_args()
 
     CONFIG["mode"] = "development" if args.dev else "production"
+    CONFIG["analysisBackend"] = args.analysis_backend
+    CONFIG["energyMeter"] = args.energy_meter
+    CONFIG["measurementRunner"] = args.runner
+    CONFIG["measurementTimeout"] = args.timeout
+    CONFIG["measurementMemoryLimit"] = args.memory_limit
+    CONFIG["workload"] = args.workload
+    CONFIG["workloadTests"] = args.workload_tests
+    CONFIG["workloadCommand"] = args.workload_command
+    CONFIG["measurementCacheTtl"] = args.measurement_cache_ttl
+    CONFIG["measurementRepetitions"] = args.repetitions
+    CONFIG["measurementWarmups"] = args.warmups
+    CONFIG["significanceTest"] = args.significance_test
+    CONFIG["significanceLevel"] = args.significance_level
     start(args.host, args.port)
 
 
@@ -5,12 +5,19 @@ from pathlib import Path
 from fastapi import APIRouter
 from pydantic import BaseModel
 import time
+from typing import Optional
 
 from ecooptimizer.api.error_handler import AppError, RessourceNotFoundError
 
 from ecooptimizer.config import CONFIG
 from ecooptimizer.analyzers.analyzer_controller import AnalyzerController
+from ecooptimizer.data_types.project_analysis import ProjectAnalysis
 from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.energy_meters import get_energy_meter
+from ecooptimizer.measurements.profiling import profile_energy
+from ecooptimizer.measurements.workloads import workload_script
+from ecooptimizer.utils.smell_cache import get_smell_cache
+from ecooptimizer.utils.tracing import tracing
 
 router = APIRouter()
 analyzer_controller = AnalyzerController()
@@ -22,10 +29,30 @@ class SmellRequest(BaseModel):
     Attributes:
         file_path: Path to the Python file to analyze
         enabled_smells: Dictionary mapping smell names to their configurations
+        trace: Trace categories (smell symbols, or `*`) to enable while analyzing
+        profile: Whether to profile the file's workload and set the smells' hotness
+        root_path: Project the workload runs from, the file's directory when omitted
     """
 
     file_path: str
     enabled_smells: dict[str, dict[str, int | str]]
+    trace: list[str] = []
+    profile: bool = False
+    root_path: Optional[str] = None
+
+
+class ProjectSmellRequest(BaseModel):
+    """Request model for project-wide smell detection endpoint.
+
+    Attributes:
+        root_path: Path to the project directory to analyze
+        enabled_smells: Dictionary mapping smell names to their configurations
+        jobs: Number of worker processes, defaults to the CPU count
+    """
+
+    root_path: str
+    enabled_smells: dict[str, dict[str, int | str]]
+    jobs: int | None = None
 
 
 @router.post("/smells", response_model=list[Smell], summary="Detect code smells")
@@ -52,19 +79,133 @@ def detect_smells(request: SmellRequest) -> list[Smell]:
         CONFIG["detectLogger"].error(f"❌ File does not exist: {file_path_obj}")
         raise RessourceNotFoundError(str(file_path_obj), "file")
 
+    smell_cache = get_smell_cache()
+    cache_key = None
+    # A traced request runs the detectors, so their traces are emitted
+    if smell_cache is not None and not request.trace:
+        try:
+            cache_key = smell_cache.make_key(file_path_obj, request.enabled_smells)
+            cached_smells = smell_cache.get(cache_key)
+        except Exception as e:
+            CONFIG["detectLogger"].warning(f"⚠️ Smell cache lookup failed: {e}")
+            cached_smells = None
+
+        if cached_smells is not None:
+            CONFIG["detectLogger"].info(
+                f"♻️ Unchanged file, returning {len(cached_smells)} cached smells."
+            )
+            CONFIG["detectLogger"].info(f"{'=' * 100}\n")
+            return add_hotness(cached_smells, request) if request.profile else cached_smells
+
     try:
         CONFIG["detectLogger"].info(f"🎯 Running analysis on: {file_path_obj}")
-        smells_data = analyzer_controller.run_analysis(file_path_obj, request.enabled_smells)
+        with tracing(request.trace):
+            smells_data = analyzer_controller.run_analysis(file_path_obj, request.enabled_smells)
     except AppError as e:
         raise AppError(str(e), e.status_code) from e
     except Exception as e:
         raise Exception(str(e)) from e
 
+    if smell_cache is not None and cache_key:
+        try:
+            smell_cache.put(cache_key, file_path_obj, smells_data)
+        except Exception as e:
+            CONFIG["detectLogger"].warning(f"⚠️ Could not cache detected smells: {e}")
+
     execution_time = round(time.time() - start_time, 2)
     CONFIG["detectLogger"].info(f"📊 Execution Time: {execution_time} seconds")
     CONFIG["detectLogger"].info(
         f"🏁 Analysis completed for {file_path_obj}. {len(smells_data)} smells found."
     )
+    if request.profile:
+        smells_data = add_hotness(smells_data, request)
     CONFIG["detectLogger"].info(f"{'=' * 100}\n")
 
     return smells_data
+
+
+def add_hotness(smells: list[Smell], request: SmellRequest) -> list[Smell]:
+    """Profiles the workload of the analyzed file and sets the hotness of its smells.
+
+    Args:
+        smells: Smells detected in the file
+        request: Request naming the file and the project its workload runs from
+
+    Returns:
+        list[Smell]: Copies of the smells with their hotness, or the smells unchanged if
+            profiling fails
+    """
+    file_path = Path(request.file_path)
+    project_dir = Path(request.root_path) if request.root_path else file_path.parent
+    CONFIG["detectLogger"].info(f"🔥 Profiling workload of {file_path.name}")
+
+    profile = profile_energy(
+        get_energy_meter(), workload_script(file_path, project_dir), project_dir
+    )
+    if profile is None:
+        CONFIG["detectLogger"].warning("⚠️ Could not profile the workload, hotness is unknown.")
+        return smells
+    return profile.annotate(smells)
+
+
+@router.post(
+    "/smells/project", response_model=ProjectAnalysis, summary="Detect code smells in a project"
+)
+def detect_project_smells(request: ProjectSmellRequest) -> ProjectAnalysis:
+    """Analyzes every Python file of a project and returns the detected code smells.
+
+    Args:
+        request: ProjectSmellRequest containing the project root and smell configurations
+
+    Returns:
+        ProjectAnalysis: Detected code smells per file along with aggregate counts
+
+    Raises:
+        HTTPException: 404 if the directory is not found, 500 for analysis errors
+    """
+    CONFIG["detectLogger"].info(f"{'=' * 100}")
+    CONFIG["detectLogger"].info(
+        f"📂 Received project smell detection request for: {request.root_path}"
+    )
+
+    start_time = time.time()
+
+    root_path_obj = Path(request.root_path)
+
+    if not root_path_obj.is_dir():
+        CONFIG["detectLogger"].error(f"❌ Directory does not exist: {root_path_obj}")
+        raise RessourceNotFoundError(str(root_path_obj), "folder")
+
+    try:
+        analysis = analyzer_controller.run_analysis_project(
+            root_path_obj, request.enabled_smells, request.jobs
+        )
+    except AppError as e:
+        raise AppError(str(e), e.status_code) from e
+    except Exception as e:
+        raise Exception(str(e)) from e
+
+    execution_time = round(time.time() - start_time, 2)
+    CONFIG["detectLogger"].info(f"📊 Execution Time: {execution_time} seconds")
+    CONFIG["detectLogger"].info(f"{'=' * 100}\n")
+
+    return analysis
+
+
+@router.delete("/smells/cache", summary="Invalidate cached smell detection results")
+def invalidate_smell_cache(file_path: str | None = None) -> dict[str, int]:
+    """Removes cached detection results for one file, or for every file.
+
+    Args:
+        file_path: File whose cached results are removed; all results when omitted
+
+    Returns:
+        dict: Number of removed entries {'removed': n}
+    """
+    smell_cache = get_smell_cache()
+    if smell_cache is None:
+        return {"removed": 0}
+
+    removed = smell_cache.invalidate(Path(file_path) if file_path else None)
+    CONFIG["detectLogger"].info(f"🗑️ Invalidated {removed} cached smell results.")
+    return {"removed": removed}
@@ -2,12 +2,15 @@
 
 # pyright: reportOptionalMemberAccess=false
 import shutil
+import statistics
 from pathlib import Path
 from tempfile import mkdtemp
 import traceback
 from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import Optional
+from collections.abc import Iterator
 
 from ecooptimizer.api.error_handler import (
     AppError,
@@ -19,71 +22,99 @@ from ecooptimizer.api.error_handler import (
 )
 
 from ecooptimizer.config import CONFIG
+from ecooptimizer.refactorers.candidate_pipeline import CandidateEvaluator, CandidatePipeline
 from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+from ecooptimizer.refactorers.refactoring_session import RefactoringSession
 from ecooptimizer.analyzers.analyzer_controller import AnalyzerController
-from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+from ecooptimizer.measurements.emissions import (
+    compare_energy,
+    measure_interleaved,
+    measure_samples,
+)
+from ecooptimizer.measurements.energy_meters import EnergyMeterName, using_energy_meter
+from ecooptimizer.data_types.refactored_data import (
+    ChangedFile,
+    RefactoredData,
+    RefactoredSessionData,
+)
 from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.utils.edit_ranges import compute_edit_ranges
+from ecooptimizer.utils.tracing import tracing
+from ecooptimizer.utils.workspace import Workspace
 
 logger = CONFIG["refactorLogger"]
 
 router = APIRouter()
 refactorer_controller = RefactorerController()
 analyzer_controller = AnalyzerController()
-energy_meter = CodeCarbonEnergyMeter()
 
 
-class ChangedFile(BaseModel):
-    """Tracks file changes during refactoring.
+class RefactorRqModel(BaseModel):
+    """Request model for single smell refactoring.
 
     Attributes:
-        original: Path to original file
-        refactored: Path to refactored file
+        sourceDir: Directory containing code to refactor
+        smell: Smell to refactor
+        trace: Trace categories (smell symbols, or `*`) to enable while refactoring
+        energyMeter: Meter measuring this request, the configured one when omitted
     """
 
-    original: str
-    refactored: str
+    sourceDir: str
+    smell: Smell
+    trace: list[str] = []
+    energyMeter: Optional[EnergyMeterName] = None
 
 
-class RefactoredData(BaseModel):
-    """Contains results of a refactoring operation.
+class RefactorTypeRqModel(BaseModel):
+    """Request model for refactoring by smell type.
 
     Attributes:
-        tempDir: Temporary directory with refactored files
-        targetFile: Main file that was refactored
-        energySaved: Estimated energy savings in kg CO2
-        affectedFiles: List of all files modified during refactoring
+        sourceDir: Directory containing code to refactor
+        smellType: Type of smell to refactor
+        firstSmell: First instance of the smell to refactor
+        trace: Trace categories (smell symbols, or `*`) to enable while refactoring
+        energyMeter: Meter measuring this request, the configured one when omitted
     """
 
-    tempDir: str
-    targetFile: ChangedFile
-    energySaved: Optional[float] = None
-    affectedFiles: list[ChangedFile]
+    sourceDir: str
+    smellType: str
+    firstSmell: Smell
+    trace: list[str] = []
+    energyMeter: Optional[EnergyMeterName] = None
 
 
-class RefactorRqModel(BaseModel):
-    """Request model for single smell refactoring.
+class RefactorSessionRqModel(BaseModel):
+    """Request model for refactoring many smells of one file at once.
 
     Attributes:
         sourceDir: Directory containing code to refactor
-        smell: Smell to refactor
+        smells: Smells to refactor, all in the same file, in the order they are applied
+        bisect: Whether to split a batch that saves no energy to find the smells at fault
+        trace: Trace categories (smell symbols, or `*`) to enable while refactoring
+        energyMeter: Meter measuring this request, the configured one when omitted
     """
 
     sourceDir: str
-    smell: Smell
+    smells: list[Smell]
+    bisect: bool = True
+    trace: list[str] = []
+    energyMeter: Optional[EnergyMeterName] = None
 
 
-class RefactorTypeRqModel(BaseModel):
-    """Request model for refactoring by smell type.
+class RefactorCandidatesRqModel(BaseModel):
+    """Request model for refactoring many smells independently of each other.
 
     Attributes:
         sourceDir: Directory containing code to refactor
-        smellType: Type of smell to refactor
-        firstSmell: First instance of the smell to refactor
+        smells: Smells to refactor, each in its own workspace
+        jobs: Number of processes refactoring smells, the CPU count when omitted
+        energyMeter: Meter measuring this request, the configured one when omitted
     """
 
     sourceDir: str
-    smellType: str
-    firstSmell: Smell
+    smells: list[Smell]
+    jobs: Optional[int] = Field(default=None, ge=1)
+    energyMeter: Optional[EnergyMeterName] = None
 
 
 @router.post("/refactor", response_model=RefactoredData, summary="Refactor a specific code smell")
@@ -114,19 +145,14 @@ def refactor(request: RefactorRqModel) -> RefactoredData | None:
         raise RessourceNotFoundError(str(source_dir), "folder")
 
     try:
-        initial_emissions = measure_energy(target_file)
-        if not initial_emissions:
-            logger.error("❌ Could not retrieve initial emissions.")
-            raise EnergyMeasurementError(str(target_file))
+        with tracing(request.trace), using_energy_meter(request.energyMeter):
+            refactor_data = perform_refactoring(source_dir, request.smell)
 
-        logger.info(f"📊 Initial emissions: {initial_emissions} kg CO2")
-        refactor_data = perform_refactoring(source_dir, request.smell, initial_emissions)
+            if refactor_data:
+                logger.info(f"{'=' * 100}\n")
+                return refactor_data
 
-        if refactor_data:
             logger.info(f"{'=' * 100}\n")
-            return refactor_data
-
-        logger.info(f"{'=' * 100}\n")
     except AppError as e:
         raise AppError(str(e), e.status_code) from e
     except Exception as e:
@@ -160,68 +186,198 @@ def refactorSmell(request: RefactorTypeRqModel) -> RefactoredData:
     if not source_dir.is_dir():
         raise RessourceNotFoundError(str(source_dir), "folder")
     try:
-        initial_emissions = measure_energy(target_file)
-        if not initial_emissions:
-            raise EnergyMeasurementError("Could not retrieve initial emissions.")
-        logger.info(f"📊 Initial emissions: {initial_emissions} kg CO2")
-
-        total_energy_saved = 0.0
-        all_affected_files: list[ChangedFile] = []
-        temp_dir = None
-        current_smell = request.firstSmell
-        current_source_dir = source_dir
-
-        refactor_data = perform_refactoring(current_source_dir, current_smell, initial_emissions)
-        total_energy_saved += refactor_data.energySaved or 0.0
-        all_affected_files.extend(refactor_data.affectedFiles)
-
-        temp_dir = refactor_data.tempDir
-        target_file = refactor_data.targetFile
-        refactored_file_path = target_file.refactored
-        source_copy_dir = Path(temp_dir) / source_dir.name
-
-        while True:
-            next_smells = analyzer_controller.run_analysis(
-                Path(refactored_file_path), [request.smellType]
+        with tracing(request.trace), using_energy_meter(request.energyMeter):
+            all_affected_files: list[ChangedFile] = []
+            temp_dir = None
+            current_smell = request.firstSmell
+            current_source_dir = source_dir
+
+            refactor_data = perform_refactoring(current_source_dir, current_smell)
+            all_affected_files.extend(refactor_data.affectedFiles)
+            initial_samples = refactor_data.initialSamples
+
+            temp_dir = refactor_data.tempDir
+            target_file = refactor_data.targetFile
+            refactored_file_path = target_file.refactored
+            source_copy_dir = Path(temp_dir) / source_dir.name
+            # Each step is measured against the emissions of the previous step's result
+            baseline_samples = refactor_data.finalSamples
+
+            # After the first full analysis, only definitions touched by each step are re-analyzed
+            next_smells = None
+            edit_ranges = None
+            steps = 1
+            while True:
+                next_smells = analyzer_controller.run_incremental_analysis(
+                    Path(refactored_file_path), [request.smellType], next_smells, edit_ranges
+                )
+                if not next_smells:
+                    break
+                current_smell = next_smells[0]
+                step_data = perform_refactoring(
+                    source_copy_dir,
+                    current_smell,
+                    baseline_samples,
+                    Path(temp_dir),
+                )
+                all_affected_files.extend(step_data.affectedFiles)
+                edit_ranges = step_data.editRanges
+                baseline_samples = step_data.finalSamples
+                steps += 1
+
+            if steps > 1 and CONFIG["measurementRepetitions"] > 1:
+                # Steps after the first are measured one after the other, so the overall
+                # savings are measured again with the original and final code interleaved
+                initial_samples, baseline_samples = measure_interleaved(
+                    Path(request.firstSmell.path),
+                    Path(refactored_file_path),
+                    source_dir,
+                    source_copy_dir,
+                )
+                if not initial_samples or not baseline_samples:
+                    raise EnergyMeasurementError(str(target_file.original))
+
+            # The savings reported are those of the original code against the final code
+            savings = compare_energy(initial_samples, baseline_samples)
+            logger.info(f"✅ Total energy saved: {savings.median} kg CO2")
+
+            return RefactoredData(
+                tempDir=temp_dir,
+                targetFile=target_file,
+                energySaved=savings.median,
+                energySavings=savings,
+                affectedFiles=list({file.original: file for file in all_affected_files}.values()),
             )
-            if not next_smells:
-                break
-            current_smell = next_smells[0]
-            step_data = perform_refactoring(
-                source_copy_dir,
-                current_smell,
-                initial_emissions - total_energy_saved,
-                Path(temp_dir),
-            )
-            total_energy_saved += step_data.energySaved or 0.0
-            all_affected_files.extend(step_data.affectedFiles)
+    except AppError as e:
+        raise AppError(str(e), e.status_code) from e
+    except Exception as e:
+        raise Exception(str(e)) from e
 
-        logger.info(f"✅ Total energy saved: {total_energy_saved} kg CO2")
 
-        return RefactoredData(
-            tempDir=temp_dir,
-            targetFile=target_file,
-            energySaved=total_energy_saved,
-            affectedFiles=list({file.original: file for file in all_affected_files}.values()),
-        )
+@router.post(
+    "/refactor-session",
+    response_model=RefactoredSessionData,
+    summary="Refactor many smells of a file, measuring them together",
+)
+def refactorSession(request: RefactorSessionRqModel) -> RefactoredSessionData:
+    """Refactors many smells of a file in one workspace, measuring them in batches.
+
+    The smells are applied one after the other, and the whole batch is measured
+    once against the original code. A batch that saves no energy is rejected
+    or, when bisecting, split in halves that are tried in turn on top of the
+    smells accepted so far, until the smells at fault are isolated.
+
+    Args:
+        request: Contains source directory and the smells to refactor
+
+    Returns:
+        RefactoredSessionData: Results of the accepted smells and the fate of the others
+
+    Raises:
+        HTTPException: Various error cases with appropriate status codes
+    """
+    logger.info(f"{'=' * 100}")
+    source_dir = Path(request.sourceDir)
+
+    if not request.smells:
+        raise AppError("No smells to refactor.", 400)
+    target_file = Path(request.smells[0].path)
+    if any(Path(smell.path) != target_file for smell in request.smells):
+        raise AppError("All smells of a session must be in the same file.", 400)
+
+    logger.info(f"🔄 Refactoring {len(request.smells)} smells of {target_file} in {source_dir!s}")
+
+    if not target_file.exists():
+        raise RessourceNotFoundError(str(target_file), "file")
+
+    if not source_dir.is_dir():
+        raise RessourceNotFoundError(str(source_dir), "folder")
+
+    try:
+        with tracing(request.trace), using_energy_meter(request.energyMeter):
+            initial_samples = measure_samples(target_file, source_dir)
+            if not initial_samples:
+                raise EnergyMeasurementError(str(target_file))
+            logger.info(f"📊 Initial emissions: {statistics.median(initial_samples)} kg CO2")
+
+            session = RefactoringSession(
+                refactorer_controller, source_dir, target_file, initial_samples, request.bisect
+            )
+            session.settle(list(request.smells))
+            return session.result()
     except AppError as e:
         raise AppError(str(e), e.status_code) from e
     except Exception as e:
         raise Exception(str(e)) from e
 
 
+@router.post(
+    "/refactor-candidates",
+    response_class=StreamingResponse,
+    summary="Refactor many smells in parallel, streaming their measured results",
+)
+def refactorCandidates(request: RefactorCandidatesRqModel) -> StreamingResponse:
+    """Refactors many smells independently and streams their results as they are measured.
+
+    Every smell is refactored in its own workspace, in a pool of processes,
+    while the refactored candidates are measured one at a time as they become
+    ready. Each result is streamed as one JSON `CandidateResult` per line.
+
+    Args:
+        request: Contains source directory and the smells to refactor
+
+    Returns:
+        StreamingResponse: Newline-delimited `CandidateResult`s, in the order measured
+
+    Raises:
+        HTTPException: Various error cases with appropriate status codes
+    """
+    logger.info(f"{'=' * 100}")
+    source_dir = Path(request.sourceDir)
+
+    if not request.smells:
+        raise AppError("No smells to refactor.", 400)
+
+    if not source_dir.is_dir():
+        raise RessourceNotFoundError(str(source_dir), "folder")
+
+    for smell in request.smells:
+        target_file = Path(smell.path)
+        if not target_file.exists():
+            raise RessourceNotFoundError(str(target_file), "file")
+        if not target_file.is_relative_to(source_dir):
+            raise AppError(f"{target_file} is not in {source_dir}.", 400)
+
+    logger.info(f"🔄 Refactoring {len(request.smells)} candidates in {source_dir!s}")
+    pipeline = CandidatePipeline(CandidateEvaluator(source_dir, request.energyMeter), request.jobs)
+
+    def lines() -> Iterator[str]:
+        for result in pipeline.run(source_dir, list(request.smells)):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 def perform_refactoring(
     source_dir: Path,
     smell: Smell,
-    initial_emissions: float,
+    initial_samples: Optional[list[float]] = None,
     existing_temp_dir: Optional[Path] = None,
 ) -> RefactoredData:
     """Executes the refactoring process and measures energy impact.
 
+    In production mode, the refactoring is only accepted if the configured
+    significance test shows that it saves energy. The refactored code is
+    compared with `initial_samples` when given, e.g. with the results of the
+    previous step in an existing workspace, whose original code no longer
+    exists. Otherwise the baseline is measured here: interleaved with the
+    refactored code when measurements are repeated and the refactoring is made
+    in a new workspace, or before refactoring.
+
     Args:
         sourceDir: Source directory to refactor
         smell: Smell to refactor
-        initial_emissions: Baseline energy measurement
+        initial_samples: Baseline energy measurements, if already known
         existing_temp_dir: Optional existing temp directory to use
 
     Returns:
@@ -239,15 +395,27 @@ def perform_refactoring(
         f"🚀 Starting refactoring for {smell.symbol} at line {smell.occurences[0].line} in {target_file}"
     )
 
+    interleaved = (
+        initial_samples is None
+        and existing_temp_dir is None
+        and CONFIG["measurementRepetitions"] > 1
+    )
+    if initial_samples is None and not interleaved:
+        initial_samples = measure_samples(target_file, source_dir)
+        if not initial_samples:
+            logger.error("❌ Could not retrieve initial emissions.")
+            raise EnergyMeasurementError(str(target_file))
+        logger.info(f"📊 Initial emissions: {statistics.median(initial_samples)} kg CO2")
+
     if existing_temp_dir is None:
         temp_dir = Path(mkdtemp(prefix="ecooptimizer-"))
-        source_copy = temp_dir / source_dir.name
-        shutil.copytree(source_dir, source_copy, ignore=shutil.ignore_patterns(".git*"))
+        source_copy = Workspace.create(source_dir, temp_dir / source_dir.name).root
     else:
         temp_dir = existing_temp_dir
         source_copy = source_dir
 
     target_file_copy = source_copy / target_file.relative_to(source_dir)
+    original_source = _read_source(target_file_copy)
     modified_files = []
     try:
         modified_files: list[Path] = refactorer_controller.run_refactorer(
@@ -259,25 +427,43 @@ def perform_refactoring(
         raise RefactoringError(str(e)) from e
 
     print("energy")
-    final_emissions = measure_energy(target_file_copy)
-    if not final_emissions:
+    if interleaved:
+        initial_samples, final_samples = measure_interleaved(
+            target_file, target_file_copy, source_dir, source_copy
+        )
+    else:
+        final_samples = measure_samples(target_file_copy, source_copy)
+    if not initial_samples or not final_samples:
         if existing_temp_dir is None:
             shutil.rmtree(temp_dir, onerror=remove_readonly)  # type: ignore
         raise EnergyMeasurementError(str(target_file))
 
-    if CONFIG["mode"] == "production" and final_emissions >= initial_emissions:
+    savings = compare_energy(initial_samples, final_samples)
+    logger.info(
+        f"📊 Final emissions: {savings.refactored.median} kg CO2, saved {savings.median} kg CO2 "
+        f"({savings.confidence:.0%} CI {savings.low} to {savings.high}, p-value {savings.pValue})"
+    )
+
+    if CONFIG["mode"] == "production" and not savings.significant:
         if existing_temp_dir is None:
             shutil.rmtree(temp_dir, onerror=remove_readonly)  # type: ignore
         raise EnergySavingsError()
 
-    energy_saved = initial_emissions - final_emissions
+    refactored_source = _read_source(target_file_copy)
+    edit_ranges = (
+        compute_edit_ranges(original_source, refactored_source)
+        if original_source is not None and refactored_source is not None
+        else None
+    )
+
     return RefactoredData(
         tempDir=str(temp_dir),
         targetFile=ChangedFile(
             original=str(target_file.resolve()),
             refactored=str(target_file_copy.resolve()),
         ),
-        energySaved=energy_saved,
+        energySaved=savings.median,
+        energySavings=savings,
         affectedFiles=[
             ChangedFile(
                 original=str(file.resolve()).replace(str(source_copy), str(source_dir)),
@@ -285,17 +471,15 @@ def perform_refactoring(
             )
             for file in modified_files
         ],
+        editRanges=edit_ranges,
+        initialSamples=initial_samples,
+        finalSamples=final_samples,
     )
 
 
-def measure_energy(file: Path) -> Optional[float]:
-    """Measures energy consumption of executing a file.
-
-    Args:
-        file: Python file to measure
-
-    Returns:
-        Optional[float]: Energy consumption in kg CO2, or None if measurement fails
-    """
-    energy_meter.measure_energy(file)
-    return energy_meter.emissions
+def _read_source(file: Path) -> Optional[str]:
+    """Reads a file's source, or returns None if it cannot be read."""
+    try:
+        return file.read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
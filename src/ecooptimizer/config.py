@@ -12,12 +12,42 @@ class Config(TypedDict):
 
     Attributes:
         mode: Current application mode ('production' or 'development')
+        analysisBackend: Detectors used for Pylint's smells ('pylint' or 'native')
+        energyMeter: Meter measuring refactorings ('codecarbon', 'rapl' or 'estimated')
+        measurementRunner: How measured files are executed ('subprocess' or 'fork-server')
+        measurementTimeout: Seconds a measured file may run before it is killed, 0 for no limit
+        measurementMemoryLimit: Megabytes of address space a measured file may allocate,
+            0 for no limit
+        workload: What is executed to measure a module ('script', 'tests' or 'command')
+        workloadTests: Pytest arguments run by the 'tests' workload, in shell syntax;
+            empty to run the tests that import the module
+        workloadCommand: Command run by the 'command' workload, in shell syntax, with
+            `{file}` standing for the module
+        measurementCacheTtl: Seconds an energy measurement is reused for unchanged code
+        measurementRepetitions: Measurements kept per program; 1 compares single readings
+        measurementWarmups: Measurements discarded before the kept ones
+        significanceTest: Test deciding whether a refactoring saves energy
+            ('mann-whitney' or 'welch')
+        significanceLevel: Largest p-value for which a refactoring is accepted
         loggingManager: Central logging manager instance
         detectLogger: Logger for code detection operations
         refactorLogger: Logger for code refactoring operations
     """
 
     mode: str
+    analysisBackend: str
+    energyMeter: str
+    measurementRunner: str
+    measurementTimeout: float
+    measurementMemoryLimit: int
+    workload: str
+    workloadTests: str
+    workloadCommand: str
+    measurementCacheTtl: float
+    measurementRepetitions: int
+    measurementWarmups: int
+    significanceTest: str
+    significanceLevel: float
     loggingManager: LoggingManager | None
     detectLogger: Logger
     refactorLogger: Logger
@@ -26,6 +56,19 @@ class Config(TypedDict):
 # Global application configuration
 CONFIG: Config = {
     "mode": "production",
+    "analysisBackend": "pylint",
+    "energyMeter": "codecarbon",
+    "measurementRunner": "subprocess",
+    "measurementTimeout": 300.0,
+    "measurementMemoryLimit": 0,
+    "workload": "script",
+    "workloadTests": "",
+    "workloadCommand": "",
+    "measurementCacheTtl": 600.0,
+    "measurementRepetitions": 1,
+    "measurementWarmups": 1,
+    "significanceTest": "mann-whitney",
+    "significanceLevel": 0.05,
     "loggingManager": None,
     "detectLogger": logging.getLogger("detect"),
     "refactorLogger": logging.getLogger("refactor"),
@@ -0,0 +1,49 @@
+"""Data models for summarizing repeated energy measurements."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class MeasurementSummary(BaseModel):
+    """Summary of repeated measurements of one program.
+
+    Attributes:
+        samples: Number of measurements, warm-up runs excluded
+        median: Median emissions in kg CO2
+        iqr: Interquartile range of the emissions
+        low: Lower bound of the confidence interval of the median
+        high: Upper bound of the confidence interval of the median
+    """
+
+    samples: int
+    median: float
+    iqr: float
+    low: float
+    high: float
+
+
+class EnergySavings(BaseModel):
+    """Emissions saved by a refactoring, with the uncertainty of the estimate.
+
+    Attributes:
+        median: Difference between the median emissions before and after, in kg CO2
+        low: Lower bound of the confidence interval of the savings
+        high: Upper bound of the confidence interval of the savings
+        confidence: Confidence level of the interval, e.g. 0.95
+        test: Statistical test used to decide whether energy was saved, if one could run
+        pValue: One-sided p-value of the test, if one could run
+        significant: Whether the refactored program uses less energy
+        baseline: Measurements before the refactoring
+        refactored: Measurements after the refactoring
+    """
+
+    median: float
+    low: float
+    high: float
+    confidence: float
+    test: Optional[str] = None
+    pValue: Optional[float] = None
+    significant: bool
+    baseline: MeasurementSummary
+    refactored: MeasurementSummary
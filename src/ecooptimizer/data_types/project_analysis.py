@@ -0,0 +1,53 @@
+"""Data model for the results of analyzing a whole project."""
+
+from collections import Counter
+
+from pydantic import BaseModel
+
+from ecooptimizer.data_types.smell import Smell
+
+
+class ProjectAnalysis(BaseModel):
+    """Smells detected across every Python file of a project.
+
+    Attributes:
+        root: Root directory that was scanned
+        files: Detected smells keyed by file path, for every file analyzed successfully
+        errors: Error message keyed by file path, for every file whose analysis failed
+        total_smells: Number of smells detected across all files
+        smell_counts: Number of detected smells per smell symbol
+    """
+
+    root: str
+    files: dict[str, list[Smell]] = {}
+    errors: dict[str, str] = {}
+    total_smells: int = 0
+    smell_counts: dict[str, int] = {}
+
+    @classmethod
+    def from_results(
+        cls, root: str, files: dict[str, list[Smell]], errors: dict[str, str]
+    ) -> "ProjectAnalysis":
+        """Builds the project result and its aggregate from per-file results.
+
+        Args:
+            root: Root directory that was scanned
+            files: Detected smells keyed by file path
+            errors: Error message keyed by file path
+
+        Returns:
+            ProjectAnalysis: Results ordered by file path, with totals filled in
+        """
+        counts = Counter(smell.symbol for smells in files.values() for smell in smells)
+        return cls(
+            root=root,
+            files=dict(sorted(files.items())),
+            errors=dict(sorted(errors.items())),
+            total_smells=sum(counts.values()),
+            smell_counts=dict(sorted(counts.items())),
+        )
+
+    @property
+    def smells(self) -> list[Smell]:
+        """All detected smells, grouped by file."""
+        return [smell for smells in self.files.values() for smell in smells]
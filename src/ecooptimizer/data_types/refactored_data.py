@@ -0,0 +1,76 @@
+"""Data models for the results of refactorings and their measured savings."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from ecooptimizer.data_types.energy_savings import EnergySavings
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.utils.edit_ranges import EditRange
+
+
+class ChangedFile(BaseModel):
+    """Tracks file changes during refactoring.
+
+    Attributes:
+        original: Path to original file
+        refactored: Path to refactored file
+    """
+
+    original: str
+    refactored: str
+
+
+class RefactoredData(BaseModel):
+    """Contains results of a refactoring operation.
+
+    Attributes:
+        tempDir: Temporary directory with refactored files
+        targetFile: Main file that was refactored
+        energySaved: Estimated energy savings in kg CO2, the median of `energySavings`
+        energySavings: Confidence interval and significance of the savings
+        affectedFiles: List of all files modified during refactoring
+        editRanges: Lines of the target file changed by the refactoring, if known
+        initialSamples: Emissions the refactoring was compared with
+        finalSamples: Emissions measured after the refactoring
+    """
+
+    tempDir: str
+    targetFile: ChangedFile
+    energySaved: Optional[float] = None
+    energySavings: Optional[EnergySavings] = None
+    affectedFiles: list[ChangedFile]
+    editRanges: Optional[list[EditRange]] = Field(default=None, exclude=True)
+    initialSamples: list[float] = Field(default_factory=list, exclude=True)
+    finalSamples: list[float] = Field(default_factory=list, exclude=True)
+
+
+class RefactoredSessionData(RefactoredData):
+    """Contains results of a refactoring session.
+
+    Attributes:
+        accepted: Smells refactored in `tempDir`
+        rejected: Smells whose refactoring saved no energy, or broke the measurement
+        skipped: Smells not refactored, as an earlier refactoring changed their lines
+            or their refactorer failed
+        measurements: Number of refactored batches measured
+    """
+
+    accepted: list[Smell] = []
+    rejected: list[Smell] = []
+    skipped: list[Smell] = []
+    measurements: int = 0
+
+
+class CandidateResult(BaseModel):
+    """Outcome of one smell refactored by `/refactor-candidates`.
+
+    Attributes:
+        smell: Smell that was refactored
+        result: Results of the refactoring, if it saves energy
+        error: Why the refactoring was dropped, otherwise
+    """
+
+    smell: Smell
+    result: Optional[RefactoredData] = None
+    error: Optional[str] = None
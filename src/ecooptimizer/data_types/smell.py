@@ -21,6 +21,8 @@ class Smell(BaseModel):
         type: Smell category/type
         occurences: List of locations where smell appears
         additionalInfo: Optional smell-specific metadata
+        hotness: Share of the workload's CPU time, and so of its energy, spent in the
+            functions containing the smell, when profiled
     """
 
     id: Optional[str] = ""
@@ -34,6 +36,7 @@ class Smell(BaseModel):
     type: str
     occurences: list[Occurence]
     additionalInfo: Optional[AdditionalInfo] = None
+    hotness: Optional[float] = None
 
 
 class CRCSmell(Smell):
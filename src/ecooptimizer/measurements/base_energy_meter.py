@@ -1,27 +1,184 @@
 """Abstract base class for energy measurement implementations."""
 
 from abc import ABC, abstractmethod
+import logging
 from pathlib import Path
+import statistics
+import time
+from typing import Any, Optional
+
+from ecooptimizer.measurements.measurement_cache import CachedMeasurement, MeasurementCache
+from ecooptimizer.measurements.script_runners import (
+    BaseScriptRunner,
+    ResourceUsage,
+    SubprocessRunner,
+)
+
+# Runs of an empty script measured to estimate a runner's overhead
+OVERHEAD_RUNS = 3
 
 
 class BaseEnergyMeter(ABC):
     """Abstract base class for measuring code energy consumption.
 
-    Provides the interface for concrete energy measurement implementations.
+    Provides the interface for concrete energy measurement implementations, and
+    reuses measurements of unchanged code from a `MeasurementCache`.
     """
 
-    def __init__(self):
-        """Initializes the energy meter with empty emissions."""
+    def __init__(
+        self,
+        cache: Optional[MeasurementCache] = None,
+        runner: Optional[BaseScriptRunner] = None,
+    ):
+        """Initializes the energy meter with empty emissions.
+
+        Args:
+            cache: Cache of previous measurements, a private one when omitted
+            runner: Runner executing the measured files, a new interpreter per run when omitted
+        """
         self.emissions = None
+        self.emissions_data: Optional[dict[str, Any]] = None
+        self.cache = cache if cache is not None else MeasurementCache()
+        self.runner = runner if runner is not None else SubprocessRunner()
+        self._run_overhead: Optional[float] = None
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Settings that affect what this meter measures, part of the cache key."""
+        return {"meter": type(self).__name__, "runner": self.runner.name}
 
     @abstractmethod
-    def measure_energy(self, file_path: Path) -> None:
-        """Measures energy consumption of a code file.
+    def _measure_once(self, file_path: Path) -> bool:
+        """Executes a file once and stores its emissions.
 
         Args:
             file_path: Path to the file to measure
 
+        Returns:
+            bool: Whether the file ran successfully
+
         Note:
             Must be implemented by concrete subclasses
         """
         pass
+
+    def _add_resource_usage(self, usage: Optional[ResourceUsage]) -> None:
+        """Stores the resources used by a run alongside its emissions data."""
+        if usage is not None and self.emissions_data is not None:
+            self.emissions_data["resource_usage"] = usage._asdict()
+
+    def measure_once(self, file_path: Path) -> bool:
+        """Executes a file once and stores its emissions, without using the cache.
+
+        If the runner's overhead is subtracted, it is measured first, once per meter.
+
+        Args:
+            file_path: Path to the file to measure
+
+        Returns:
+            bool: Whether the file ran successfully
+        """
+        overhead = self.run_overhead() if self.runner.subtracts_overhead else 0.0
+        succeeded = self._measure_once(file_path)
+        if overhead and self.emissions is not None:
+            self.emissions = max(self.emissions - overhead, 0.0)
+            if self.emissions_data is not None:
+                self.emissions_data["emissions"] = self.emissions
+                self.emissions_data["run_overhead"] = overhead
+        return succeeded
+
+    def run_overhead(self) -> float:
+        """Returns the emissions of running an empty script, measured on first use.
+
+        Returns:
+            float: Median emissions of `OVERHEAD_RUNS` runs, 0 if none succeeded
+        """
+        if self._run_overhead is None:
+            samples: list[float] = []
+            for _ in range(OVERHEAD_RUNS):
+                if self._measure_once(self.runner.empty_script) and self.emissions is not None:
+                    samples.append(self.emissions)
+            self._run_overhead = statistics.median(samples) if samples else 0.0
+            logging.info(f"Measured {self.runner.name} overhead: {self._run_overhead} kg CO2")
+        return self._run_overhead
+
+    def measure_energy(self, file_path: Path, project_dir: Optional[Path] = None) -> None:
+        """Measures energy consumption of a code file.
+
+        A cached measurement is used instead if the file, its project, the
+        interpreter and the meter settings are unchanged since it was taken.
+
+        Args:
+            file_path: Path to the file to measure
+            project_dir: Directory of the project the file belongs to, if known
+        """
+        cache_key = self._cache_key(file_path, project_dir, self.settings)
+        if self._load_cached(cache_key, file_path) is not None:
+            return
+
+        succeeded = self.measure_once(file_path)
+
+        if cache_key is not None and succeeded and self.emissions is not None:
+            self.cache.put(cache_key, self.emissions, self.emissions_data)
+
+    def measure_samples(
+        self,
+        file_path: Path,
+        project_dir: Optional[Path] = None,
+        repetitions: int = 5,
+        warmups: int = 1,
+    ) -> list[float]:
+        """Measures a code file repeatedly, discarding warm-up runs.
+
+        The samples are cached as a whole, under the same conditions as single
+        measurements and the same number of repetitions and warm-up runs.
+
+        Args:
+            file_path: Path to the file to measure
+            project_dir: Directory of the project the file belongs to, if known
+            repetitions: Number of measurements kept
+            warmups: Number of measurements run first and discarded
+
+        Returns:
+            list[float]: Emissions of every kept run, or an empty list if any run failed
+        """
+        settings = {**self.settings, "repetitions": repetitions, "warmups": warmups}
+        cache_key = self._cache_key(file_path, project_dir, settings)
+        cached = self._load_cached(cache_key, file_path)
+        if cached is not None:
+            return list(cached.samples)
+
+        samples: list[float] = []
+        for run in range(warmups + repetitions):
+            if not self.measure_once(file_path) or self.emissions is None:
+                return []
+            if run >= warmups:
+                samples.append(self.emissions)
+
+        self.emissions = statistics.median(samples)
+        if cache_key is not None:
+            self.cache.put(cache_key, self.emissions, self.emissions_data, tuple(samples))
+        return samples
+
+    def _cache_key(
+        self, file_path: Path, project_dir: Optional[Path], settings: dict[str, Any]
+    ) -> Optional[str]:
+        try:
+            return self.cache.make_key(file_path, project_dir, settings)
+        except OSError as e:
+            logging.warning(f"Could not compute measurement cache key: {e}")
+            return None
+
+    def _load_cached(
+        self, cache_key: Optional[str], file_path: Path
+    ) -> Optional[CachedMeasurement]:
+        """Restores a cached measurement into the meter, if there is one."""
+        cached = self.cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            logging.info(
+                f"Reusing energy measurement of {file_path.name} "
+                f"taken {time.time() - cached.measured_at:.0f}s ago."
+            )
+            self.emissions = cached.emissions
+            self.emissions_data = cached.emissions_data
+        return cached
@@ -2,90 +2,103 @@
 
 import logging
 import math
-import os
 from pathlib import Path
-import sys
 import subprocess
-import pandas as pd
-from tempfile import TemporaryDirectory
-from typing import Optional
-from codecarbon import EmissionsTracker
+from typing import TYPE_CHECKING, Any, Optional
 
 from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.script_runners import BaseScriptRunner
+
+if TYPE_CHECKING:
+    from codecarbon import EmissionsTracker
+
+# Options passed to every CodeCarbon tracker; results are read from the
+# tracker itself, so no output file is written
+TRACKER_OPTIONS: dict[str, Any] = {
+    "allow_multiple_runs": True,
+    "tracking_mode": "process",
+    "log_level": "error",
+    "output_methods": [],
+}
 
 
 class CodeCarbonEnergyMeter(BaseEnergyMeter):
-    """Measures code energy consumption using CodeCarbon's emissions tracker."""
+    """Measures code energy consumption using CodeCarbon's emissions tracker.
 
-    def __init__(self):
-        """Initializes the energy meter with empty emissions data."""
-        super().__init__()
-        self.emissions_data = None
+    CodeCarbon is only imported when the first measurement is taken.
+    """
 
-    def measure_energy(self, file_path: Path) -> None:
-        """Executes a file while tracking emissions using CodeCarbon.
+    def __init__(
+        self,
+        cache: Optional[MeasurementCache] = None,
+        runner: Optional[BaseScriptRunner] = None,
+    ):
+        """Initializes the energy meter with empty emissions data.
+
+        Args:
+            cache: Cache of previous measurements, a private one when omitted
+            runner: Runner executing the measured files, a new interpreter per run when omitted
+        """
+        super().__init__(cache, runner)
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Settings that affect what this meter measures."""
+        return {**super().settings, **TRACKER_OPTIONS}
+
+    def _measure_once(self, file_path: Path) -> bool:
+        """Executes a file under CodeCarbon and stores its emissions.
 
         Args:
             file_path: Path to Python file to measure
 
-        Note:
-            Creates temporary directory for emissions data
-            Handles subprocess execution errors
-            Stores emissions data if measurement succeeds
+        Returns:
+            bool: Whether the file ran successfully
         """
+        from codecarbon import EmissionsTracker
+
         logging.info(f"Starting CodeCarbon energy measurement on {file_path.name}")
+        succeeded = False
+        usage = None
+        self.emissions_data = None
+
+        tracker = EmissionsTracker(**TRACKER_OPTIONS)
+        tracker.start()
+
+        try:
+            usage = self.runner.run(file_path)
+            succeeded = True
+            logging.info("CodeCarbon measurement completed successfully.")
+        except subprocess.SubprocessError as e:
+            logging.error(f"Error executing file '{file_path}': {e}")
+        finally:
+            emissions = tracker.stop()
+            # Only store float or None values
+            if (isinstance(emissions, float) and not math.isnan(emissions)) or emissions is None:
+                self.emissions = emissions
+            else:
+                logging.warning(f"Unexpected emissions type {type(emissions)}. Setting to None.")
+                self.emissions = None
+
+            self.emissions_data = self._extract_emissions_data(tracker)
+            if self.emissions_data is None:
+                logging.error("Emissions data missing - measurement failed")
+            self._add_resource_usage(usage)
 
-        with TemporaryDirectory() as custom_temp_dir:
-            os.environ["TEMP"] = custom_temp_dir  # For Windows
-            os.environ["TMPDIR"] = custom_temp_dir  # For Unix-based systems
-
-            tracker = EmissionsTracker(
-                output_dir=custom_temp_dir,
-                allow_multiple_runs=True,
-                tracking_mode="process",
-                log_level="error",
-            )  # type: ignore
-            tracker.start()
-
-            try:
-                subprocess.run(
-                    [sys.executable, file_path], capture_output=True, text=True, check=True
-                )
-                logging.info("CodeCarbon measurement completed successfully.")
-            except subprocess.CalledProcessError as e:
-                logging.error(f"Error executing file '{file_path}': {e}")
-            finally:
-                emissions = tracker.stop()
-                # Only store float or None values
-                if (
-                    isinstance(emissions, float) and not math.isnan(emissions)
-                ) or emissions is None:
-                    self.emissions = emissions
-                else:
-                    logging.warning(
-                        f"Unexpected emissions type {type(emissions)}. Setting to None."
-                    )
-                    self.emissions = None
-
-                emissions_file = Path(custom_temp_dir) / "emissions.csv"
-                if emissions_file.exists():
-                    self.emissions_data = self._extract_emissions_data(emissions_file)
-                else:
-                    logging.error("Emissions file missing - measurement failed")
-
-    def _extract_emissions_data(self, csv_path: Path) -> Optional[dict]:
-        """Extracts emissions data from CodeCarbon output CSV.
+        return succeeded
+
+    def _extract_emissions_data(self, tracker: "EmissionsTracker") -> Optional[dict[str, Any]]:
+        """Extracts the emissions record of a stopped CodeCarbon tracker.
 
         Args:
-            csv_path: Path to emissions CSV file
+            tracker: Tracker that was stopped
 
         Returns:
-            dict: Last measurement record from CSV
-            None: If extraction fails
+            dict: Fields of the final emissions record
+            None: If the tracker did not produce one
         """
-        try:
-            df = pd.read_csv(csv_path)
-            return df.to_dict(orient="records")[-1]
-        except Exception as e:
-            logging.error(f"Failed to read emissions data: {e}")
+        emissions_data = getattr(tracker, "final_emissions_data", None)
+        if emissions_data is None:
             return None
+        return dict(emissions_data.values)
@@ -0,0 +1,90 @@
+"""Measurement of the emissions of original and refactored code.
+
+Every measurement runs the workload configured for the measured file, with the
+energy meter selected for the current request, as many times as configured.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.data_types.energy_savings import EnergySavings
+from ecooptimizer.measurements.energy_meters import get_energy_meter
+from ecooptimizer.measurements.measurement_scheduler import MeasurementScheduler, Variant
+from ecooptimizer.measurements.statistics import compare_measurements
+from ecooptimizer.measurements.workloads import workload_script
+
+
+def measure_energy(file: Path, project_dir: Optional[Path] = None) -> Optional[float]:
+    """Measures energy consumption of a file's configured workload.
+
+    Args:
+        file: Python file to measure
+        project_dir: Directory of the project the file belongs to, if known
+
+    Returns:
+        Optional[float]: Energy consumption in kg CO2, or None if measurement fails
+    """
+    energy_meter = get_energy_meter()
+    energy_meter.measure_energy(workload_script(file, project_dir), project_dir)
+    return energy_meter.emissions
+
+
+def measure_samples(file: Path, project_dir: Optional[Path] = None) -> list[float]:
+    """Measures a file's workload as many times as configured, discarding warm-up runs.
+
+    Args:
+        file: Python file to measure
+        project_dir: Directory of the project the file belongs to, if known
+
+    Returns:
+        list[float]: Emissions of every kept run in kg CO2, empty if measurement fails
+    """
+    repetitions = CONFIG["measurementRepetitions"]
+    if repetitions <= 1:
+        emissions = measure_energy(file, project_dir)
+        return [emissions] if emissions else []
+
+    return get_energy_meter().measure_samples(
+        workload_script(file, project_dir), project_dir, repetitions, CONFIG["measurementWarmups"]
+    )
+
+
+def measure_interleaved(
+    original: Path,
+    refactored: Path,
+    original_dir: Optional[Path] = None,
+    refactored_dir: Optional[Path] = None,
+) -> tuple[list[float], list[float]]:
+    """Measures original and refactored code in interleaved order, as often as configured.
+
+    Args:
+        original: Python file of the original code
+        refactored: Python file of the refactored code, in its own workspace
+        original_dir: Directory of the original project, if known
+        refactored_dir: Workspace holding the refactored project, if known
+
+    Returns:
+        tuple[list[float], list[float]]: Emissions of the original and refactored
+            code in kg CO2, either of them empty if its measurement fails
+    """
+    scheduler = MeasurementScheduler(
+        get_energy_meter(), CONFIG["measurementRepetitions"], CONFIG["measurementWarmups"]
+    )
+    samples = scheduler.run(
+        [
+            Variant("original", workload_script(original, original_dir)),
+            Variant("refactored", workload_script(refactored, refactored_dir)),
+        ]
+    )
+    return samples["original"], samples["refactored"]
+
+
+def compare_energy(initial_samples: list[float], final_samples: list[float]) -> EnergySavings:
+    """Compares measurements before and after refactoring with the configured test."""
+    return compare_measurements(
+        initial_samples,
+        final_samples,
+        CONFIG["significanceTest"],
+        CONFIG["significanceLevel"],
+    )
@@ -0,0 +1,82 @@
+"""Selection of the energy meter used to measure refactorings."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Literal, get_args
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.script_runners import create_script_runner
+
+EnergyMeterName = Literal["codecarbon", "rapl", "estimated"]
+
+# Energy meters that can be selected in the configuration or per request
+ENERGY_METERS: tuple[str, ...] = get_args(EnergyMeterName)
+
+_energy_meters: dict[tuple[str, str], BaseEnergyMeter] = {}
+
+# Meter selected for the current request, if any
+_selected_meter: ContextVar[str | None] = ContextVar("energy_meter", default=None)
+
+
+def create_energy_meter(name: str, runner: str = "subprocess") -> BaseEnergyMeter:
+    """Creates a new energy meter.
+
+    Args:
+        name: One of `ENERGY_METERS`
+        runner: One of `SCRIPT_RUNNERS`, executing the measured files
+
+    Returns:
+        BaseEnergyMeter: The meter
+
+    Raises:
+        ValueError: If the meter or runner is unknown
+    """
+    if name == "codecarbon":
+        from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+
+        return CodeCarbonEnergyMeter(runner=create_script_runner(runner))
+    if name == "rapl":
+        from ecooptimizer.measurements.rapl_energy_meter import RaplEnergyMeter
+
+        return RaplEnergyMeter(runner=create_script_runner(runner))
+    if name == "estimated":
+        from ecooptimizer.measurements.estimated_energy_meter import EstimatedEnergyMeter
+
+        return EstimatedEnergyMeter(runner=create_script_runner(runner))
+    raise ValueError(f"Unknown energy meter: {name}")
+
+
+def get_energy_meter(name: str | None = None) -> BaseEnergyMeter:
+    """Returns the shared energy meter of a kind, creating it on first use.
+
+    The meter executes files with the runner in `CONFIG["measurementRunner"]`.
+
+    Args:
+        name: One of `ENERGY_METERS`; when omitted, the meter selected with
+            `using_energy_meter`, or else `CONFIG["energyMeter"]`
+
+    Returns:
+        BaseEnergyMeter: The meter, shared so that its measurement cache is too
+    """
+    name = name or _selected_meter.get() or CONFIG["energyMeter"]
+    key = (name, CONFIG["measurementRunner"])
+    meter = _energy_meters.get(key)
+    if meter is None:
+        meter = _energy_meters[key] = create_energy_meter(*key)
+    return meter
+
+
+@contextmanager
+def using_energy_meter(name: str | None) -> Iterator[None]:
+    """Selects the energy meter returned by `get_energy_meter` within the block.
+
+    Args:
+        name: One of `ENERGY_METERS`, or None to keep the configured meter
+    """
+    token = _selected_meter.set(name)
+    try:
+        yield
+    finally:
+        _selected_meter.reset(token)
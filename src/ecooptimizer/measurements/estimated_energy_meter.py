@@ -0,0 +1,239 @@
+"""Energy estimation from the CPU time and memory used by a run, calibrated per host."""
+
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+from tempfile import TemporaryDirectory
+import time
+from typing import Any, Optional
+
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.rapl_energy_meter import DEFAULT_CARBON_INTENSITY, JOULES_PER_KWH
+from ecooptimizer.measurements.script_runners import BaseScriptRunner
+
+# Where calibration constants of every host are stored
+CALIBRATION_FILE = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "ecooptimizer"
+    / "energy_calibration.json"
+)
+
+# CPU-bound workload measured by the calibration runs
+CALIBRATION_SCRIPT = "total = 0\nfor i in range(10_000_000):\n    total += i * i\n"
+CALIBRATION_RUNS = 3
+
+# Used when calibration is impossible, e.g. without resource usage; not stored
+DEFAULT_CPU_JOULES_PER_SECOND = 15.0
+
+# Power drawn per GB of resident memory, as in CodeCarbon's model of 3 W per 8 GB
+MEMORY_WATTS_PER_GB = 0.375
+
+BYTES_PER_GB = 1024**3
+
+
+def host_key() -> str:
+    """Identifies the host a calibration constant belongs to."""
+    return "|".join(
+        (platform.node(), platform.machine(), platform.processor(), str(os.cpu_count()))
+    )
+
+
+def memory_energy(max_rss: int, duration: float) -> float:
+    """Returns the estimated energy drawn by memory during a run, in joules.
+
+    Args:
+        max_rss: Peak resident set size of the run, in bytes
+        duration: Wall-clock duration of the run, in seconds
+
+    Returns:
+        float: Energy in joules
+    """
+    return MEMORY_WATTS_PER_GB * max_rss / BYTES_PER_GB * duration
+
+
+def load_calibration(calibration_file: Path, host: str) -> Optional[float]:
+    """Reads the calibration constant stored for a host.
+
+    Args:
+        calibration_file: File of stored calibrations
+        host: Key of the host, from `host_key`
+
+    Returns:
+        Optional[float]: Joules per second of CPU time, None if not calibrated
+    """
+    try:
+        calibrations = json.loads(calibration_file.read_text())
+        return float(calibrations[host]["cpuJoulesPerSecond"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_calibration(calibration_file: Path, host: str, value: float, reference: str) -> None:
+    """Stores the calibration constant of a host, keeping other hosts' constants.
+
+    Args:
+        calibration_file: File of stored calibrations
+        host: Key of the host, from `host_key`
+        value: Joules per second of CPU time
+        reference: Name of the meter the constant was calibrated against
+    """
+    try:
+        calibrations = json.loads(calibration_file.read_text())
+    except (OSError, ValueError):
+        calibrations = {}
+    calibrations[host] = {
+        "cpuJoulesPerSecond": value,
+        "reference": reference,
+        "calibratedAt": time.time(),
+    }
+    calibration_file.parent.mkdir(parents=True, exist_ok=True)
+    calibration_file.write_text(json.dumps(calibrations, indent=2))
+
+
+class EstimatedEnergyMeter(BaseEnergyMeter):
+    """Estimates code energy consumption from the CPU time and peak memory of a run.
+
+    CPU time is converted to energy with a per-host constant, calibrated once
+    against a reference meter and stored locally. An estimate takes no longer
+    than the run itself, which suits development iterations, but only shows the
+    direction and rough size of a change.
+    """
+
+    def __init__(
+        self,
+        calibration_file: Path = CALIBRATION_FILE,
+        reference: Optional[BaseEnergyMeter] = None,
+        carbon_intensity: float = DEFAULT_CARBON_INTENSITY,
+        cache: Optional[MeasurementCache] = None,
+        runner: Optional[BaseScriptRunner] = None,
+    ):
+        """Initializes the meter; the host is calibrated on first use if needed.
+
+        Args:
+            calibration_file: File of stored calibrations
+            reference: Meter calibrated against, RAPL's (or CodeCarbon's) when omitted
+            carbon_intensity: Emissions per unit of energy, in kg CO2 per kWh
+            cache: Cache of previous measurements, a private one when omitted
+            runner: Runner executing the measured files, a new interpreter per run when omitted
+        """
+        super().__init__(cache, runner)
+        self.calibration_file = calibration_file
+        self.carbon_intensity = carbon_intensity
+        self._reference = reference
+        self._cpu_joules_per_second: Optional[float] = None
+
+    @property
+    def reference(self) -> BaseEnergyMeter:
+        """Meter calibrated against, created on first use."""
+        if self._reference is None:
+            from ecooptimizer.measurements.rapl_energy_meter import RaplEnergyMeter
+
+            self._reference = RaplEnergyMeter(cache=MeasurementCache(ttl=0), runner=self.runner)
+        return self._reference
+
+    @property
+    def cpu_joules_per_second(self) -> float:
+        """Energy per second of CPU time on this host, loaded or calibrated once."""
+        if self._cpu_joules_per_second is None:
+            host = host_key()
+            stored = load_calibration(self.calibration_file, host)
+            if stored is None:
+                stored = self.calibrate()
+            self._cpu_joules_per_second = stored
+        return self._cpu_joules_per_second
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Settings that affect what this meter measures."""
+        return {
+            **super().settings,
+            "cpu_joules_per_second": self.cpu_joules_per_second,
+            "carbon_intensity": self.carbon_intensity,
+        }
+
+    def calibrate(self) -> float:
+        """Derives this host's constant from CPU-bound runs measured by the reference meter.
+
+        The constant is stored, unless calibration fails and a default is used.
+
+        Returns:
+            float: Joules per second of CPU time
+        """
+        logging.info(f"Calibrating energy estimates against {type(self.reference).__name__}.")
+        ratios: list[float] = []
+        with TemporaryDirectory(prefix="ecooptimizer-calibration-") as temp_dir:
+            script = Path(temp_dir) / "calibration.py"
+            script.write_text(CALIBRATION_SCRIPT)
+            for _ in range(CALIBRATION_RUNS):
+                if not self.reference.measure_once(script):
+                    continue
+                data = self.reference.emissions_data or {}
+                usage = data.get("resource_usage")
+                if not usage or "energy_consumed" not in data:
+                    continue
+                cpu_time = usage["user_time"] + usage["system_time"]
+                energy = data["energy_consumed"] * JOULES_PER_KWH - memory_energy(
+                    usage["max_rss"], data.get("duration", 0.0)
+                )
+                if cpu_time > 0 and energy > 0:
+                    ratios.append(energy / cpu_time)
+
+        if not ratios:
+            logging.warning(
+                "Could not calibrate energy estimates, using "
+                f"{DEFAULT_CPU_JOULES_PER_SECOND} J per CPU second."
+            )
+            return DEFAULT_CPU_JOULES_PER_SECOND
+
+        value = statistics.median(ratios)
+        save_calibration(self.calibration_file, host_key(), value, type(self.reference).__name__)
+        logging.info(f"Calibrated energy estimates: {value} J per CPU second.")
+        return value
+
+    def _measure_once(self, file_path: Path) -> bool:
+        """Executes a file and estimates its emissions from the resources it used.
+
+        Args:
+            file_path: Path to Python file to measure
+
+        Returns:
+            bool: Whether the file ran successfully
+        """
+        cpu_joules_per_second = self.cpu_joules_per_second
+        logging.info(f"Estimating energy of {file_path.name}")
+
+        start = time.perf_counter()
+        try:
+            usage = self.runner.run(file_path)
+        except subprocess.SubprocessError as e:
+            logging.error(f"Error executing file '{file_path}': {e}")
+            self.emissions = None
+            self.emissions_data = None
+            return False
+        duration = time.perf_counter() - start
+
+        if usage is not None:
+            cpu_time = usage.user_time + usage.system_time
+            ram_energy = memory_energy(usage.max_rss, duration)
+        else:
+            # Without resource usage, the run is assumed to keep one CPU busy
+            cpu_time = duration
+            ram_energy = 0.0
+
+        cpu_energy = cpu_joules_per_second * cpu_time
+        energy = (cpu_energy + ram_energy) / JOULES_PER_KWH
+        self.emissions = energy * self.carbon_intensity
+        self.emissions_data = {
+            "duration": duration,
+            "emissions": self.emissions,
+            "energy_consumed": energy,
+            "cpu_energy": cpu_energy / JOULES_PER_KWH,
+            "ram_energy": ram_energy / JOULES_PER_KWH,
+        }
+        self._add_resource_usage(usage)
+        return True
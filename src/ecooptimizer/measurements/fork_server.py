@@ -0,0 +1,165 @@
+"""Warm interpreter that forks a child to run each measured script.
+
+`ForkServerRunner` executes this file as `__main__` in a new interpreter,
+so that the server imports nothing beyond the standard library and its children
+start with the modules of a freshly booted interpreter; for the same reason it
+avoids `pathlib` and imports `traceback` only when a script fails. The server
+reads one script path per line from stdin and answers each with the child's
+exit code, resource usage and whether it timed out.
+
+Usage: fork_server.py TIMEOUT CPU_TIME MEMORY, where 0 disables a limit.
+"""
+
+import os
+import runpy
+import signal
+import sys
+from typing import Any, TextIO
+
+# Fields of `os.wait4`'s resource usage sent back for every script, in order
+RUSAGE_FIELDS = (
+    "ru_utime",
+    "ru_stime",
+    "ru_maxrss",
+    "ru_nvcsw",
+    "ru_nivcsw",
+    "ru_minflt",
+    "ru_majflt",
+)
+
+
+def limit_resources(cpu_time: int, memory: int) -> None:
+    """Caps the CPU time and address space of the calling process.
+
+    Limits above the current hard limits are lowered to them.
+
+    Args:
+        cpu_time: Seconds of CPU time before the process is killed, 0 for no limit
+        memory: Bytes of address space the process may allocate, 0 for no limit
+    """
+    import resource
+
+    for limit, value in ((resource.RLIMIT_CPU, cpu_time), (resource.RLIMIT_AS, memory)):
+        if not value:
+            continue
+        _, hard = resource.getrlimit(limit)
+        if hard != resource.RLIM_INFINITY:
+            value = min(value, hard)
+        resource.setrlimit(limit, (value, hard))
+
+
+def kill_group(pid: int) -> None:
+    """Kills a process group, ignoring groups that already exited.
+
+    Args:
+        pid: Process ID of the group leader
+    """
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def join_threads() -> None:
+    """Waits for every non-daemon thread but the calling one, as interpreter shutdown does."""
+    import threading
+
+    current = threading.current_thread()
+    for thread in threading.enumerate():
+        if thread is not current and not thread.daemon:
+            thread.join()
+
+
+def run_script(path: str) -> int:
+    """Runs a script as `__main__`, like `python path` would, and waits for its threads.
+
+    Args:
+        path: Absolute path of the script
+
+    Returns:
+        int: Exit code of the script
+    """
+    sys.argv = [path]
+    sys.path.insert(0, os.path.dirname(path))  # noqa: PTH120
+    try:
+        runpy.run_path(path, run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+
+    join_threads()
+    return code
+
+
+def _detach_stdio() -> None:
+    """Points the child's standard streams away from the server's command pipes."""
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    sys.stdin = open(os.devnull)  # noqa: PTH123
+
+
+def serve(
+    commands: TextIO, replies: TextIO, timeout: float = 0, cpu_time: int = 0, memory: int = 0
+) -> None:
+    """Forks a child for every script path read, until the commands end.
+
+    Every child leads its own process group, which is killed when the script
+    runs longer than the timeout. Children exit by raising `SystemExit` out of
+    this function, so it must only run as the server's main module.
+
+    Args:
+        commands: Stream of script paths, one per line
+        replies: Stream receiving, for every script, a line with its exit code,
+            the `RUSAGE_FIELDS` of its resource usage, and 1 if it timed out or 0
+        timeout: Seconds of wall-clock time a script may run, 0 for no limit
+        cpu_time: Seconds of CPU time a script may use, 0 for no limit
+        memory: Bytes of address space a script may allocate, 0 for no limit
+    """
+    child = 0
+    timed_out = False
+
+    def expire(*_: Any) -> None:  # noqa: ANN401
+        nonlocal timed_out
+        timed_out = True
+        kill_group(child)
+
+    signal.signal(signal.SIGALRM, expire)
+    for line in commands:
+        path = line.rstrip("\n")
+        timed_out = False
+        child = os.fork()
+        if child == 0:
+            os.setpgid(0, 0)
+            signal.signal(signal.SIGALRM, signal.SIG_DFL)
+            _detach_stdio()
+            limit_resources(cpu_time, memory)
+            # Leave through interpreter shutdown, which runs the script's exit
+            # handlers and flushes its output, like `python path`
+            raise SystemExit(run_script(path))
+
+        try:
+            os.setpgid(child, child)
+        except OSError:
+            pass  # The child already did
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        _, status, rusage = os.wait4(child, 0)
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+        usage = " ".join(str(getattr(rusage, field)) for field in RUSAGE_FIELDS)
+        replies.write(f"{os.waitstatus_to_exitcode(status)} {usage} {int(timed_out)}\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.stdin, sys.stdout, float(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]))
@@ -0,0 +1,220 @@
+"""In-memory cache of energy measurements keyed by the measured code and environment."""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Any, NamedTuple, Optional
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.refactorers.multi_file_refactorer import (
+    collect_python_files,
+    load_ignore_patterns,
+)
+
+# Width of a host load bucket, in runnable processes per CPU
+LOAD_STEP = 0.5
+
+# Highest load bucket; every load above it counts as saturated
+MAX_LOAD_BUCKET = 2
+
+
+class CachedMeasurement(NamedTuple):
+    """A successful measurement.
+
+    Attributes:
+        emissions: Measured emissions in kg CO2
+        emissions_data: Full measurement record, if any
+        measured_at: Time of the measurement, in seconds since the epoch
+        samples: Every measured emissions value, for repeated measurements
+    """
+
+    emissions: float
+    emissions_data: Optional[dict[str, Any]]
+    measured_at: float
+    samples: tuple[float, ...] = ()
+
+
+def load_profile() -> tuple[int, Optional[int]]:
+    """Describes how busy the host is, coarsely enough to be stable between requests.
+
+    The 5-minute load average is used, so that the measured runs themselves
+    barely move it.
+
+    Returns:
+        tuple: CPU count and load bucket, None where the load average is unavailable
+    """
+    cpu_count = os.cpu_count() or 1
+    try:
+        load = os.getloadavg()[1]
+    except (AttributeError, OSError):
+        return cpu_count, None
+    return cpu_count, min(int(load / cpu_count / LOAD_STEP), MAX_LOAD_BUCKET)
+
+
+def interpreter_fingerprint() -> str:
+    """Identifies the interpreter that runs measured files."""
+    return f"{sys.executable}\0{sys.version}"
+
+
+class MeasurementCache:
+    """Reuses measurements of unchanged code measured under the same conditions.
+
+    Entries are keyed by a hash of the target file's content and of every Python
+    file in its project, the interpreter and the meter's settings. They expire
+    after a time to live, and are all dropped when the host's load profile
+    changes, as measurements taken under another load are not comparable.
+
+    Other files of the project, such as data or configuration files read by the
+    workload, are not part of the key: a measurement is reused after they change
+    until it expires, so the time to live should be short for such projects.
+    """
+
+    def __init__(
+        self, ttl: Optional[float] = None, max_entries: int = 256, max_file_hashes: int = 4096
+    ):
+        """Creates an empty cache.
+
+        Args:
+            ttl: Seconds an entry stays valid, `CONFIG["measurementCacheTtl"]` when omitted;
+                0 disables caching
+            max_entries: Maximum number of entries kept before evicting the oldest
+            max_file_hashes: Maximum number of file hashes remembered before forgetting
+                the least recently used
+        """
+        self._ttl = ttl
+        self.max_entries = max_entries
+        self.max_file_hashes = max_file_hashes
+        self.entries: dict[str, CachedMeasurement] = {}
+        self.profile = load_profile()
+        # Files of removed workspaces are never looked up again, so the least recently
+        # used hashes are forgotten
+        self._file_hashes: OrderedDict[Path, tuple[int, int, str]] = OrderedDict()
+
+    @property
+    def ttl(self) -> float:
+        return CONFIG["measurementCacheTtl"] if self._ttl is None else self._ttl
+
+    def _file_hash(self, file_path: Path) -> str:
+        """Hashes a file's content, rehashing only when its size or mtime changed."""
+        stat = file_path.stat()
+        cached = self._file_hashes.get(file_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            self._file_hashes.move_to_end(file_path)
+            return cached[2]
+
+        digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+        self._file_hashes[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        self._file_hashes.move_to_end(file_path)
+        while len(self._file_hashes) > self.max_file_hashes:
+            self._file_hashes.popitem(last=False)
+        return digest
+
+    def make_key(
+        self, file_path: Path, project_dir: Optional[Path], settings: dict[str, Any]
+    ) -> str:
+        """Builds the key of measuring a file in its project's current state.
+
+        Paths are taken relative to the project, so that an identical copy of the
+        project shares the key of the original. A file outside the project, such as
+        the driver of a workload run from the project, is identified by its name and
+        content alongside the project's files. Only the project's Python files are
+        hashed.
+
+        Args:
+            file_path: Python file to execute
+            project_dir: Directory of the project the file belongs to or runs, if known
+            settings: Meter settings that affect the measurement
+
+        Returns:
+            str: SHA-256 hex digest identifying the measurement
+
+        Raises:
+            OSError: If a file cannot be read
+        """
+        key = hashlib.sha256()
+
+        def add(part: str) -> None:
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+
+        add(interpreter_fingerprint())
+        add(json.dumps(settings, sort_keys=True, default=str))
+
+        if project_dir is None:
+            add(file_path.name)
+            add(self._file_hash(file_path))
+        else:
+            if file_path.resolve().is_relative_to(project_dir.resolve()):
+                add(file_path.resolve().relative_to(project_dir.resolve()).as_posix())
+            else:
+                add(file_path.name)
+            for file in sorted(collect_python_files(project_dir, load_ignore_patterns())):
+                add(file.relative_to(project_dir).as_posix())
+                add(self._file_hash(file))
+            add(self._file_hash(file_path))
+
+        return key.hexdigest()
+
+    def _check_load_profile(self) -> None:
+        profile = load_profile()
+        if profile != self.profile:
+            if self.entries:
+                CONFIG["refactorLogger"].info(
+                    f"🧹 Host load changed ({self.profile} -> {profile}), "
+                    f"dropping {len(self.entries)} cached measurements."
+                )
+            self.entries.clear()
+            self.profile = profile
+
+    def get(self, key: str) -> Optional[CachedMeasurement]:
+        """Returns an unexpired measurement for a key.
+
+        Args:
+            key: Key returned by `make_key`
+
+        Returns:
+            CachedMeasurement: The cached measurement, or None on a miss
+        """
+        self._check_load_profile()
+
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry.measured_at >= self.ttl:
+            del self.entries[key]
+            return None
+        return entry
+
+    def put(
+        self,
+        key: str,
+        emissions: float,
+        emissions_data: Optional[dict[str, Any]] = None,
+        samples: tuple[float, ...] = (),
+    ) -> None:
+        """Stores a successful measurement, evicting the oldest entry if full.
+
+        Args:
+            key: Key returned by `make_key`
+            emissions: Measured emissions in kg CO2
+            emissions_data: Full measurement record, if any
+            samples: Every measured emissions value, for repeated measurements
+        """
+        if self.ttl <= 0:
+            return
+
+        self.entries.pop(key, None)
+        self.entries[key] = CachedMeasurement(emissions, emissions_data, time.time(), samples)
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    def clear(self) -> None:
+        """Removes every cached measurement."""
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,101 @@
+"""Interleaved measurement of several variants of a program."""
+
+import logging
+from pathlib import Path
+import random
+from typing import NamedTuple, Optional
+
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+
+
+class Variant(NamedTuple):
+    """A version of a program measured by the scheduler.
+
+    Attributes:
+        name: Name identifying the variant in the results, e.g. `original`
+        file_path: File executed to measure the variant, within its own workspace
+    """
+
+    name: str
+    file_path: Path
+
+
+def interleaved_order(variants: int, rounds: int, rng: random.Random) -> list[int]:
+    """Returns the order in which variants are measured, one run per variant and round.
+
+    Rounds are paired into mirrored blocks, e.g. ABBA for two variants or ABCCBA
+    for three, so that a variant measured early in one round is measured late in
+    the next. The order within each block is drawn at random.
+
+    Args:
+        variants: Number of variants
+        rounds: Number of runs of every variant
+        rng: Source of the random block orders
+
+    Returns:
+        list[int]: Indices of the variants, in measurement order
+    """
+    order: list[int] = []
+    for block in range(0, rounds, 2):
+        permutation = rng.sample(range(variants), variants)
+        order.extend(permutation)
+        if block + 1 < rounds:
+            order.extend(reversed(permutation))
+    return order
+
+
+class MeasurementScheduler:
+    """Measures variants of a program in a randomized interleaved order.
+
+    Measuring the original and refactored code one after the other lets thermal
+    state and background load drift between the two readings. Interleaving their
+    runs spreads that drift over every variant alike.
+    """
+
+    def __init__(
+        self,
+        meter: BaseEnergyMeter,
+        rounds: int = 5,
+        warmups: int = 1,
+        seed: Optional[int] = None,
+    ):
+        """Initializes the scheduler.
+
+        Args:
+            meter: Meter taking every measurement
+            rounds: Number of kept runs of every variant
+            warmups: Number of runs of every variant measured first and discarded
+            seed: Seed of the random measurement order, a fresh one when omitted
+        """
+        self.meter = meter
+        self.rounds = rounds
+        self.warmups = warmups
+        self.rng = random.Random(seed)
+
+    def run(self, variants: list[Variant]) -> dict[str, list[float]]:
+        """Measures every variant `rounds` times, interleaving their runs.
+
+        Measurements are always taken afresh, since samples are only comparable
+        when taken under the same conditions.
+
+        Args:
+            variants: Variants to measure
+
+        Returns:
+            dict[str, list[float]]: Emissions of every kept run, by variant name. If a
+                run fails, measuring stops and the failed variant's samples are empty.
+        """
+        samples: dict[str, list[float]] = {variant.name: [] for variant in variants}
+        warmup_order = interleaved_order(len(variants), self.warmups, self.rng)
+        order = interleaved_order(len(variants), self.rounds, self.rng)
+
+        for run, index in enumerate(warmup_order + order):
+            variant = variants[index]
+            if not self.meter.measure_once(variant.file_path) or self.meter.emissions is None:
+                logging.error(f"Measurement of variant '{variant.name}' failed.")
+                samples[variant.name] = []
+                return samples
+            if run >= len(warmup_order):
+                samples[variant.name].append(self.meter.emissions)
+
+        return samples
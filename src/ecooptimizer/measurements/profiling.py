@@ -0,0 +1,272 @@
+"""Attribution of a workload's energy to the functions, and smells, it runs.
+
+The workload is run once more under `cProfile`, timed with CPU time, through
+the meter's script runner. Its energy is apportioned to functions by their
+share of the CPU time spent in their own code, including the built-in functions
+they call, and every smell is scored with
+the share of the functions containing its occurrences. Smells on cold code
+can then be skipped rather than measured.
+
+Only code running in the workload's own process is profiled, so commands
+starting other processes attribute their time to the call starting them.
+"""
+
+import ast
+import logging
+from pathlib import Path
+import pstats
+import subprocess
+from tempfile import TemporaryDirectory
+from typing import NamedTuple, Optional
+
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+
+PROFILE_DRIVER = """\
+import cProfile
+import os
+import runpy
+import sys
+import time
+
+script = {script!r}
+sys.argv = [script]
+sys.path.insert(0, os.path.dirname(script))
+profiler = cProfile.Profile(time.process_time)
+try:
+    profiler.runcall(runpy.run_path, script, run_name="__main__")
+finally:
+    profiler.dump_stats({output!r})
+"""
+
+# Name cProfile gives to the code at the top level of a module
+MODULE_CODE = "<module>"
+
+# Functions logged after profiling
+TOP_FUNCTIONS = 5
+
+# Profile entry of a function: file, first line and name
+ProfiledFunction = tuple[str, int, str]
+
+
+def _has_source(function: ProfiledFunction) -> bool:
+    """Whether a profiled function has a source file, unlike built-ins and `exec`'d code."""
+    return not function[0].startswith(("~", "<"))
+
+
+class FunctionEnergy(NamedTuple):
+    """Share of a workload spent in a function's own code.
+
+    Attributes:
+        file: Resolved path of the function's source file
+        line: First line of the function, its first decorator if any
+        name: Name of the function, `<module>` for top-level code
+        cpu_time: Seconds of CPU time spent in the function, excluding its callees other
+            than built-in functions
+        share: Fraction of the workload's CPU time spent in the function
+        emissions: Share of the workload's emissions in kg CO2, if they were measured
+    """
+
+    file: Path
+    line: int
+    name: str
+    cpu_time: float
+    share: float
+    emissions: Optional[float]
+
+
+class FunctionSpan(NamedTuple):
+    """Lines of a function in its source file.
+
+    Attributes:
+        line: First line, its first decorator if any
+        end_line: Last line
+        name: Name of the function
+    """
+
+    line: int
+    end_line: int
+    name: str
+
+
+def function_spans(file_path: Path) -> list[FunctionSpan]:
+    """Lists the functions of a source file, top-level code included.
+
+    Args:
+        file_path: Python source file
+
+    Returns:
+        list[FunctionSpan]: Spans of the module's code and of every function, outermost
+            first; empty if the file cannot be parsed
+    """
+    try:
+        source = file_path.read_text()
+        tree = ast.parse(source, filename=str(file_path))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return []
+
+    spans = [FunctionSpan(1, max(len(source.splitlines()), 1), MODULE_CODE)]
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            line = min([node.lineno, *(decorator.lineno for decorator in node.decorator_list)])
+            spans.append(FunctionSpan(line, node.end_lineno or node.lineno, node.name))
+    return sorted(spans, key=lambda span: (span.line, -span.end_line))
+
+
+class EnergyProfile:
+    """Energy of a workload apportioned to the functions it ran."""
+
+    def __init__(self, functions: list[FunctionEnergy], emissions: Optional[float] = None):
+        """Initializes the profile.
+
+        Args:
+            functions: Share of the workload spent in every profiled function
+            emissions: Measured emissions of the workload in kg CO2, if any
+        """
+        self.functions = functions
+        self.emissions = emissions
+        self._by_function = {(item.file, item.name): item for item in functions}
+        self._by_location = {(item.file, item.line, item.name): item for item in functions}
+        self._spans: dict[Path, list[FunctionSpan]] = {}
+
+    @classmethod
+    def from_stats(cls, stats_file: Path, emissions: Optional[float] = None) -> "EnergyProfile":
+        """Builds the profile from statistics dumped by `cProfile`.
+
+        Args:
+            stats_file: File written by `Profile.dump_stats`
+            emissions: Measured emissions of the workload in kg CO2, if any
+
+        Returns:
+            EnergyProfile: The profile, with functions in decreasing order of CPU time
+        """
+        entries = pstats.Stats(str(stats_file)).stats  # type: ignore[attr-defined]
+        total = sum(entry[2] for entry in entries.values()) or 1.0
+        own_times = {
+            function: entry[2] for function, entry in entries.items() if _has_source(function)
+        }
+
+        # Functions without source are charged to their callers, in proportion to
+        # their calls, and through chains of such functions to the first with source
+        pending = [
+            (function, entry[2], 0)
+            for function, entry in entries.items()
+            if not _has_source(function) and entry[2] > 0
+        ]
+        while pending:
+            function, time, depth = pending.pop()
+            callers = entries[function][4]
+            calls = sum(counts[0] for counts in callers.values())
+            if not calls or depth >= len(entries):
+                continue
+            for caller, counts in callers.items():
+                charged = time * counts[0] / calls
+                if caller in own_times:
+                    own_times[caller] += charged
+                elif caller in entries:
+                    pending.append((caller, charged, depth + 1))
+
+        functions: list[FunctionEnergy] = []
+        for (file, line, name), own_time in own_times.items():
+            share = own_time / total
+            functions.append(
+                FunctionEnergy(
+                    Path(file).resolve(),
+                    line,
+                    name,
+                    own_time,
+                    share,
+                    share * emissions if emissions is not None else None,
+                )
+            )
+        return cls(sorted(functions, key=lambda item: -item.cpu_time), emissions)
+
+    def function_at(self, file_path: Path, line: int) -> Optional[FunctionEnergy]:
+        """Returns the profiled function whose own code contains a line.
+
+        Args:
+            file_path: Source file of the line
+            line: Line number
+
+        Returns:
+            Optional[FunctionEnergy]: The innermost function containing the line, None if
+                it never ran
+        """
+        file_path = file_path.resolve()
+        if file_path not in self._spans:
+            self._spans[file_path] = function_spans(file_path)
+
+        enclosing = [span for span in self._spans[file_path] if span.line <= line <= span.end_line]
+        if not enclosing:
+            return None
+        span = enclosing[-1]
+        if span.name == MODULE_CODE:
+            return self._by_function.get((file_path, MODULE_CODE))
+        return self._by_location.get((file_path, span.line, span.name))
+
+    def hotness(self, smell: Smell) -> float:
+        """Returns the share of the workload spent in the functions containing a smell.
+
+        Args:
+            smell: Smell whose occurrences are looked up
+
+        Returns:
+            float: Fraction of the workload's CPU time, 0 if none of them ran
+        """
+        functions = {
+            function
+            for occurrence in smell.occurences
+            if (function := self.function_at(Path(smell.path), occurrence.line)) is not None
+        }
+        return sum(function.share for function in functions)
+
+    def annotate(self, smells: list[Smell]) -> list[Smell]:
+        """Returns copies of smells with their hotness set.
+
+        Args:
+            smells: Smells detected in the profiled code
+
+        Returns:
+            list[Smell]: Copies of the smells, in the same order
+        """
+        return [smell.model_copy(update={"hotness": self.hotness(smell)}) for smell in smells]
+
+
+def profile_energy(
+    meter: BaseEnergyMeter, file_path: Path, project_dir: Optional[Path] = None
+) -> Optional[EnergyProfile]:
+    """Measures a file's energy and apportions it to the functions it runs.
+
+    Energy is measured as usual, so that profiling does not inflate it, and
+    the file is then run once under `cProfile` with the meter's runner.
+
+    Args:
+        meter: Meter measuring the file's energy and running it profiled
+        file_path: File to execute, e.g. the driver of a workload
+        project_dir: Directory of the project the file belongs to or runs, if known
+
+    Returns:
+        Optional[EnergyProfile]: The profile, None if the profiled run fails
+    """
+    meter.measure_energy(file_path, project_dir)
+    emissions = meter.emissions
+
+    with TemporaryDirectory(prefix="ecooptimizer-profile-") as temp_dir:
+        driver = Path(temp_dir) / "profile_driver.py"
+        output = Path(temp_dir) / "profile.stats"
+        driver.write_text(
+            PROFILE_DRIVER.format(script=str(file_path.resolve()), output=str(output))
+        )
+        try:
+            meter.runner.run(driver)
+            profile = EnergyProfile.from_stats(output, emissions)
+        except (subprocess.SubprocessError, OSError, EOFError, ValueError) as e:
+            logging.error(f"Error profiling file '{file_path}': {e}")
+            return None
+
+    for function in profile.functions[:TOP_FUNCTIONS]:
+        logging.info(
+            f"{function.share:.1%} of CPU time in {function.name} "
+            f"({function.file.name}:{function.line}), {function.emissions} kg CO2"
+        )
+    return profile
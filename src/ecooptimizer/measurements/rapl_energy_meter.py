@@ -0,0 +1,194 @@
+"""Energy measurement from the Linux powercap interface to Intel/AMD RAPL counters."""
+
+import logging
+from pathlib import Path
+import re
+import subprocess
+import time
+from typing import Any, NamedTuple, Optional
+
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.script_runners import BaseScriptRunner
+
+# Where the kernel exposes powercap zones
+DEFAULT_SYSFS_ROOT = Path("/sys/class/powercap")
+
+# Top-level RAPL zones, one per CPU package; subzones are part of their package's count
+PACKAGE_ZONE = re.compile(r"intel-rapl:\d+")
+
+# CodeCarbon's world average carbon intensity, in kg CO2 per kWh
+DEFAULT_CARBON_INTENSITY = 0.475
+
+JOULES_PER_KWH = 3_600_000
+
+
+class RaplZone(NamedTuple):
+    """A powercap zone whose energy counter is read.
+
+    Attributes:
+        name: Name of the zone, e.g. `package-0`
+        energy_file: File holding the counter, in microjoules
+        max_energy: Value at which the counter wraps around, in microjoules
+    """
+
+    name: str
+    energy_file: Path
+    max_energy: int
+
+
+def _read_int(file: Path) -> int:
+    return int(file.read_text().strip())
+
+
+def find_rapl_zones(sysfs_root: Path = DEFAULT_SYSFS_ROOT) -> list[RaplZone]:
+    """Lists the readable RAPL package zones under a powercap directory.
+
+    Args:
+        sysfs_root: Powercap class directory, or a fake tree with the same layout
+
+    Returns:
+        list[RaplZone]: Readable package zones, empty if RAPL is unavailable
+    """
+    zones: list[RaplZone] = []
+    for zone_dir in sorted(sysfs_root.glob("intel-rapl*")):
+        if not PACKAGE_ZONE.fullmatch(zone_dir.name):
+            continue
+        energy_file = zone_dir / "energy_uj"
+        try:
+            _read_int(energy_file)
+            max_energy = _read_int(zone_dir / "max_energy_range_uj")
+            name = (zone_dir / "name").read_text().strip()
+        except (OSError, ValueError):
+            continue
+        zones.append(RaplZone(name, energy_file, max_energy))
+    return zones
+
+
+def energy_delta(before: int, after: int, max_energy: int) -> int:
+    """Returns the energy counted between two readings, allowing for one wraparound.
+
+    Args:
+        before: Counter value read first, in microjoules
+        after: Counter value read last, in microjoules
+        max_energy: Value at which the counter wraps around, in microjoules
+
+    Returns:
+        int: Energy consumed in microjoules
+    """
+    return (after - before) % (max_energy + 1)
+
+
+class RaplEnergyMeter(BaseEnergyMeter):
+    """Measures code energy consumption from RAPL counters exposed through powercap.
+
+    The counters of every CPU package are read before and after running the
+    file, so the measurement covers the whole package rather than only the
+    process. Energy is converted to emissions with a fixed carbon intensity.
+    Where no counter is readable, measurements are delegated to CodeCarbon.
+    """
+
+    def __init__(
+        self,
+        sysfs_root: Path = DEFAULT_SYSFS_ROOT,
+        carbon_intensity: float = DEFAULT_CARBON_INTENSITY,
+        fallback: Optional[BaseEnergyMeter] = None,
+        cache: Optional[MeasurementCache] = None,
+        runner: Optional[BaseScriptRunner] = None,
+    ):
+        """Initializes the meter; zones are discovered on first use.
+
+        Args:
+            sysfs_root: Powercap class directory, or a fake tree with the same layout
+            carbon_intensity: Emissions per unit of energy, in kg CO2 per kWh
+            fallback: Meter used when RAPL is unavailable, CodeCarbon's when omitted
+            cache: Cache of previous measurements, a private one when omitted
+            runner: Runner executing the measured files, a new interpreter per run when omitted
+        """
+        super().__init__(cache, runner)
+        self.sysfs_root = sysfs_root
+        self.carbon_intensity = carbon_intensity
+        self._fallback = fallback
+        self._zones: Optional[list[RaplZone]] = None
+
+    @property
+    def zones(self) -> list[RaplZone]:
+        """Readable package zones, discovered once."""
+        if self._zones is None:
+            self._zones = find_rapl_zones(self.sysfs_root)
+            if not self._zones:
+                logging.warning(
+                    f"No readable RAPL counters under {self.sysfs_root}, "
+                    "falling back to CodeCarbon."
+                )
+        return self._zones
+
+    @property
+    def fallback(self) -> BaseEnergyMeter:
+        """Meter used when RAPL is unavailable, created on first use."""
+        if self._fallback is None:
+            from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+
+            self._fallback = CodeCarbonEnergyMeter(self.cache, self.runner)
+        return self._fallback
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        """Settings that affect what this meter measures."""
+        if not self.zones:
+            return self.fallback.settings
+        return {
+            **super().settings,
+            "zones": [zone.name for zone in self.zones],
+            "carbon_intensity": self.carbon_intensity,
+        }
+
+    def _read_counters(self) -> list[int]:
+        return [_read_int(zone.energy_file) for zone in self.zones]
+
+    def _measure_once(self, file_path: Path) -> bool:
+        """Executes a file between two readings of the RAPL counters.
+
+        Args:
+            file_path: Path to Python file to measure
+
+        Returns:
+            bool: Whether the file ran successfully
+        """
+        if not self.zones:
+            succeeded = self.fallback._measure_once(file_path)
+            self.emissions = self.fallback.emissions
+            self.emissions_data = self.fallback.emissions_data
+            return succeeded
+
+        logging.info(f"Starting RAPL energy measurement on {file_path.name}")
+        succeeded = False
+        usage = None
+
+        start = time.perf_counter()
+        before = self._read_counters()
+        try:
+            usage = self.runner.run(file_path)
+            succeeded = True
+            logging.info("RAPL measurement completed successfully.")
+        except subprocess.SubprocessError as e:
+            logging.error(f"Error executing file '{file_path}': {e}")
+        finally:
+            after = self._read_counters()
+            duration = time.perf_counter() - start
+
+        zone_energy = {
+            zone.name: energy_delta(first, last, zone.max_energy) / 1e6 / JOULES_PER_KWH
+            for zone, first, last in zip(self.zones, before, after)
+        }
+        energy = sum(zone_energy.values())
+        self.emissions = energy * self.carbon_intensity
+        self.emissions_data = {
+            "duration": duration,
+            "emissions": self.emissions,
+            "energy_consumed": energy,
+            "cpu_energy": energy,
+            "zones": zone_energy,
+        }
+        self._add_resource_usage(usage)
+        return succeeded
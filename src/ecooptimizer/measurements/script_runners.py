@@ -0,0 +1,363 @@
+"""Ways of executing the Python files whose energy is measured.
+
+Files run sandboxed: with a wall-clock timeout after which their whole process
+group is killed and, on POSIX systems, CPU time and address space limits. Their
+resource usage is collected with `os.wait4` where available.
+"""
+
+from abc import ABC, abstractmethod
+import logging
+import math
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+from tempfile import TemporaryFile, mkdtemp
+import threading
+from typing import IO, NamedTuple, Optional
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.measurements.fork_server import RUSAGE_FIELDS, kill_group
+
+# Runners that can be selected in the configuration
+SCRIPT_RUNNERS = ("subprocess", "fork-server")
+
+FORK_SERVER_SCRIPT = Path(__file__).with_name("fork_server.py")
+
+# Runs the fork server without putting its own directory, or the working
+# directory, on the path of the scripts it forks. The server is executed
+# directly rather than with `runpy`, whose frames would restore the server's
+# `sys.argv` while a child exits, before the child script's exit handlers run.
+FORK_SERVER_BOOTSTRAP = (
+    "import sys; del sys.path[0], sys.argv[0]; "
+    "exec(compile(open(sys.argv[0]).read(), sys.argv[0], 'exec'), "
+    "{'__name__': '__main__', '__file__': sys.argv[0]})"
+)
+
+# Applies the limits given as its first two arguments, with `limit_resources`
+# loaded from the fork server file, then runs the script given as third argument
+# like `python script` would. Limits are applied in the new interpreter, as
+# setting them between fork and exec is unsafe in a process with threads.
+SANDBOX_BOOTSTRAP = (
+    "import os, runpy, sys; "
+    "server = {}; "
+    "exec(compile(open(sys.argv[1]).read(), sys.argv[1], 'exec'), server); "
+    "server['limit_resources'](int(sys.argv[2]), int(sys.argv[3])); "
+    "sys.argv = sys.argv[4:]; sys.path[0] = os.path.dirname(sys.argv[0]); "
+    "runpy.run_path(sys.argv[0], run_name='__main__')"
+)
+
+# Characters of a failed script's error output kept for its error
+STDERR_TAIL = 4000
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class RunLimits(NamedTuple):
+    """Limits on every run of a measured file; 0 disables a limit.
+
+    Attributes:
+        timeout: Seconds of wall-clock time before the run is killed
+        cpu_time: Seconds of CPU time before the run is killed
+        memory: Bytes of address space the run may allocate
+    """
+
+    timeout: float = 0
+    cpu_time: int = 0
+    memory: int = 0
+
+    @classmethod
+    def from_config(cls) -> "RunLimits":
+        """Returns the limits in the configuration, with CPU time capped like wall-clock time."""
+        timeout = CONFIG["measurementTimeout"]
+        return cls(
+            timeout=timeout,
+            cpu_time=math.ceil(timeout),
+            memory=CONFIG["measurementMemoryLimit"] * BYTES_PER_MB,
+        )
+
+
+class ResourceUsage(NamedTuple):
+    """Resources used by a run of a measured file.
+
+    Attributes:
+        user_time: Seconds of CPU time spent in user mode
+        system_time: Seconds of CPU time spent in the kernel
+        max_rss: Peak resident set size, in bytes
+        voluntary_context_switches: Times the run gave up the CPU, e.g. waiting for I/O
+        involuntary_context_switches: Times the run was preempted
+        minor_page_faults: Page faults served without I/O
+        major_page_faults: Page faults that required I/O
+    """
+
+    user_time: float
+    system_time: float
+    max_rss: int
+    voluntary_context_switches: int
+    involuntary_context_switches: int
+    minor_page_faults: int
+    major_page_faults: int
+
+    @classmethod
+    def from_rusage(cls, values: list[float]) -> "ResourceUsage":
+        """Builds the usage from the values of `RUSAGE_FIELDS`, in order.
+
+        Args:
+            values: Values reported by `os.wait4`
+
+        Returns:
+            ResourceUsage: The usage, with the peak resident set size in bytes
+        """
+        utime, stime, maxrss, nvcsw, nivcsw, minflt, majflt = values
+        # Linux reports the peak resident set size in kilobytes, macOS in bytes
+        max_rss = int(maxrss) if sys.platform == "darwin" else int(maxrss) * 1024
+        return cls(utime, stime, max_rss, int(nvcsw), int(nivcsw), int(minflt), int(majflt))
+
+
+class BaseScriptRunner(ABC):
+    """Abstract base class for executing a file whose energy is measured.
+
+    Attributes:
+        name: Name of the runner in the configuration
+        subtracts_overhead: Whether meters subtract the measured cost of running
+            an empty script from every measurement
+    """
+
+    name = ""
+    subtracts_overhead = False
+
+    def __init__(self, limits: Optional[RunLimits] = None):
+        """Initializes the runner.
+
+        Args:
+            limits: Limits on every run, the configured ones when omitted
+        """
+        self.limits = limits if limits is not None else RunLimits.from_config()
+
+    @abstractmethod
+    def run(self, file_path: Path) -> Optional[ResourceUsage]:
+        """Executes a Python file to completion.
+
+        Args:
+            file_path: File to execute
+
+        Returns:
+            Optional[ResourceUsage]: Resources used by the run, None where unavailable
+
+        Raises:
+            subprocess.CalledProcessError: If the file exits with an error
+            subprocess.TimeoutExpired: If the file runs longer than the timeout
+        """
+        pass
+
+    @property
+    def empty_script(self) -> Path:
+        """Script without code, measured to estimate the runner's overhead."""
+        raise NotImplementedError(f"{type(self).__name__} does not measure its overhead")
+
+    def close(self) -> None:  # noqa: B027
+        """Releases the runner's resources; it starts again when next used."""
+
+
+class SubprocessRunner(BaseScriptRunner):
+    """Executes every file in a new interpreter leading its own process group."""
+
+    name = "subprocess"
+
+    def run(self, file_path: Path) -> Optional[ResourceUsage]:
+        """Executes a Python file in a new interpreter.
+
+        Args:
+            file_path: File to execute
+
+        Returns:
+            Optional[ResourceUsage]: Resources used by the run, None without `os.wait4`
+
+        Raises:
+            subprocess.CalledProcessError: If the file exits with an error
+            subprocess.TimeoutExpired: If the file runs longer than the timeout
+        """
+        command = [sys.executable, str(file_path)]
+        with TemporaryFile() as stderr:
+            if hasattr(os, "wait4"):
+                returncode, usage = self._run_sandboxed(command, stderr)
+            else:
+                returncode, usage = self._run_portable(command, stderr), None
+
+            if returncode != 0:
+                stderr.seek(0)
+                error = stderr.read().decode(errors="replace")[-STDERR_TAIL:]
+                raise subprocess.CalledProcessError(returncode, command, stderr=error)
+        return usage
+
+    def _run_sandboxed(self, command: list[str], stderr: IO[bytes]) -> tuple[int, ResourceUsage]:
+        """Runs a command under resource limits, killing its process group on timeout."""
+        executable, file_path = command
+        process = subprocess.Popen(
+            [
+                executable,
+                "-c",
+                SANDBOX_BOOTSTRAP,
+                str(FORK_SERVER_SCRIPT),
+                str(self.limits.cpu_time),
+                str(self.limits.memory),
+                file_path,
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr,
+            start_new_session=True,
+        )
+        expired = threading.Event()
+
+        def expire() -> None:
+            expired.set()
+            kill_group(process.pid)
+
+        timer = threading.Timer(self.limits.timeout, expire) if self.limits.timeout else None
+        if timer is not None:
+            timer.start()
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        # The process is reaped, so Popen must not wait for it
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(command, self.limits.timeout)
+        usage = ResourceUsage.from_rusage([getattr(rusage, field) for field in RUSAGE_FIELDS])
+        return process.returncode, usage
+
+    def _run_portable(self, command: list[str], stderr: IO[bytes]) -> int:
+        """Runs a command with a timeout, where processes cannot be limited or waited for."""
+        process = subprocess.Popen(
+            command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=stderr
+        )
+        try:
+            return process.wait(self.limits.timeout or None)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+
+
+class ForkServerRunner(BaseScriptRunner):
+    """Executes every file in a child forked from a warm interpreter.
+
+    The interpreter boots once, so runs no longer include interpreter startup
+    and site imports. What remains of the cost of a run, forking and waiting for
+    the child, is measured on an empty script and subtracted by the meters.
+    Only available where `os.fork` is.
+    """
+
+    name = "fork-server"
+    subtracts_overhead = True
+
+    def __init__(self, limits: Optional[RunLimits] = None):
+        """Initializes the runner; the server starts on first use.
+
+        Args:
+            limits: Limits on every run, the configured ones when omitted
+        """
+        super().__init__(limits)
+        self._server: Optional[subprocess.Popen[str]] = None
+        self._empty_dir: Optional[Path] = None
+        self._lock = threading.Lock()
+
+    @property
+    def empty_script(self) -> Path:
+        """Script without code, measured to estimate the cost of forking."""
+        if self._empty_dir is None:
+            self._empty_dir = Path(mkdtemp(prefix="ecooptimizer-fork-"))
+            (self._empty_dir / "empty.py").write_text("")
+        return self._empty_dir / "empty.py"
+
+    def _start(self) -> subprocess.Popen[str]:
+        if self._server is None or self._server.poll() is not None:
+            logging.info("Starting fork server for energy measurements.")
+            self._server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    FORK_SERVER_BOOTSTRAP,
+                    str(FORK_SERVER_SCRIPT),
+                    *(str(limit) for limit in self.limits),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+        return self._server
+
+    def run(self, file_path: Path) -> Optional[ResourceUsage]:
+        """Executes a Python file in a child of the fork server.
+
+        Args:
+            file_path: File to execute
+
+        Returns:
+            Optional[ResourceUsage]: Resources used by the run
+
+        Raises:
+            subprocess.CalledProcessError: If the file exits with an error
+            subprocess.TimeoutExpired: If the file runs longer than the timeout
+            RuntimeError: If the fork server stops
+        """
+        path = str(Path(file_path).resolve())
+        with self._lock:
+            server = self._start()
+            commands: IO[str] = server.stdin  # type: ignore
+            replies: IO[str] = server.stdout  # type: ignore
+            try:
+                commands.write(f"{path}\n")
+                commands.flush()
+                reply = replies.readline()
+            except OSError as e:
+                raise RuntimeError(f"Fork server failed: {e}") from e
+        if not reply:
+            raise RuntimeError("Fork server stopped unexpectedly")
+
+        returncode, *rusage, timed_out = reply.split()
+        command = [sys.executable, path]
+        if int(timed_out):
+            raise subprocess.TimeoutExpired(command, self.limits.timeout)
+        if int(returncode) != 0:
+            raise subprocess.CalledProcessError(int(returncode), command)
+        return ResourceUsage.from_rusage([float(value) for value in rusage])
+
+    def close(self) -> None:
+        """Stops the fork server and removes the empty script."""
+        with self._lock:
+            if self._server is not None:
+                self._server.stdin.close()  # type: ignore
+                self._server.wait()
+                self._server = None
+            if self._empty_dir is not None:
+                shutil.rmtree(self._empty_dir, ignore_errors=True)
+                self._empty_dir = None
+
+
+def create_script_runner(name: str, limits: Optional[RunLimits] = None) -> BaseScriptRunner:
+    """Creates a new script runner.
+
+    Args:
+        name: One of `SCRIPT_RUNNERS`
+        limits: Limits on every run, the configured ones when omitted
+
+    Returns:
+        BaseScriptRunner: The runner, a `SubprocessRunner` if forking is unsupported
+
+    Raises:
+        ValueError: If the runner is unknown
+    """
+    if name == "subprocess":
+        return SubprocessRunner(limits)
+    if name == "fork-server":
+        if not hasattr(os, "fork"):
+            logging.warning("Fork server is unavailable on this platform, using subprocesses.")
+            return SubprocessRunner(limits)
+        return ForkServerRunner(limits)
+    raise ValueError(f"Unknown script runner: {name}")
@@ -0,0 +1,248 @@
+"""Statistics for deciding whether repeated energy measurements show savings."""
+
+from collections.abc import Callable, Sequence
+from functools import cache
+import math
+import random
+import statistics
+
+from ecooptimizer.data_types.energy_savings import EnergySavings, MeasurementSummary
+
+# Number of resamples drawn for bootstrap confidence intervals
+BOOTSTRAP_RESAMPLES = 2000
+
+# Seed of the bootstrap, so that the same measurements always give the same interval
+BOOTSTRAP_SEED = 0
+
+# Largest group size for which the exact Mann-Whitney distribution is computed
+EXACT_MANN_WHITNEY_LIMIT = 25
+
+
+def interquartile_range(samples: Sequence[float]) -> float:
+    """Returns the distance between the first and third quartiles of the samples."""
+    if len(samples) < 2:
+        return 0.0
+    q1, _, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    return q3 - q1
+
+
+def bootstrap_interval(
+    statistic: Callable[..., float], groups: Sequence[Sequence[float]], confidence: float
+) -> tuple[float, float]:
+    """Computes a percentile bootstrap confidence interval.
+
+    Args:
+        statistic: Function of one sample list per group
+        groups: Samples of each group, resampled independently
+        confidence: Confidence level of the interval, e.g. 0.95
+
+    Returns:
+        tuple[float, float]: Lower and upper bounds of the interval
+    """
+    rng = random.Random(BOOTSTRAP_SEED)
+    estimates = sorted(
+        statistic(*(rng.choices(group, k=len(group)) for group in groups))
+        for _ in range(BOOTSTRAP_RESAMPLES)
+    )
+    tail = (1 - confidence) / 2
+    last = BOOTSTRAP_RESAMPLES - 1
+    return estimates[round(tail * last)], estimates[round((1 - tail) * last)]
+
+
+def summarize(samples: Sequence[float], confidence: float = 0.95) -> MeasurementSummary:
+    """Summarizes repeated measurements of one program.
+
+    Args:
+        samples: Measured emissions, warm-up runs excluded
+        confidence: Confidence level of the interval of the median
+
+    Returns:
+        MeasurementSummary: Median, IQR and confidence interval of the median
+    """
+    low, high = bootstrap_interval(statistics.median, [samples], confidence)
+    return MeasurementSummary(
+        samples=len(samples),
+        median=statistics.median(samples),
+        iqr=interquartile_range(samples),
+        low=low,
+        high=high,
+    )
+
+
+@cache
+def _mann_whitney_counts(n1: int, n2: int) -> tuple[int, ...]:
+    """Counts the orderings of two groups without ties giving each value of U.
+
+    U is the number of pairs in which the first group's sample is the larger one.
+    """
+    if n1 == 0 or n2 == 0:
+        return (1,)
+
+    counts = [0] * (n1 * n2 + 1)
+    # The largest sample either belongs to the first group, beating all n2 others,
+    # or to the second group, beating none of the first group's
+    for u, count in enumerate(_mann_whitney_counts(n1 - 1, n2)):
+        counts[u + n2] += count
+    for u, count in enumerate(_mann_whitney_counts(n1, n2 - 1)):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_greater(baseline: Sequence[float], refactored: Sequence[float]) -> float:
+    """One-sided Mann-Whitney U test that baseline emissions are larger.
+
+    The p-value is exact for small groups without ties, and otherwise uses the
+    normal approximation with tie and continuity corrections.
+
+    Returns:
+        float: p-value of the test
+    """
+    n1, n2 = len(baseline), len(refactored)
+    u = sum(
+        1.0 if before > after else 0.5 if before == after else 0.0
+        for before in baseline
+        for after in refactored
+    )
+
+    combined = [*baseline, *refactored]
+    tie_sizes = [combined.count(value) for value in set(combined)]
+
+    if max(tie_sizes) == 1 and max(n1, n2) <= EXACT_MANN_WHITNEY_LIMIT:
+        counts = _mann_whitney_counts(n1, n2)
+        return sum(counts[math.ceil(u) :]) / math.comb(n1 + n2, n1)
+
+    n = n1 + n2
+    tie_correction = sum(t**3 - t for t in tie_sizes) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_correction))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def _beta_fraction(a: float, b: float, x: float) -> float:
+    """Evaluates the continued fraction of the incomplete beta function (Lentz's method)."""
+    tiny = 1e-300
+    c = 1.0
+    d = 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    result = d
+
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            delta = c * d
+            result *= delta
+        if abs(delta - 1) < 1e-14:
+            break
+
+    return result
+
+
+def regularized_beta(a: float, b: float, x: float) -> float:
+    """Returns the regularized incomplete beta function I_x(a, b)."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+
+    front = math.exp(
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)
+    )
+    if x < (a + 1) / (a + b + 2):
+        return front * _beta_fraction(a, b, x) / a
+    return 1 - front * _beta_fraction(b, a, 1 - x) / b
+
+
+def student_t_sf(t: float, df: float) -> float:
+    """Returns P(T > t) for Student's t distribution with `df` degrees of freedom."""
+    tail = 0.5 * regularized_beta(df / 2, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1 - tail
+
+
+def welch_greater(baseline: Sequence[float], refactored: Sequence[float]) -> float:
+    """One-sided Welch t-test that mean baseline emissions are larger.
+
+    Returns:
+        float: p-value of the test
+    """
+    n1, n2 = len(baseline), len(refactored)
+    mean1, mean2 = statistics.fmean(baseline), statistics.fmean(refactored)
+    var1, var2 = statistics.variance(baseline) / n1, statistics.variance(refactored) / n2
+
+    standard_error_sq = var1 + var2
+    if standard_error_sq == 0:
+        return 0.0 if mean1 > mean2 else 1.0
+
+    t = (mean1 - mean2) / math.sqrt(standard_error_sq)
+    df = standard_error_sq**2 / (var1**2 / (n1 - 1) + var2**2 / (n2 - 1))
+    return student_t_sf(t, df)
+
+
+# One-sided tests that the first group's emissions are larger, by name
+SIGNIFICANCE_TESTS: dict[str, Callable[[Sequence[float], Sequence[float]], float]] = {
+    "mann-whitney": mann_whitney_greater,
+    "welch": welch_greater,
+}
+
+
+def _median_difference(baseline: Sequence[float], refactored: Sequence[float]) -> float:
+    return statistics.median(baseline) - statistics.median(refactored)
+
+
+def compare_measurements(
+    baseline: Sequence[float],
+    refactored: Sequence[float],
+    test: str = "mann-whitney",
+    alpha: float = 0.05,
+    confidence: float = 0.95,
+) -> EnergySavings:
+    """Estimates the emissions saved by a refactoring and whether they are significant.
+
+    With fewer than two samples on either side no test can run, and any decrease
+    of the median counts as a saving.
+
+    Args:
+        baseline: Emissions measured before the refactoring
+        refactored: Emissions measured after the refactoring
+        test: Name of the one-sided test in `SIGNIFICANCE_TESTS`
+        alpha: Significance level of the test
+        confidence: Confidence level of the reported intervals
+
+    Returns:
+        EnergySavings: Median savings, their confidence interval and the test's outcome
+
+    Raises:
+        ValueError: If a side has no samples or the test is unknown
+    """
+    if not baseline or not refactored:
+        raise ValueError("Both measurements need at least one sample")
+    if test not in SIGNIFICANCE_TESTS:
+        raise ValueError(f"Unknown significance test: {test}")
+
+    saved = _median_difference(baseline, refactored)
+    low, high = bootstrap_interval(_median_difference, [baseline, refactored], confidence)
+
+    if len(baseline) < 2 or len(refactored) < 2:
+        test_name, p_value, significant = None, None, saved > 0
+    else:
+        p_value = SIGNIFICANCE_TESTS[test](baseline, refactored)
+        test_name, significant = test, p_value < alpha
+
+    return EnergySavings(
+        median=saved,
+        low=low,
+        high=high,
+        confidence=confidence,
+        test=test_name,
+        pValue=p_value,
+        significant=significant,
+        baseline=summarize(baseline, confidence),
+        refactored=summarize(refactored, confidence),
+    )
@@ -0,0 +1,176 @@
+"""Workloads executed to measure the energy of a refactored module.
+
+Most modules do nothing when executed directly, so measuring them as scripts
+compares two runs of an empty program. A workload instead exercises the
+module: its project's tests that import it, a chosen pytest selection, or any
+command, run from the workspace holding the code being measured. Workloads
+are run through a small driver script, so every energy meter and script
+runner measures them like any other file.
+"""
+
+import ast
+import atexit
+import hashlib
+import logging
+from pathlib import Path
+import shlex
+import shutil
+from tempfile import mkdtemp
+from typing import Optional
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.refactorers.multi_file_refactorer import (
+    collect_python_files,
+    load_ignore_patterns,
+)
+from ecooptimizer.utils.module_names import dotted_module_name
+
+# Workloads that can be selected in the configuration
+WORKLOADS = ("script", "tests", "command")
+
+# Arguments passed to pytest before the selection; the cache provider would
+# write into the workspace and the plugins of the host could change the workload
+PYTEST_OPTIONS = ["-q", "-p", "no:cacheprovider", "-p", "no:randomly"]
+
+TESTS_DRIVER = """\
+import os
+import sys
+
+os.chdir({project!r})
+sys.path.insert(0, {project!r})
+import pytest
+
+sys.exit(pytest.main({arguments!r}))
+"""
+
+COMMAND_DRIVER = """\
+import subprocess
+import sys
+
+sys.exit(subprocess.run({command!r}, cwd={project!r}).returncode)
+"""
+
+_driver_dir: Optional[Path] = None
+
+
+def is_test_file(file_path: Path) -> bool:
+    """Whether pytest collects a file by default."""
+    return file_path.name.startswith("test_") or file_path.stem.endswith("_test")
+
+
+def imported_modules(file_path: Path) -> set[str]:
+    """Returns the absolute names of the modules a file imports.
+
+    Relative imports are resolved against the file's package. Names imported
+    from a module are included as submodules, since they may be.
+
+    Args:
+        file_path: Python source file
+
+    Returns:
+        set[str]: Dotted module names, empty if the file cannot be parsed
+    """
+    try:
+        tree = ast.parse(file_path.read_text(), filename=str(file_path))
+    except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+        return set()
+
+    package = dotted_module_name(file_path).split(".")[:-1]
+    modules: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = package[: len(package) - node.level + 1] if node.level else []
+            module = ".".join([*base, *([node.module] if node.module else [])])
+            if module:
+                modules.add(module)
+            modules.update(
+                f"{module}.{alias.name}" if module else alias.name for alias in node.names
+            )
+    return modules
+
+
+def find_importing_tests(target_file: Path, project_dir: Path) -> list[Path]:
+    """Lists the test files of a project that import a module.
+
+    Args:
+        target_file: Module whose tests are wanted
+        project_dir: Project holding the module and its tests
+
+    Returns:
+        list[Path]: Test files importing the module or one of its submodules, sorted
+    """
+    target = dotted_module_name(target_file)
+    tests: list[Path] = []
+    for file in collect_python_files(project_dir, load_ignore_patterns()):
+        if not is_test_file(file) or file.resolve() == target_file.resolve():
+            continue
+        modules = imported_modules(file)
+        # Modules outside any package are imported by their stem, so both names match
+        if any(
+            module == name or module.startswith(f"{name}.")
+            for module in modules
+            for name in {target, target_file.stem}
+        ):
+            tests.append(file)
+    return sorted(tests)
+
+
+def _write_driver(source: str) -> Path:
+    """Writes a driver script named after its content, so that it is written once."""
+    global _driver_dir
+    if _driver_dir is None:
+        _driver_dir = Path(mkdtemp(prefix="ecooptimizer-workloads-"))
+        atexit.register(shutil.rmtree, _driver_dir, True)
+
+    driver = _driver_dir / f"workload_{hashlib.sha256(source.encode()).hexdigest()[:16]}.py"
+    if not driver.exists():
+        driver.write_text(source)
+    return driver
+
+
+def workload_script(target_file: Path, project_dir: Optional[Path] = None) -> Path:
+    """Returns the file to execute to measure a module, following `CONFIG["workload"]`.
+
+    With the `tests` workload, the pytest arguments in `CONFIG["workloadTests"]`
+    are run from the project, or else the project's tests importing the module.
+    With the `command` workload, `CONFIG["workloadCommand"]` is run from the
+    project, with `{file}` replaced by the module's path. The module itself is
+    executed with the `script` workload, or when no other workload applies.
+
+    Args:
+        target_file: Module being measured
+        project_dir: Project holding the module, its parent directory when omitted
+
+    Returns:
+        Path: The module, or a driver script running the workload from the project
+    """
+    workload = CONFIG["workload"]
+    project_dir = (project_dir or target_file.parent).resolve()
+
+    if workload == "tests":
+        selection = shlex.split(CONFIG["workloadTests"])
+        if not selection:
+            selection = [
+                file.relative_to(project_dir).as_posix()
+                for file in find_importing_tests(target_file, project_dir)
+            ]
+        if not selection:
+            logging.warning(f"No tests import {target_file.name}, executing it instead.")
+            return target_file
+        return _write_driver(
+            TESTS_DRIVER.format(project=str(project_dir), arguments=PYTEST_OPTIONS + selection)
+        )
+
+    if workload == "command":
+        command = [
+            argument.replace("{file}", str(target_file.resolve()))
+            for argument in shlex.split(CONFIG["workloadCommand"])
+        ]
+        if not command:
+            logging.warning("No workload command is configured, executing the module instead.")
+            return target_file
+        return _write_driver(COMMAND_DRIVER.format(project=str(project_dir), command=command))
+
+    return target_file
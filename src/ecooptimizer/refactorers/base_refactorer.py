@@ -14,12 +14,18 @@ class BaseRefactorer(ABC, Generic[T]):
 
     Type Parameters:
         T: Type of smell this refactorer handles (must inherit from Smell)
+
+    Attributes:
+        modified_files: Files changed by the refactoring
     """
 
     def __init__(self):
         """Initializes the refactorer with empty modified files list."""
         self.modified_files: list[Path] = []
 
+    def _prepare_write(self, file: Path) -> None:
+        """Called before a file is written; subclasses override it to drop stale state."""
+
     @abstractmethod
     def refactor(
         self,
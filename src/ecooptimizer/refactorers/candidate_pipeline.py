@@ -0,0 +1,264 @@
+"""Two-stage pipeline evaluating independent refactorings of many smells.
+
+Refactoring is CPU-bound and independent across smells, while measuring
+energy needs a quiet machine. Stage one therefore generates a candidate per
+smell concurrently, in a pool of worker processes, each in its own workspace.
+Stage two measures the candidates one at a time, in the order they are
+generated, and yields every result as soon as it is measured. Once the first
+candidate is ready, the wall time approaches that of the measurements alone.
+
+Measurements of every pipeline of the process go through one lock, so that
+concurrent pipelines queue their measurements instead of overlapping them.
+`CandidateEvaluator` measures candidates against the original code of their files.
+"""
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import partial
+import multiprocessing
+import os
+from pathlib import Path
+import shutil
+from tempfile import mkdtemp
+import threading
+from typing import Generic, NamedTuple, Optional, TypeVar
+
+from ecooptimizer.api.error_handler import (
+    EnergyMeasurementError,
+    EnergySavingsError,
+    RefactoringError,
+    remove_readonly,
+)
+from ecooptimizer.config import CONFIG
+from ecooptimizer.data_types.refactored_data import CandidateResult, ChangedFile, RefactoredData
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.emissions import compare_energy, measure_interleaved, measure_samples
+from ecooptimizer.measurements.energy_meters import EnergyMeterName, using_energy_meter
+from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+from ecooptimizer.utils.workspace import Workspace
+
+T = TypeVar("T")
+
+# Serializes the measurements of every pipeline in the process
+MEASUREMENT_LOCK = threading.Lock()
+
+_worker_controller: RefactorerController | None = None
+
+
+class Candidate(NamedTuple):
+    """A smell refactored in its own workspace, awaiting measurement.
+
+    Attributes:
+        smell: Smell that was refactored
+        temp_dir: Directory holding the workspace, to be removed if the candidate is dropped
+        source_copy: Workspace holding the refactored project
+        target_file: Refactored copy of the smell's file
+        modified_files: Files of the workspace changed by the refactoring
+        error: Why the refactoring failed, if it did
+    """
+
+    smell: Smell
+    temp_dir: Path
+    source_copy: Path
+    target_file: Path
+    modified_files: list[Path]
+    error: Optional[str] = None
+
+
+def generate_candidate(
+    controller: RefactorerController, source_dir: Path, smell: Smell, temp_dir: Path
+) -> Candidate:
+    """Refactors a smell in a new workspace, recording failures instead of raising.
+
+    Args:
+        controller: Controller running the refactorer
+        source_dir: Project the smell was detected in; it is never modified
+        smell: Smell to refactor
+        temp_dir: Empty directory in which the workspace is created
+
+    Returns:
+        Candidate: The refactored workspace, or the error that prevented it
+    """
+    source_copy = temp_dir / source_dir.name
+    target_file = source_copy / Path(smell.path).relative_to(source_dir)
+    try:
+        Workspace.create(source_dir, source_copy)
+        modified_files = controller.run_refactorer(target_file, source_copy, smell)
+    except Exception as e:
+        return Candidate(smell, temp_dir, source_copy, target_file, [], str(e) or repr(e))
+    return Candidate(smell, temp_dir, source_copy, target_file, modified_files)
+
+
+def _generate_in_worker(source_dir: Path, smell: Smell, temp_dir: Path) -> Candidate:
+    """Worker process entry point generating one candidate."""
+    global _worker_controller
+    if _worker_controller is None:
+        _worker_controller = RefactorerController()
+    return generate_candidate(_worker_controller, source_dir, smell, temp_dir)
+
+
+def _remove_workspace(temp_dir: Path, _future: Future[Candidate]) -> None:
+    """Removes the workspace of a candidate that will never be evaluated."""
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class CandidatePipeline(Generic[T]):
+    """Generates refactoring candidates in parallel and measures them one at a time."""
+
+    def __init__(self, evaluate: Callable[[Candidate], T], jobs: Optional[int] = None):
+        """Initializes the pipeline.
+
+        Args:
+            evaluate: Measures a candidate and returns its result; only ever called
+                by one thread at a time
+            jobs: Number of worker processes generating candidates; defaults to the CPU
+                count, 1 generates them in-process
+        """
+        self.evaluate = evaluate
+        self.jobs = jobs
+
+    def _evaluate(self, candidate: Candidate) -> T:
+        with MEASUREMENT_LOCK:
+            return self.evaluate(candidate)
+
+    def run(self, source_dir: Path, smells: list[Smell]) -> Iterator[T]:
+        """Refactors every smell in its own workspace and yields their results.
+
+        If the results stop being consumed, the candidates left are cancelled or
+        finish in the background, and their workspaces are removed.
+
+        Args:
+            source_dir: Project the smells were detected in; it is never modified
+            smells: Smells to refactor independently of each other
+
+        Yields:
+            T: Result of every candidate, in the order candidates are generated
+        """
+        jobs = min(self.jobs or os.cpu_count() or 1, len(smells))
+        CONFIG["refactorLogger"].info(
+            f"🏭 Generating {len(smells)} candidates with {max(jobs, 1)} job(s)"
+        )
+
+        if jobs <= 1:
+            controller = RefactorerController()
+            for smell in smells:
+                temp_dir = Path(mkdtemp(prefix="ecooptimizer-"))
+                yield self._evaluate(generate_candidate(controller, source_dir, smell, temp_dir))
+            return
+
+        # Spawned workers avoid inheriting locks held by other threads of this process
+        executor = ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("spawn")
+        )
+        futures: dict[Future[Candidate], tuple[Smell, Path]] = {}
+        delivered: set[Future[Candidate]] = set()
+        try:
+            for smell in smells:
+                temp_dir = Path(mkdtemp(prefix="ecooptimizer-"))
+                future = executor.submit(_generate_in_worker, source_dir, smell, temp_dir)
+                futures[future] = (smell, temp_dir)
+
+            for future in as_completed(futures):
+                delivered.add(future)
+                try:
+                    candidate = future.result()
+                except Exception as e:
+                    # The worker died, e.g. killed for using too much memory
+                    smell, temp_dir = futures[future]
+                    candidate = Candidate(smell, temp_dir, temp_dir, temp_dir, [], repr(e))
+                yield self._evaluate(candidate)
+        finally:
+            # When the results stop being consumed, the workspaces of the candidates left
+            # are removed as soon as they are cancelled or done being generated
+            for future, (_, temp_dir) in futures.items():
+                if future not in delivered:
+                    future.add_done_callback(partial(_remove_workspace, temp_dir))
+            # Candidates being generated finish in the background, without blocking the caller
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CandidateEvaluator:
+    """Measures refactoring candidates against the original code of their files.
+
+    When measurements are repeated, every candidate is measured interleaved
+    with its original code; otherwise the original code of every file is
+    measured once, before its first candidate.
+    """
+
+    def __init__(self, source_dir: Path, energy_meter: Optional[EnergyMeterName] = None):
+        """Initializes the evaluator.
+
+        Args:
+            source_dir: Project the candidates were refactored from
+            energy_meter: Meter measuring the candidates, the configured one when None
+        """
+        self.source_dir = source_dir
+        self.energy_meter = energy_meter
+        self.baselines: dict[Path, list[float]] = {}
+
+    def __call__(self, candidate: Candidate) -> CandidateResult:
+        """Measures a candidate, removing its workspace unless it saves energy.
+
+        Args:
+            candidate: Candidate to measure
+
+        Returns:
+            CandidateResult: The refactoring's results, or why it was dropped
+        """
+        smell = candidate.smell
+        try:
+            if candidate.error is not None:
+                raise RefactoringError(candidate.error)
+            # Context variables do not survive across the yields of a streamed response
+            with using_energy_meter(self.energy_meter):
+                result = self._measure(candidate)
+        except Exception as e:
+            shutil.rmtree(candidate.temp_dir, onerror=remove_readonly)  # type: ignore
+            CONFIG["refactorLogger"].info(
+                f"⏭️ Dropping {smell.symbol} at line {smell.occurences[0].line}: {e}"
+            )
+            return CandidateResult(smell=smell, error=str(e))
+
+        CONFIG["refactorLogger"].info(
+            f"✅ {smell.symbol} at line {smell.occurences[0].line} saves {result.energySaved} kg CO2"
+        )
+        return CandidateResult(smell=smell, result=result)
+
+    def _measure(self, candidate: Candidate) -> RefactoredData:
+        target_file = Path(candidate.smell.path)
+        if CONFIG["measurementRepetitions"] > 1:
+            initial_samples, final_samples = measure_interleaved(
+                target_file, candidate.target_file, self.source_dir, candidate.source_copy
+            )
+        else:
+            if target_file not in self.baselines:
+                self.baselines[target_file] = measure_samples(target_file, self.source_dir)
+            initial_samples = self.baselines[target_file]
+            final_samples = measure_samples(candidate.target_file, candidate.source_copy)
+        if not initial_samples or not final_samples:
+            raise EnergyMeasurementError(str(target_file))
+
+        savings = compare_energy(initial_samples, final_samples)
+        if CONFIG["mode"] == "production" and not savings.significant:
+            raise EnergySavingsError()
+
+        source_copy = candidate.source_copy.resolve()
+        return RefactoredData(
+            tempDir=str(candidate.temp_dir),
+            targetFile=ChangedFile(
+                original=str(target_file.resolve()),
+                refactored=str(candidate.target_file.resolve()),
+            ),
+            energySaved=savings.median,
+            energySavings=savings,
+            affectedFiles=[
+                ChangedFile(
+                    original=str(self.source_dir.resolve() / file.relative_to(source_copy)),
+                    refactored=str(file),
+                )
+                for file in map(Path.resolve, candidate.modified_files)
+                if file.is_relative_to(source_copy)
+            ],
+            initialSamples=initial_samples,
+            finalSamples=final_samples,
+        )
@@ -4,6 +4,7 @@ from libcst.metadata import PositionProvider
 
 from ecooptimizer.refactorers.base_refactorer import BaseRefactorer
 from ecooptimizer.data_types.smell import UGESmell
+from ecooptimizer.utils.parsed_module import get_parsed_module
 
 
 class ListCompInAnyAllTransformer(cst.CSTTransformer):
@@ -71,11 +72,10 @@ class UseAGeneratorRefactorer(BaseRefactorer[UGESmell]):
         start_column = smell.occurences[0].column
         end_column = smell.occurences[0].endColumn
 
-        # Read the source file
-        source_code = target_file.read_text()
-
-        # Parse with LibCST
-        wrapper = cst.MetadataWrapper(cst.parse_module(source_code))
+        # Parse with LibCST (freshly parsed trees are safe to wrap without copying)
+        wrapper = cst.MetadataWrapper(
+            get_parsed_module(target_file).cst_module, unsafe_skip_copy=True
+        )
 
         # Apply transformation
         transformer = ListCompInAnyAllTransformer(line_number, start_column, end_column)  # type: ignore
@@ -83,6 +83,7 @@ class UseAGeneratorRefactorer(BaseRefactorer[UGESmell]):
 
         if transformer.found:
             if overwrite:
+                self._prepare_write(target_file)
                 target_file.write_text(modified_tree.code)
             else:
                 output_file.write_text(modified_tree.code)
@@ -6,6 +6,7 @@ from typing import Any, Optional
 
 from ecooptimizer.refactorers.multi_file_refactorer import MultiFileRefactorer
 from ecooptimizer.data_types.smell import LECSmell
+from ecooptimizer.utils.parsed_module import get_parsed_module
 
 
 class DictAccess:
@@ -56,16 +57,19 @@ class LongElementChainRefactorer(MultiFileRefactorer[LECSmell]):
         self.target_file = target_file
         line_number = smell.occurences[0].line
 
-        tree = ast.parse(target_file.read_text())
+        tree = get_parsed_module(target_file).ast_tree
         self._find_dict_names(tree, line_number)
 
+        # Only files naming the dictionary can access or assign it
+        names = {name.split(".")[-1] for name in self.dict_name}
+
         # Abort if dictionary access is too shallow
-        self.traverse_and_process(source_dir)
+        self.traverse_and_process(source_dir, names)
         if self.min_value <= 1:
             return
 
         self.initial_parsing = False
-        self.traverse_and_process(source_dir)
+        self.traverse_and_process(source_dir, names)
 
     def _find_dict_names(self, tree: ast.AST, line_number: int) -> None:
         """Extract dictionary names from the AST at the given line number."""
@@ -95,7 +99,7 @@ class LongElementChainRefactorer(MultiFileRefactorer[LECSmell]):
         return None
 
     def _process_file(self, file: Path):
-        tree = ast.parse(file.read_text())
+        tree = get_parsed_module(file).ast_tree
         if self.initial_parsing:
             self._find_access_pattern_in_file(tree, file)
         else:
@@ -253,6 +257,7 @@ class LongElementChainRefactorer(MultiFileRefactorer[LECSmell]):
         refactored_lines = self._update_dict_assignment(refactored_lines)
 
         # Write changes back to file
+        self._prepare_write(file_path)
         file_path.write_text("\n".join(refactored_lines))  # type: ignore
 
         return True
@@ -142,6 +142,7 @@ class LongLambdaFunctionRefactorer(BaseRefactorer[LLESmell]):
         # Write changes
         new_content = "".join(lines)
         if overwrite:
+            self._prepare_write(target_file)
             target_file.write_text(new_content, encoding="utf-8")
         else:
             output_file.write_text(new_content, encoding="utf-8")
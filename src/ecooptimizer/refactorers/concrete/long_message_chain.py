@@ -129,6 +129,7 @@ class LongMessageChainRefactorer(BaseRefactorer[LMCSmell]):
 
         # Write to appropriate file based on overwrite flag
         if overwrite:
+            self._prepare_write(target_file)
             target_file.write_text(new_content, encoding="utf-8")
         else:
             output_file.write_text(new_content, encoding="utf-8")
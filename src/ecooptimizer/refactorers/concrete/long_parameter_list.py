@@ -7,6 +7,7 @@ from collections.abc import Mapping
 
 from ecooptimizer.refactorers.multi_file_refactorer import MultiFileRefactorer
 from ecooptimizer.data_types.smell import LPLSmell
+from ecooptimizer.utils.parsed_module import get_parsed_module
 
 
 class FunctionCallVisitor(cst.CSTVisitor):
@@ -726,11 +727,8 @@ class LongParameterListRefactorer(MultiFileRefactorer[LPLSmell]):
         max_param_limit = 6
         self.target_file = target_file
 
-        with target_file.open() as f:
-            source_code = f.read()
-
-        tree = cst.parse_module(source_code)
-        wrapper = MetadataWrapper(tree)
+        tree = get_parsed_module(target_file).cst_module
+        wrapper = MetadataWrapper(tree, unsafe_skip_copy=True)
         position_metadata = wrapper.resolve(PositionProvider)
         parent_metadata = wrapper.resolve(ParentNodeProvider)
         target_line = smell.occurences[0].line
@@ -841,10 +839,17 @@ class LongParameterListRefactorer(MultiFileRefactorer[LPLSmell]):
             temp_file.write(modified_source)
 
         if overwrite:
+            self._prepare_write(target_file)
             with target_file.open("w") as f:
                 f.write(modified_source)
 
-        self.traverse_and_process(source_dir)
+        # Only files that call the function, or instantiate its class, need their calls updated
+        names = []
+        if self.function_node:
+            names.append(self.function_node.name.value)
+            if self.is_constructor and self.enclosing_class_name:
+                names.append(self.enclosing_class_name)
+        self.traverse_and_process(source_dir, names)
 
     def _generate_unique_param_class_names(self, target_line: int) -> tuple[str, str]:
         """
@@ -860,7 +865,7 @@ class LongParameterListRefactorer(MultiFileRefactorer[LPLSmell]):
         if file.samefile(self.target_file):
             return False
 
-        tree = cst.parse_module(file.read_text())
+        tree = get_parsed_module(file).cst_module
 
         visitor = FunctionCallVisitor(
             self.function_node.name.value,  # type: ignore
@@ -886,6 +891,7 @@ class LongParameterListRefactorer(MultiFileRefactorer[LPLSmell]):
         )
 
         modified_source = tree.code
+        self._prepare_write(file)
         with file.open("w") as f:
             f.write(modified_source)
 
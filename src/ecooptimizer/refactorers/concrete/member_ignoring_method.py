@@ -1,5 +1,4 @@
-import astroid
-from astroid import nodes, util
+from astroid import InferenceError, nodes, util
 import libcst as cst
 from libcst.metadata import PositionProvider, MetadataWrapper
 
@@ -7,11 +6,20 @@ from pathlib import Path
 
 from ecooptimizer.config import CONFIG
 
-from ecooptimizer.refactorers.multi_file_refactorer import MultiFileRefactorer
+from ecooptimizer.refactorers.multi_file_refactorer import (
+    MultiFileRefactorer,
+    collect_python_files,
+)
 from ecooptimizer.data_types.smell import MIMSmell
+from ecooptimizer.utils.class_hierarchy import get_class_hierarchy_index
+from ecooptimizer.utils.parsed_module import get_parsed_module
+from ecooptimizer.utils.project_index import get_project_index
+from ecooptimizer.utils.tracing import get_tracer
 
 logger = CONFIG["refactorLogger"]
 
+TRACE_CATEGORY = "no-self-use"
+
 
 class CallTransformer(cst.CSTTransformer):
     METADATA_DEPENDENCIES = (PositionProvider,)
@@ -20,6 +28,7 @@ class CallTransformer(cst.CSTTransformer):
         self.method_calls: list[tuple[str, int, str, str]] = None  # type: ignore
         self.class_name = class_name  # Class nme to replace instance calls
         self.transformed = False
+        self.trace = get_tracer(TRACE_CATEGORY, logger)
 
     def set_calls(self, valid_calls: list[tuple[str, int, str, str]]):
         self.method_calls = valid_calls
@@ -36,13 +45,14 @@ class CallTransformer(cst.CSTTransformer):
 
             # Check if this call matches one from astroid (by caller, method name, and line number)
             for call_caller, line, call_method, cls in self.method_calls:
-                logger.debug(f"cst caller: {call_caller} at line {position.start.line}")
+                if self.trace:
+                    self.trace(f"cst caller: {call_caller} at line {position.start.line}")
                 if (
                     method == call_method
                     and position.start.line == line
                     and caller.deep_equals(cst.parse_expression(call_caller))
                 ):
-                    logger.debug("transforming")
+                    self.trace("transforming")
                     # Transform `obj.method(args)` -> `ClassName.method(args)`
                     new_func = cst.Attribute(
                         value=cst.Name(cls),  # Replace `obj` with class name
@@ -64,13 +74,15 @@ def find_valid_method_calls(
         A list of (caller_name, line_number, method_name).
     """
     valid_calls = []
+    trace = get_tracer(TRACE_CATEGORY, logger)
 
-    logger.debug("Finding valid method calls")
+    trace("Finding valid method calls")
 
     for node in tree.body:
         for descendant in node.nodes_of_class(nodes.Call):
             if isinstance(descendant.func, nodes.Attribute):
-                logger.debug(f"caller: {descendant.func.expr.as_string()}")
+                if trace:
+                    trace(f"caller: {descendant.func.expr.as_string()}")
                 caller = descendant.func.expr  # The object calling the method
                 method_name = descendant.func.attrname
 
@@ -82,7 +94,8 @@ def find_valid_method_calls(
                     inferrences = caller.infer()
 
                     for inferred in inferrences:
-                        logger.debug(f"inferred: {inferred.repr_name()}")
+                        if trace:
+                            trace(f"inferred: {inferred.repr_name()}")
                         if isinstance(inferred, util.UninferableBase):
                             hint = check_for_annotations(caller, descendant.scope())
                             inits = check_for_initializations(caller, descendant.scope())
@@ -94,18 +107,20 @@ def find_valid_method_calls(
                                 continue
                         else:
                             inferred_types.append(inferred.repr_name())
-                except astroid.InferenceError as e:
+                except InferenceError as e:
                     print(e)
                     continue
 
-                logger.debug(f"Inferred types: {inferred_types}")
+                if trace:
+                    trace(f"Inferred types: {inferred_types}")
 
                 # Check if any inferred type matches a valid class
                 for cls in inferred_types:
                     if cls in valid_classes:
-                        logger.debug(
-                            f"Foud valid call: {caller.as_string()} at line {descendant.lineno}"
-                        )
+                        if trace:
+                            trace(
+                                f"Foud valid call: {caller.as_string()} at line {descendant.lineno}"
+                            )
                         valid_calls.append(
                             (caller.as_string(), descendant.lineno, method_name, cls)
                         )
@@ -131,7 +146,8 @@ def check_for_annotations(caller: nodes.NodeNG, scope: nodes.NodeNG):
         return None
 
     hint = None
-    logger.debug(f"annotations: {scope.args}")
+    trace = get_tracer(TRACE_CATEGORY, logger)
+    trace(lambda: f"annotations: {scope.args}")
 
     args = scope.args.args
     anns = scope.args.annotations
@@ -153,7 +169,9 @@ class MakeStaticRefactorer(MultiFileRefactorer[MIMSmell], cst.CSTTransformer):
         self.mim_method_class = ""
         self.mim_method = ""
         self.valid_classes: set[str] = set()
+        self.source_dir: Path = None  # type: ignore
         self.transformer: CallTransformer = None  # type: ignore
+        self.trace = get_tracer(TRACE_CATEGORY, logger)
 
     def refactor(
         self,
@@ -165,6 +183,7 @@ class MakeStaticRefactorer(MultiFileRefactorer[MIMSmell], cst.CSTTransformer):
     ):
         self.target_line = smell.occurences[0].line
         self.target_file = target_file
+        self.source_dir = source_dir
 
         print("smell:", smell)
 
@@ -174,52 +193,51 @@ class MakeStaticRefactorer(MultiFileRefactorer[MIMSmell], cst.CSTTransformer):
         self.mim_method_class, self.mim_method = smell.obj.split(".")
         self.valid_classes.add(self.mim_method_class)
 
-        source_code = target_file.read_text()
-        tree = MetadataWrapper(cst.parse_module(source_code))
+        tree = MetadataWrapper(get_parsed_module(target_file).cst_module, unsafe_skip_copy=True)
 
         # Find all subclasses of the target class
         self._find_subclasses(source_dir)
 
         modified_tree = tree.visit(self)
+        self._prepare_write(target_file)
         target_file.write_text(modified_tree.code)
 
         self.transformer = CallTransformer(self.mim_method_class)
 
-        self.traverse_and_process(source_dir)
+        self.traverse_and_process(source_dir, [self.mim_method])
         if not overwrite:
             output_file.write_text(target_file.read_text())
 
     def _find_subclasses(self, directory: Path):
-        """Find all subclasses of the target class within the file."""
-
-        def get_subclasses(tree: nodes.Module):
-            subclasses: set[str] = set()
-            for klass in tree.nodes_of_class(nodes.ClassDef):
-                if any(base == self.mim_method_class for base in klass.basenames):
-                    if not any(method.name == self.mim_method for method in klass.mymethods()):
-                        subclasses.add(klass.name)
-            return subclasses
-
-        logger.debug("find all subclasses")
-        self.traverse(directory)
-        for file in self.py_files:
-            tree = astroid.parse(file.read_text())
-            self.valid_classes = self.valid_classes.union(get_subclasses(tree))
-        logger.debug(f"valid classes: {self.valid_classes}")
+        """Find the subclasses of the target class that inherit the method unchanged."""
+        self.trace("find all subclasses")
+        hierarchy = get_class_hierarchy_index().hierarchy(
+            directory, collect_python_files(directory, self.ignore_patterns)
+        )
+        for klass in hierarchy.subclasses(self.mim_method_class):
+            if self.mim_method not in klass.methods:
+                self.valid_classes.add(klass.name)
+        self.trace(lambda: f"valid classes: {self.valid_classes}")
 
     def _process_file(self, file: Path):
         processed = False
 
-        source_code = file.read_text("utf-8")
+        # Files that only mention the method, without calling it, have nothing to transform
+        if self.mim_method not in get_project_index(self.source_dir).symbols(file).calls:
+            return False
+
+        parsed_module = get_parsed_module(file)
 
-        astroid_tree = astroid.parse(source_code)
-        valid_calls = find_valid_method_calls(astroid_tree, self.mim_method, self.valid_classes)
+        valid_calls = find_valid_method_calls(
+            parsed_module.astroid_module, self.mim_method, self.valid_classes
+        )
         self.transformer.set_calls(valid_calls)
 
-        tree = MetadataWrapper(cst.parse_module(source_code))
+        tree = MetadataWrapper(parsed_module.cst_module, unsafe_skip_copy=True)
         modified_tree = tree.visit(self.transformer)
 
         if self.transformer.transformed:
+            self._prepare_write(file)
             file.write_text(modified_tree.code)
             if not file.samefile(self.target_file):
                 processed = True
@@ -234,7 +252,7 @@ class MakeStaticRefactorer(MultiFileRefactorer[MIMSmell], cst.CSTTransformer):
         if func_name and updated_node.deep_equals(original_node):
             position = self.get_metadata(PositionProvider, original_node).start  # type: ignore
             if position.line == self.target_line and func_name == self.mim_method:
-                logger.debug("Modifying MIM method")
+                self.trace("Modifying MIM method")
                 decorators = [
                     *list(original_node.decorators),
                     cst.Decorator(cst.Name("staticmethod")),
@@ -4,6 +4,7 @@ from pathlib import Path
 
 from ecooptimizer.data_types.smell import CRCSmell
 from ecooptimizer.refactorers.base_refactorer import BaseRefactorer
+from ecooptimizer.utils.parsed_module import get_parsed_module
 
 
 def extract_function_name(call_string: str):
@@ -43,11 +44,11 @@ class CacheRepeatedCallsRefactorer(BaseRefactorer[CRCSmell]):
         # Correctly generate cached variable name
         self.cached_var_name = "cached_" + extract_function_name(self.call_string)
 
-        with self.target_file.open("r") as file:
-            lines = file.readlines()
+        parsed_module = get_parsed_module(self.target_file)
+        lines = list(parsed_module.lines)
 
         # Parse the AST
-        tree = ast.parse("".join(lines))
+        tree = parsed_module.ast_tree
 
         # Find the valid parent node
         parent_node = self._find_valid_parent(tree)
@@ -78,6 +79,7 @@ class CacheRepeatedCallsRefactorer(BaseRefactorer[CRCSmell]):
 
         # Multi-file implementation
         if overwrite:
+            self._prepare_write(target_file)
             with target_file.open("w") as f:
                 f.writelines(lines)
         else:
@@ -6,6 +6,7 @@ from astroid import nodes
 
 from ecooptimizer.refactorers.base_refactorer import BaseRefactorer
 from ecooptimizer.data_types.smell import SCLSmell
+from ecooptimizer.utils.parsed_module import get_parsed_module
 
 
 class UseListAccumulationRefactorer(BaseRefactorer[SCLSmell]):
@@ -51,8 +52,9 @@ class UseListAccumulationRefactorer(BaseRefactorer[SCLSmell]):
         self.outer_loop_line = smell.additionalInfo.innerLoopLine
 
         # Parse the code into an AST
-        source_code = target_file.read_text()
-        tree = astroid.parse(source_code)
+        parsed_module = get_parsed_module(target_file)
+        source_code = parsed_module.source
+        tree = parsed_module.astroid_module
         for node in tree.get_children():
             self.visit(node)
 
@@ -76,6 +78,7 @@ class UseListAccumulationRefactorer(BaseRefactorer[SCLSmell]):
         modified_code = self.add_node_to_body(source_code, combined_nodes)
 
         if overwrite:
+            self._prepare_write(target_file)
             target_file.write_text(modified_code)
         else:
             output_file.write_text(modified_code)
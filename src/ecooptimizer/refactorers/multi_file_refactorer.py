@@ -2,13 +2,15 @@
 
 # pyright: reportOptionalMemberAccess=false
 from abc import abstractmethod
+from collections.abc import Iterable
 import fnmatch
 from pathlib import Path
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 from ecooptimizer.config import CONFIG
 from ecooptimizer.refactorers.base_refactorer import BaseRefactorer
 from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.utils.project_index import get_project_index, invalidate_file
 
 T = TypeVar("T", bound=Smell)
 
@@ -27,6 +29,66 @@ DEFAULT_IGNORED_PATTERNS = {
 DEFAULT_IGNORE_PATH = Path(__file__).parent / "patterns_to_ignore"
 
 
+def load_ignore_patterns(ignore_dir: Path = DEFAULT_IGNORE_PATH) -> set[str]:
+    """Loads the default ignore patterns along with those from configuration files.
+
+    Args:
+        ignore_dir: Directory containing ignore pattern files
+
+    Returns:
+        Combined set of default and custom ignore patterns
+    """
+    patterns = set(DEFAULT_IGNORED_PATTERNS)
+    if not ignore_dir.is_dir():
+        return patterns
+
+    for file in ignore_dir.iterdir():
+        with file.open() as f:
+            patterns.update(
+                [line.strip() for line in f if line.strip() and not line.startswith("#")]
+            )
+
+    return patterns
+
+
+def is_ignored(item: Path, ignore_patterns: set[str]) -> bool:
+    """Checks if a path matches any of the given ignore patterns.
+
+    Args:
+        item: File or directory path to check
+        ignore_patterns: Glob patterns matched against the path's name
+
+    Returns:
+        True if the path matches any ignore pattern, False otherwise
+    """
+    return any(fnmatch.fnmatch(item.name, pattern) for pattern in ignore_patterns)
+
+
+def collect_python_files(directory: Path, ignore_patterns: set[str]) -> list[Path]:
+    """Recursively collects Python files in a directory, skipping ignored directories.
+
+    Args:
+        directory: Root directory to scan
+        ignore_patterns: Glob patterns for directory names to skip
+
+    Returns:
+        list[Path]: Python files in traversal order
+    """
+    py_files: list[Path] = []
+    for item in directory.iterdir():
+        if item.is_dir():
+            CONFIG["refactorLogger"].debug(f"Scanning directory: {item!s}")
+            if is_ignored(item, ignore_patterns):
+                CONFIG["refactorLogger"].debug(f"Ignored directory: {item!s}")
+                continue
+
+            py_files.extend(collect_python_files(item, ignore_patterns))
+        elif item.is_file() and item.suffix == ".py":
+            py_files.append(item)
+
+    return py_files
+
+
 class MultiFileRefactorer(BaseRefactorer[T]):
     """Abstract base class for refactorers that need to process multiple files."""
 
@@ -46,17 +108,7 @@ class MultiFileRefactorer(BaseRefactorer[T]):
         Returns:
             Combined set of default and custom ignore patterns
         """
-        if not ignore_dir.is_dir():
-            return DEFAULT_IGNORED_PATTERNS
-
-        patterns = DEFAULT_IGNORED_PATTERNS
-        for file in ignore_dir.iterdir():
-            with file.open() as f:
-                patterns.update(
-                    [line.strip() for line in f if line.strip() and not line.startswith("#")]
-                )
-
-        return patterns
+        return load_ignore_patterns(ignore_dir)
 
     def is_ignored(self, item: Path) -> bool:
         """Checks if a path should be ignored during refactoring.
@@ -67,7 +119,27 @@ class MultiFileRefactorer(BaseRefactorer[T]):
         Returns:
             True if the path matches any ignore pattern, False otherwise
         """
-        return any(fnmatch.fnmatch(item.name, pattern) for pattern in self.ignore_patterns)
+        return is_ignored(item, self.ignore_patterns)
+
+    def _prepare_write(self, file: Path) -> None:
+        """Drops a file from the project indexes before it is written."""
+        invalidate_file(file)
+
+    def find_referencing_files(self, directory: Path, names: Iterable[str]) -> list[Path]:
+        """Lists the Python files of a directory that may refer to any of the given names.
+
+        Files are looked up in the directory's shared project index, so only
+        files that changed since they were last indexed are parsed.
+
+        Args:
+            directory: Root directory to scan
+            names: Identifiers to look for, without any dotted prefix
+
+        Returns:
+            list[Path]: Files mentioning a name, in traversal order
+        """
+        files = collect_python_files(directory, self.ignore_patterns)
+        return get_project_index(directory).files_referencing(names, files)
 
     def traverse(self, directory: Path) -> None:
         """Recursively scans a directory for Python files, skipping ignored paths.
@@ -75,26 +147,24 @@ class MultiFileRefactorer(BaseRefactorer[T]):
         Args:
             directory: Root directory to scan
         """
-        for item in directory.iterdir():
-            if item.is_dir():
-                CONFIG["refactorLogger"].debug(f"Scanning directory: {item!s}")
-                if self.is_ignored(item):
-                    CONFIG["refactorLogger"].debug(f"Ignored directory: {item!s}")
-                    continue
-
-                self.traverse(item)
-            elif item.is_file() and item.suffix == ".py":
-                self.py_files.append(item)
+        self.py_files.extend(collect_python_files(directory, self.ignore_patterns))
 
-    def traverse_and_process(self, directory: Path) -> None:
-        """Processes all Python files in a directory.
+    def traverse_and_process(self, directory: Path, names: Optional[Iterable[str]] = None) -> None:
+        """Processes the Python files in a directory.
 
         Args:
             directory: Root directory containing files to process
+            names: Identifiers the refactoring changes; when given, only the files that
+                may refer to one of them are processed
         """
-        if not self.py_files:
-            self.traverse(directory)
-        for file in self.py_files:
+        if names is not None:
+            files = self.find_referencing_files(directory, names)
+            CONFIG["refactorLogger"].debug(f"Processing {len(files)} files referencing {names}")
+        else:
+            if not self.py_files:
+                self.traverse(directory)
+            files = self.py_files
+        for file in files:
             CONFIG["refactorLogger"].debug(f"Processing file: {file!s}")
             if self._process_file(file):
                 if file not in self.modified_files and not file.samefile(self.target_file):
@@ -16,7 +16,11 @@ class RefactorerController:
         self.smell_counters = {}
 
     def run_refactorer(
-        self, target_file: Path, source_dir: Path, smell: Smell, overwrite: bool = True
+        self,
+        target_file: Path,
+        source_dir: Path,
+        smell: Smell,
+        overwrite: bool = True,
     ) -> list[Path]:
         """Executes the appropriate refactorer for a detected smell.
 
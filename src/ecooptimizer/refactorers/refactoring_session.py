@@ -0,0 +1,328 @@
+"""Application of many smells of one file in a single workspace, batch by batch."""
+
+from collections.abc import Sequence
+from pathlib import Path
+import shutil
+from tempfile import mkdtemp
+import traceback
+from typing import NamedTuple, Optional
+
+from ecooptimizer.api.error_handler import (
+    EnergyMeasurementError,
+    EnergySavingsError,
+    RefactoringError,
+    remove_readonly,
+)
+from ecooptimizer.config import CONFIG
+from ecooptimizer.data_types.refactored_data import ChangedFile, RefactoredSessionData
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.emissions import compare_energy, measure_interleaved, measure_samples
+from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+from ecooptimizer.utils.edit_ranges import EditRange, compute_edit_ranges, shift_line
+from ecooptimizer.utils.project_index import invalidate_file
+from ecooptimizer.utils.workspace import Workspace
+
+
+class AppliedSmells(NamedTuple):
+    """Outcome of applying smells in a workspace.
+
+    Attributes:
+        workspace: Workspace holding the refactored project
+        target_file: Refactored copy of the file the smells were detected in
+        applied: Smells that changed the code, as given
+        conflicts: Smells whose lines were changed by an earlier smell's refactoring
+        failed: Smells whose refactorer raised or changed nothing
+        modified_files: Files of the workspace changed by the applied smells
+        edits: Line ranges of the target file changed by every applied smell, in order
+    """
+
+    workspace: Workspace
+    target_file: Path
+    applied: list[Smell]
+    conflicts: list[Smell]
+    failed: list[Smell]
+    modified_files: list[Path]
+    edits: list[list[EditRange]]
+
+
+def _overlaps(edit: EditRange, start: int, end: int) -> bool:
+    """Whether an edit replaced, or inserted lines inside, the lines start to end."""
+    if edit.old_start == edit.old_end:
+        return start < edit.old_start <= end
+    return edit.old_start <= end and start < edit.old_end
+
+
+def relocate_smell(smell: Smell, edits: Sequence[list[EditRange]]) -> Optional[Smell]:
+    """Moves a smell's lines through successive edits of its file.
+
+    Args:
+        smell: Smell detected before any of the edits
+        edits: Line ranges changed by every edit, in the order they were made
+
+    Returns:
+        Optional[Smell]: Copy of the smell with its lines shifted, or None if an edit
+            changed one of its occurrences
+    """
+    relocated = smell.model_copy(deep=True)
+    for edit_ranges in edits:
+        for occurrence in relocated.occurences:
+            end = occurrence.endLine or occurrence.line
+            if any(_overlaps(edit, occurrence.line, end) for edit in edit_ranges):
+                return None
+            line = shift_line(occurrence.line, edit_ranges)
+            end_line = shift_line(occurrence.endLine, edit_ranges) if occurrence.endLine else None
+            if line is None or (occurrence.endLine and end_line is None):
+                return None
+            occurrence.line, occurrence.endLine = line, end_line
+
+        info = relocated.additionalInfo
+        if info is not None and info.innerLoopLine is not None:
+            inner_loop_line = shift_line(info.innerLoopLine, edit_ranges)
+            if inner_loop_line is None:
+                return None
+            info.innerLoopLine = inner_loop_line
+    return relocated
+
+
+def apply_smells(
+    controller: RefactorerController,
+    source_dir: Path,
+    target_file: Path,
+    smells: Sequence[Smell],
+    workspace: Workspace,
+    edits: Sequence[list[EditRange]] = (),
+) -> AppliedSmells:
+    """Refactors smells of one file one after the other, in a workspace.
+
+    Smells are applied in order. Each is first relocated through the edits made
+    to the workspace before, and by the smells applied before it, and skipped if
+    they changed its lines. A smell whose refactorer fails is skipped, with the
+    target file restored.
+
+    Args:
+        controller: Controller running the refactorers
+        source_dir: Project the smells were detected in; it is never modified
+        target_file: File of the project the smells were detected in
+        smells: Smells to apply, all detected in `target_file`
+        workspace: Workspace of the project in which the smells are applied
+        edits: Line ranges of the target file already changed in the workspace
+
+    Returns:
+        AppliedSmells: The outcome of every smell
+    """
+    logger = CONFIG["refactorLogger"]
+    target_copy = workspace.root / target_file.relative_to(source_dir)
+
+    edits = list(edits)
+    new_edits: list[list[EditRange]] = []
+    applied: list[Smell] = []
+    conflicts: list[Smell] = []
+    failed: list[Smell] = []
+    modified_files: dict[Path, None] = {}
+
+    for smell in smells:
+        relocated = relocate_smell(smell, edits + new_edits)
+        if relocated is None:
+            logger.info(f"⏭️ Skipping {smell.symbol} at line {smell.occurences[0].line}: conflict")
+            conflicts.append(smell)
+            continue
+
+        source = target_copy.read_text()
+        try:
+            modified = controller.run_refactorer(target_copy, workspace.root, relocated)
+        except Exception:
+            traceback.print_exc()
+            modified = None
+
+        refactored = target_copy.read_text()
+        if modified is None or (not modified and refactored == source):
+            logger.info(f"⏭️ Skipping {smell.symbol} at line {smell.occurences[0].line}: failed")
+            if refactored != source:
+                target_copy.write_text(source)
+            failed.append(smell)
+            continue
+
+        new_edits.append(compute_edit_ranges(source, refactored))
+        applied.append(smell)
+        modified_files.update(dict.fromkeys(file.resolve() for file in modified))
+        if refactored != source:
+            modified_files[target_copy.resolve()] = None
+
+    return AppliedSmells(
+        workspace, target_copy, applied, conflicts, failed, list(modified_files), new_edits
+    )
+
+
+class RefactoringSession:
+    """Accepts smells of a file batch by batch, each batch measured once.
+
+    Every batch is applied in the session's workspace, on top of the smells
+    accepted so far, and compared with the emissions of the last accepted
+    state. A rejected batch is reverted in place: the files it changed are
+    restored from the contents saved when their last changes were accepted,
+    or else from the original project.
+    """
+
+    def __init__(
+        self,
+        controller: RefactorerController,
+        source_dir: Path,
+        target_file: Path,
+        initial_samples: list[float],
+        bisect: bool,
+    ):
+        """Starts a session from the original code.
+
+        Args:
+            controller: Controller running the refactorers
+            source_dir: Project to refactor; it is never modified
+            target_file: File of the project the smells were detected in
+            initial_samples: Emissions of the original code
+            bisect: Whether to split batches that save no energy
+        """
+        self.controller = controller
+        self.source_dir = source_dir
+        self.target_file = target_file
+        self.initial_samples = initial_samples
+        self.bisect = bisect
+        self.accepted: list[Smell] = []
+        self.rejected: list[Smell] = []
+        self.skipped: list[Smell] = []
+        self.measurements = 0
+        self.workspace: Optional[Workspace] = None
+        self.current_samples = initial_samples
+        # Edits of the target file and contents of the files changed by the accepted smells
+        self.accepted_edits: list[list[EditRange]] = []
+        self.accepted_files: dict[Path, bytes] = {}
+
+    def settle(self, smells: list[Smell]) -> None:
+        """Applies a batch on top of the accepted smells and accepts or splits it.
+
+        Args:
+            smells: Smells to try, none of them accepted or rejected yet
+        """
+        workspace = self._open_workspace()
+        batch = apply_smells(
+            self.controller,
+            self.source_dir,
+            self.target_file,
+            smells,
+            workspace,
+            self.accepted_edits,
+        )
+
+        candidates = batch.applied
+        self.skipped.extend(smell for smell in smells if smell not in candidates)
+        if not candidates:
+            return
+
+        self.measurements += 1
+        final_samples = measure_samples(batch.target_file, workspace.root)
+        saved = bool(final_samples) and (
+            CONFIG["mode"] != "production"
+            or compare_energy(self.current_samples, final_samples).significant
+        )
+        CONFIG["refactorLogger"].info(
+            f"📊 Batch of {len(candidates)} smells "
+            f"{'saves energy' if saved else 'does not save energy'}."
+        )
+
+        if saved:
+            self.accepted.extend(candidates)
+            self.accepted_edits.extend(batch.edits)
+            self.accepted_files.update(
+                (file, file.read_bytes()) for file in batch.modified_files if file.is_file()
+            )
+            self.current_samples = final_samples
+            return
+
+        self._revert(batch)
+        if not self.bisect or len(candidates) == 1:
+            self.rejected.extend(candidates)
+            return
+
+        middle = len(candidates) // 2
+        self.settle(candidates[:middle])
+        self.settle(candidates[middle:])
+
+    def _open_workspace(self) -> Workspace:
+        """Returns the session's workspace, creating it on first use."""
+        if self.workspace is None:
+            temp_dir = Path(mkdtemp(prefix="ecooptimizer-"))
+            try:
+                self.workspace = Workspace.create(self.source_dir, temp_dir / self.source_dir.name)
+            except OSError as e:
+                shutil.rmtree(temp_dir, onerror=remove_readonly)  # type: ignore
+                raise RefactoringError(str(e)) from e
+        return self.workspace
+
+    def _revert(self, batch: AppliedSmells) -> None:
+        """Restores the files changed by a rejected batch to their last accepted state."""
+        root = batch.workspace.root.resolve()
+        for file in batch.modified_files:
+            if not file.is_relative_to(root):
+                continue
+            invalidate_file(file)
+            original = self.source_dir / file.relative_to(root)
+            if file in self.accepted_files:
+                file.write_bytes(self.accepted_files[file])
+            elif original.is_file():
+                shutil.copy2(original, file)
+            else:
+                file.unlink(missing_ok=True)
+
+    def result(self) -> RefactoredSessionData:
+        """Summarizes the session, measuring the final code against the original.
+
+        Returns:
+            RefactoredSessionData: Results of the accepted smells
+
+        Raises:
+            EnergySavingsError: If no smell was accepted
+            EnergyMeasurementError: If the final comparison cannot be measured
+        """
+        if self.workspace is None or not self.accepted:
+            if self.workspace is not None:
+                shutil.rmtree(self.workspace.root.parent, onerror=remove_readonly)  # type: ignore
+            raise EnergySavingsError()
+
+        source_copy = self.workspace.root
+        target_copy = source_copy / self.target_file.relative_to(self.source_dir)
+        initial_samples, final_samples = self.initial_samples, self.current_samples
+        if self.measurements > 1 and CONFIG["measurementRepetitions"] > 1:
+            # Batches are measured one after the other, so the overall savings are
+            # measured again with the original and final code interleaved
+            initial_samples, final_samples = measure_interleaved(
+                self.target_file, target_copy, self.source_dir, source_copy
+            )
+            if not initial_samples or not final_samples:
+                raise EnergyMeasurementError(str(self.target_file))
+
+        savings = compare_energy(initial_samples, final_samples)
+        CONFIG["refactorLogger"].info(
+            f"✅ Accepted {len(self.accepted)} smells in {self.measurements} measurements, "
+            f"saving {savings.median} kg CO2"
+        )
+        return RefactoredSessionData(
+            tempDir=str(source_copy.parent),
+            targetFile=ChangedFile(
+                original=str(self.target_file.resolve()),
+                refactored=str(target_copy.resolve()),
+            ),
+            energySaved=savings.median,
+            energySavings=savings,
+            affectedFiles=[
+                ChangedFile(
+                    original=str(
+                        self.source_dir.resolve() / file.relative_to(source_copy.resolve())
+                    ),
+                    refactored=str(file),
+                )
+                for file in self.accepted_files
+                if file.is_relative_to(source_copy.resolve())
+            ],
+            accepted=self.accepted,
+            rejected=self.rejected,
+            skipped=self.skipped,
+            measurements=self.measurements,
+        )
@@ -0,0 +1,273 @@
+"""Persistent index of the classes of a project: their bases, methods and locations."""
+
+import ast
+from collections.abc import Iterable
+from contextlib import closing
+import json
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.utils.parsed_module import hash_source
+
+# File name of the index database inside the log directory
+INDEX_FILE_NAME = "class_hierarchy.sqlite3"
+
+# Maximum number of indexed source texts, and of indexed file paths, kept before
+# evicting the least recently used
+DEFAULT_MAX_ENTRIES = 50_000
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS sources (
+        digest TEXT PRIMARY KEY,
+        classes TEXT NOT NULL,
+        last_used REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS files (
+        path TEXT PRIMARY KEY,
+        project TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        digest TEXT NOT NULL,
+        last_used REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS sources_last_used ON sources (last_used)",
+    "CREATE INDEX IF NOT EXISTS files_last_used ON files (last_used)",
+    "CREATE INDEX IF NOT EXISTS files_project ON files (project, last_used)",
+)
+
+
+class ClassInfo(NamedTuple):
+    """A class defined in a project file.
+
+    Attributes:
+        name: Name of the class
+        file: Path of the file defining the class
+        line: Line of the class definition
+        bases: Base classes, as written in the class definition
+        methods: Names of the methods defined directly in the class body
+    """
+
+    name: str
+    file: str
+    line: int
+    bases: tuple[str, ...]
+    methods: tuple[str, ...]
+
+
+class ClassHierarchy:
+    """Classes of a project, with the subclasses of every class."""
+
+    def __init__(self, classes: Iterable[ClassInfo]):
+        """Indexes classes by name and by base name.
+
+        Args:
+            classes: Every class of the project
+        """
+        self.classes: dict[str, list[ClassInfo]] = {}
+        self._subclasses: dict[str, list[ClassInfo]] = {}
+        for info in classes:
+            self.classes.setdefault(info.name, []).append(info)
+            for base in info.bases:
+                self._subclasses.setdefault(base, []).append(info)
+
+    def subclasses(self, name: str) -> list[ClassInfo]:
+        """Lists the classes directly inheriting from a class, as named in their bases.
+
+        Args:
+            name: Name of the base class
+
+        Returns:
+            list[ClassInfo]: Direct subclasses of the class
+        """
+        return list(self._subclasses.get(name, []))
+
+    def files_defining(self, name: str) -> list[Path]:
+        """Lists the files defining a class with a given name.
+
+        Args:
+            name: Name of the class
+
+        Returns:
+            list[Path]: Files defining the class
+        """
+        return list(dict.fromkeys(Path(info.file) for info in self.classes.get(name, [])))
+
+
+def collect_classes(source: str) -> list[tuple[str, int, list[str], list[str]]]:
+    """Parses a source text with `ast` and collects its class definitions.
+
+    Args:
+        source: The module source code
+
+    Returns:
+        list[tuple[str, int, list[str], list[str]]]: Name, line, bases and methods of
+            every class, empty if the source cannot be parsed
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+
+    return [
+        (
+            node.name,
+            node.lineno,
+            [ast.unparse(base) for base in node.bases],
+            [
+                child.name
+                for child in node.body
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ],
+        )
+        for node in ast.walk(tree)
+        if isinstance(node, ast.ClassDef)
+    ]
+
+
+class ClassHierarchyIndex:
+    """Class definitions of project files, stored in a SQLite database.
+
+    Class definitions are stored by content hash, so that identical files, like
+    those of a workspace copied from an indexed project, are parsed only once.
+    Every file path records the modification time, size and content hash it was
+    last indexed with; a file is hashed again only when its modification time
+    or size changes, and parsed again only when its content changed.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Opens the index database, creating it if needed.
+
+        Args:
+            db_path: Path of the SQLite database file; the index is kept in memory when None
+            max_entries: Maximum number of indexed source texts, and of indexed file paths
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            ":memory:" if db_path is None else db_path, timeout=10, check_same_thread=False
+        )
+        with self._conn:
+            if db_path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def close(self) -> None:
+        """Closes the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def _digest(self, conn: sqlite3.Connection, project: str, file: Path, now: float) -> str:
+        """Returns a file's content hash, reading the file only if it changed."""
+        stat = file.stat()
+        path = str(file.absolute())
+        row = conn.execute(
+            "SELECT digest FROM files WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (path, stat.st_mtime_ns, stat.st_size),
+        ).fetchone()
+        digest = row[0] if row else hash_source(file.read_text())
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, project, mtime_ns, size, digest, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (path, project, stat.st_mtime_ns, stat.st_size, digest, now),
+        )
+        return digest
+
+    def _classes(
+        self, conn: sqlite3.Connection, file: Path, digest: str, now: float
+    ) -> list[tuple[str, int, list[str], list[str]]]:
+        """Returns the class definitions of a file's content, parsing it only on a miss."""
+        row = conn.execute("SELECT classes FROM sources WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            conn.execute("UPDATE sources SET last_used = ? WHERE digest = ?", (now, digest))
+            return json.loads(row[0])
+
+        source = file.read_text()
+        classes = collect_classes(source)
+        # The file may have changed since it was hashed; store what was actually parsed
+        conn.execute(
+            "INSERT OR REPLACE INTO sources (digest, classes, last_used) VALUES (?, ?, ?)",
+            (hash_source(source), json.dumps(classes), now),
+        )
+        return classes
+
+    def hierarchy(self, project_root: Path, files: Iterable[Path]) -> ClassHierarchy:
+        """Builds the class hierarchy of a project from its files' current content.
+
+        Args:
+            project_root: Root directory of the project
+            files: Python files of the project
+
+        Returns:
+            ClassHierarchy: Classes defined by the files
+        """
+        project = str(project_root.absolute())
+        now = time.time()
+        infos: list[ClassInfo] = []
+
+        with self._lock, self._conn as conn:
+            for file in files:
+                try:
+                    digest = self._digest(conn, project, file, now)
+                    classes = self._classes(conn, file, digest, now)
+                except (OSError, UnicodeDecodeError):
+                    continue
+                path = str(file.absolute())
+                infos.extend(
+                    ClassInfo(name, path, line, tuple(bases), tuple(methods))
+                    for name, line, bases, methods in classes
+                )
+
+            # Files removed from the project are forgotten
+            conn.execute("DELETE FROM files WHERE project = ? AND last_used < ?", (project, now))
+            for table in ("sources", "files"):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ("
+                    f"SELECT rowid FROM {table} ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+        return ClassHierarchy(infos)
+
+    def __len__(self) -> int:
+        with self._lock, closing(self._conn.cursor()) as cursor:
+            return cursor.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+
+
+_class_hierarchy_index: ClassHierarchyIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_class_hierarchy_index() -> ClassHierarchyIndex:
+    """Returns the class hierarchy index stored in the current log directory.
+
+    Returns:
+        ClassHierarchyIndex: The shared index, kept in memory until logging has been
+            initialized or if its database cannot be opened
+    """
+    global _class_hierarchy_index
+
+    logging_manager = CONFIG["loggingManager"]
+    db_path = logging_manager.logs_dir / INDEX_FILE_NAME if logging_manager else None
+
+    with _index_lock:
+        if _class_hierarchy_index is None or _class_hierarchy_index.db_path != db_path:
+            try:
+                _class_hierarchy_index = ClassHierarchyIndex(db_path)
+            except sqlite3.Error as e:
+                CONFIG["refactorLogger"].error(
+                    f"❌ Could not open class hierarchy index at {db_path}: {e}"
+                )
+                if _class_hierarchy_index is None:
+                    _class_hierarchy_index = ClassHierarchyIndex()
+
+        return _class_hierarchy_index
@@ -0,0 +1,63 @@
+"""Line ranges changed by a refactoring, and mapping of line numbers across them."""
+
+import difflib
+from typing import NamedTuple
+
+
+class EditRange(NamedTuple):
+    """A block of lines replaced by a refactoring.
+
+    Lines are 1-based and ranges are half-open, so a pure insertion has
+    `old_start == old_end` and a pure deletion has `new_start == new_end`.
+
+    Attributes:
+        old_start: First replaced line in the original file
+        old_end: Line after the last replaced line in the original file
+        new_start: First replacement line in the refactored file
+        new_end: Line after the last replacement line in the refactored file
+    """
+
+    old_start: int
+    old_end: int
+    new_start: int
+    new_end: int
+
+
+def compute_edit_ranges(old_source: str, new_source: str) -> list[EditRange]:
+    """Diffs two versions of a file into the line ranges that changed.
+
+    Args:
+        old_source: File content before the refactoring
+        new_source: File content after the refactoring
+
+    Returns:
+        list[EditRange]: Changed ranges in file order, empty if the content is identical
+    """
+    matcher = difflib.SequenceMatcher(
+        None, old_source.splitlines(), new_source.splitlines(), autojunk=False
+    )
+    return [
+        EditRange(old_start + 1, old_end + 1, new_start + 1, new_end + 1)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def shift_line(line: int, edit_ranges: list[EditRange]) -> int | None:
+    """Maps a line of the original file to the same line in the refactored file.
+
+    Args:
+        line: 1-based line number in the original file
+        edit_ranges: Changed ranges in file order
+
+    Returns:
+        int: The line's new number, or None if the line was replaced or removed
+    """
+    offset = 0
+    for edit in edit_ranges:
+        if line < edit.old_start:
+            break
+        if line < edit.old_end:
+            return None
+        offset += (edit.new_end - edit.new_start) - (edit.old_end - edit.old_start)
+    return line + offset
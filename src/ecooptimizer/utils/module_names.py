@@ -0,0 +1,26 @@
+"""Dotted module names of source files, computed the way Pylint reports them."""
+
+from pathlib import Path
+
+
+def dotted_module_name(file_path: Path) -> str:
+    """Returns the importable name of a module from its enclosing packages.
+
+    Parent directories are included for as long as they contain an
+    `__init__.py`, so `pkg/sub/mod.py` in a package `pkg` is `pkg.sub.mod`.
+
+    Args:
+        file_path: Path to the Python source file
+
+    Returns:
+        str: Dotted module name, or the file stem for a module outside any package
+    """
+    file_path = file_path.absolute()
+    parts = [] if file_path.stem == "__init__" else [file_path.stem]
+
+    directory = file_path.parent
+    while (directory / "__init__.py").is_file() and directory.parent != directory:
+        parts.append(directory.name)
+        directory = directory.parent
+
+    return ".".join(reversed(parts)) or file_path.parent.name
@@ -0,0 +1,169 @@
+"""Content-addressed cache of parsed source modules shared by analyzers and refactorers."""
+
+import ast
+from collections import OrderedDict
+from functools import cached_property
+import hashlib
+from io import StringIO
+from pathlib import Path
+import threading
+
+import astroid
+from astroid import nodes
+import libcst as cst
+
+# Maximum number of distinct source texts kept in memory at once
+DEFAULT_CACHE_SIZE = 64
+
+
+class ParsedModule:
+    """Holds a source text along with its lazily built parse trees.
+
+    Each representation is built at most once, the first time it is requested.
+
+    Attributes:
+        source: The module source code
+        digest: SHA-256 hex digest of the source code
+    """
+
+    def __init__(self, source: str, digest: str | None = None):
+        """Initializes the module without parsing anything.
+
+        Args:
+            source: The module source code
+            digest: Precomputed content hash of the source, if available
+        """
+        self.source = source
+        self.digest = digest or hash_source(source)
+
+    @cached_property
+    def lines(self) -> list[str]:
+        """Source lines split like `readlines()`, with line endings preserved."""
+        return StringIO(self.source).readlines()
+
+    @cached_property
+    def ast_tree(self) -> ast.Module:
+        """Module parsed with the standard library `ast` parser."""
+        return ast.parse(self.source)
+
+    @cached_property
+    def astroid_module(self) -> nodes.Module:
+        """Module parsed with astroid."""
+        return astroid.parse(self.source)
+
+    @cached_property
+    def cst_module(self) -> cst.Module:
+        """Module parsed with libcst."""
+        return cst.parse_module(self.source)
+
+
+class ParsedModuleCache:
+    """Thread-safe LRU cache of `ParsedModule` objects keyed by content hash."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """Initializes an empty cache.
+
+        Args:
+            maxsize: Maximum number of modules kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, ParsedModule] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> ParsedModule:
+        """Returns the cached module for a source text, creating it on a miss.
+
+        Args:
+            source: The module source code
+
+        Returns:
+            ParsedModule: Shared module for this exact source text
+        """
+        digest = hash_source(source)
+
+        with self._lock:
+            module = self._entries.get(digest)
+            if module is not None:
+                self._entries.move_to_end(digest)
+                return module
+
+            module = ParsedModule(source, digest)
+            self._entries[digest] = module
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return module
+
+    def find_by_tree(self, tree: ast.AST | nodes.NodeNG) -> ParsedModule | None:
+        """Finds the cached module that produced a given `ast` or astroid tree.
+
+        Lets detectors that only receive a tree recover the source text without
+        reading the file again.
+
+        Args:
+            tree: Root of a parse tree handed out by this cache
+
+        Returns:
+            ParsedModule: The owning module, or None if the tree was parsed elsewhere
+        """
+        with self._lock:
+            for module in reversed(self._entries.values()):
+                built = module.__dict__
+                if built.get("ast_tree") is tree or built.get("astroid_module") is tree:
+                    return module
+        return None
+
+    def clear(self) -> None:
+        """Drops every cached module."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def hash_source(source: str) -> str:
+    """Computes the content hash used to key cached modules.
+
+    Args:
+        source: The module source code
+
+    Returns:
+        str: SHA-256 hex digest of the source
+    """
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+# Process-wide cache shared by every analyzer and refactorer
+PARSED_MODULE_CACHE = ParsedModuleCache()
+
+
+def parse_source(source: str) -> ParsedModule:
+    """Returns the shared parsed module for a source text."""
+    return PARSED_MODULE_CACHE.get(source)
+
+
+def get_source(file_path: Path, tree: ast.AST | nodes.NodeNG) -> str:
+    """Returns the source text a tree was parsed from, reading the file only on a cache miss.
+
+    Args:
+        file_path: Path to the file the tree was parsed from
+        tree: Root of the parse tree
+
+    Returns:
+        str: The module source code
+    """
+    module = PARSED_MODULE_CACHE.find_by_tree(tree)
+    return module.source if module else file_path.read_text()
+
+
+def get_parsed_module(file_path: Path) -> ParsedModule:
+    """Reads a file and returns the shared parsed module for its current content.
+
+    Args:
+        file_path: Path to the Python source file
+
+    Returns:
+        ParsedModule: Shared module for the file's content
+    """
+    return PARSED_MODULE_CACHE.get(file_path.read_text())
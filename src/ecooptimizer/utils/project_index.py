@@ -0,0 +1,327 @@
+"""Index of the symbols defined and referenced by every Python file of a project.
+
+Refactorers that work across files use the index to visit only the files that
+mention the symbol they change, instead of parsing the whole project. Files
+are indexed lazily and re-indexed when their size, modification time or inode
+changes, or when they are invalidated before being rewritten. Symbols are
+memoized by content hash, so indexing a workspace that shares most of its
+files with an already indexed project only reads them.
+"""
+
+import ast
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+import threading
+from typing import NamedTuple, Optional
+
+from ecooptimizer.utils.parsed_module import hash_source
+
+# Maximum number of project roots whose index is kept in memory at once
+DEFAULT_INDEX_COUNT = 16
+
+# Maximum number of distinct source texts whose symbols are kept in memory at once
+DEFAULT_SYMBOLS_CACHE_SIZE = 4096
+
+
+class FileSymbols(NamedTuple):
+    """Symbols defined and referenced by one source file.
+
+    Attributes:
+        digest: SHA-256 hex digest of the source the symbols were collected from
+        classes: Names of the classes defined in the file
+        functions: Names of the functions and methods defined in the file
+        calls: Lines of the call sites of every callee, by the called name or attribute
+        attributes: Names of the attributes accessed in the file
+        names: Identifiers the file reads or assigns
+        imports: Modules imported by the file and the names they are bound to
+        parsed: Whether the source could be parsed; unparsed files mention every name
+    """
+
+    digest: str
+    classes: frozenset[str] = frozenset()
+    functions: frozenset[str] = frozenset()
+    calls: Mapping[str, tuple[int, ...]] = {}
+    attributes: frozenset[str] = frozenset()
+    names: frozenset[str] = frozenset()
+    imports: frozenset[str] = frozenset()
+    parsed: bool = True
+
+    def mentions(self, name: str) -> bool:
+        """Whether the file defines, calls, accesses, reads or imports a name.
+
+        Args:
+            name: Identifier, without any dotted prefix
+
+        Returns:
+            bool: True if the file may refer to the name
+        """
+        return (
+            not self.parsed
+            or name in self.names
+            or name in self.attributes
+            or name in self.calls
+            or name in self.functions
+            or name in self.classes
+            or name in self.imports
+        )
+
+
+def collect_symbols(source: str, digest: Optional[str] = None) -> FileSymbols:
+    """Parses a source text with `ast` and collects its symbols.
+
+    Args:
+        source: The module source code
+        digest: Precomputed content hash of the source, if available
+
+    Returns:
+        FileSymbols: Symbols of the source, marked unparsed if it has a syntax error
+    """
+    digest = digest or hash_source(source)
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return FileSymbols(digest, parsed=False)
+
+    classes: set[str] = set()
+    functions: set[str] = set()
+    calls: dict[str, list[int]] = {}
+    attributes: set[str] = set()
+    names: set[str] = set()
+    imports: set[str] = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            classes.add(node.name)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.add(node.name)
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                calls.setdefault(node.func.id, []).append(node.lineno)
+            elif isinstance(node.func, ast.Attribute):
+                calls.setdefault(node.func.attr, []).append(node.lineno)
+        elif isinstance(node, ast.Attribute):
+            attributes.add(node.attr)
+        elif isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+                imports.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                imports.add(node.module)
+            for alias in node.names:
+                imports.add(alias.name)
+                if alias.asname:
+                    imports.add(alias.asname)
+
+    return FileSymbols(
+        digest,
+        frozenset(classes),
+        frozenset(functions),
+        {callee: tuple(lines) for callee, lines in calls.items()},
+        frozenset(attributes),
+        frozenset(names),
+        frozenset(imports),
+    )
+
+
+class _SymbolsCache:
+    """Thread-safe LRU cache of `FileSymbols` keyed by content hash."""
+
+    def __init__(self, maxsize: int = DEFAULT_SYMBOLS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, FileSymbols] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> FileSymbols:
+        digest = hash_source(source)
+        with self._lock:
+            symbols = self._entries.get(digest)
+            if symbols is not None:
+                self._entries.move_to_end(digest)
+                return symbols
+
+        symbols = collect_symbols(source, digest)
+        with self._lock:
+            self._entries[digest] = symbols
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return symbols
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_SYMBOLS_CACHE = _SymbolsCache()
+
+
+def _signature(file: Path) -> tuple[int, int, int]:
+    stat = file.stat()
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class ProjectIndex:
+    """Symbols of every Python file under a project root, kept up to date lazily.
+
+    Attributes:
+        root: Root directory of the indexed project
+    """
+
+    def __init__(self, root: Path):
+        """Initializes an empty index; files are indexed when first looked up.
+
+        Args:
+            root: Root directory of the project
+        """
+        self.root = root.absolute()
+        self._entries: dict[Path, tuple[tuple[int, int, int], FileSymbols]] = {}
+        self._lock = threading.Lock()
+
+    def files(self) -> list[Path]:
+        """Lists the project's Python files, skipping ignored directories.
+
+        Returns:
+            list[Path]: Python files in traversal order
+        """
+        # Imported here, as the refactorers discovering files this way build on the index
+        from ecooptimizer.refactorers.multi_file_refactorer import (
+            collect_python_files,
+            load_ignore_patterns,
+        )
+
+        return collect_python_files(self.root, load_ignore_patterns())
+
+    def symbols(self, file: Path) -> FileSymbols:
+        """Returns a file's symbols, re-indexing it if it changed since it was indexed.
+
+        Args:
+            file: Python file of the project
+
+        Returns:
+            FileSymbols: Symbols of the file's current content
+        """
+        key = file.absolute()
+        signature = _signature(key)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        return self.update(key)
+
+    def update(self, file: Path) -> FileSymbols:
+        """Re-indexes a file, e.g. after it was rewritten.
+
+        Args:
+            file: Python file of the project
+
+        Returns:
+            FileSymbols: Symbols of the file's current content
+        """
+        key = file.absolute()
+        signature = _signature(key)
+        symbols = _SYMBOLS_CACHE.get(key.read_text())
+        with self._lock:
+            self._entries[key] = (signature, symbols)
+        return symbols
+
+    def invalidate(self, file: Path) -> None:
+        """Forgets a file's symbols, so that its next lookup re-indexes it.
+
+        Args:
+            file: File about to be rewritten or removed
+        """
+        with self._lock:
+            self._entries.pop(file.absolute(), None)
+
+    def files_referencing(
+        self, names: Iterable[str], files: Optional[Iterable[Path]] = None
+    ) -> list[Path]:
+        """Lists the files that may refer to any of the given names.
+
+        Args:
+            names: Identifiers to look for, without any dotted prefix
+            files: Files to consider, all of the project's Python files by default
+
+        Returns:
+            list[Path]: Files mentioning a name, in the order they were given
+        """
+        names = set(names)
+        if not names:
+            return []
+        return [
+            file
+            for file in (self.files() if files is None else files)
+            if any(self.symbols(file).mentions(name) for name in names)
+        ]
+
+
+class ProjectIndexRegistry:
+    """Thread-safe LRU registry holding one `ProjectIndex` per project root."""
+
+    def __init__(self, maxsize: int = DEFAULT_INDEX_COUNT):
+        """Initializes an empty registry.
+
+        Args:
+            maxsize: Maximum number of indexes kept before evicting the least recently used
+        """
+        self.maxsize = maxsize
+        self._indexes: OrderedDict[Path, ProjectIndex] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, root: Path) -> ProjectIndex:
+        """Returns the index of a project root, creating it on a miss.
+
+        Args:
+            root: Root directory of the project
+
+        Returns:
+            ProjectIndex: Shared index of the project
+        """
+        root = root.absolute()
+        with self._lock:
+            index = self._indexes.get(root)
+            if index is None:
+                index = ProjectIndex(root)
+                self._indexes[root] = index
+                while len(self._indexes) > self.maxsize:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(root)
+            return index
+
+    def invalidate(self, file: Path) -> None:
+        """Forgets a file in the index of every project that contains it.
+
+        Args:
+            file: File about to be rewritten or removed
+        """
+        file = file.absolute()
+        with self._lock:
+            indexes = [index for root, index in self._indexes.items() if file.is_relative_to(root)]
+        for index in indexes:
+            index.invalidate(file)
+
+    def clear(self) -> None:
+        """Drops every index."""
+        with self._lock:
+            self._indexes.clear()
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+
+# Process-wide indexes shared by every refactorer
+PROJECT_INDEXES = ProjectIndexRegistry()
+
+
+def get_project_index(root: Path) -> ProjectIndex:
+    """Returns the shared index of a project root."""
+    return PROJECT_INDEXES.get(root)
+
+
+def invalidate_file(file: Path) -> None:
+    """Forgets a file about to be rewritten in every index containing it."""
+    PROJECT_INDEXES.invalidate(file)
@@ -0,0 +1,223 @@
+"""Persistent cache of detected smells keyed by file content and detection settings."""
+
+from contextlib import closing
+import hashlib
+import importlib.metadata
+import json
+from pathlib import Path
+import sqlite3
+import sys
+import time
+from typing import Any
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.data_types.smell import CRCSmell, SCLSmell, Smell
+from ecooptimizer.utils.smells_registry import retrieve_smell_registry
+
+# File name of the cache database inside the log directory
+CACHE_FILE_NAME = "smell_cache.sqlite3"
+
+# Maximum number of cached analyses kept before evicting the least recently used
+DEFAULT_MAX_ENTRIES = 10_000
+
+# Packages whose version changes what gets detected
+VERSIONED_PACKAGES = ("ecooptimizer", "pylint", "astroid", "libcst", "astor")
+
+# Smell models that can appear in cached results, by class name
+SMELL_MODELS: dict[str, type[Smell]] = {
+    model.__name__: model for model in (Smell, CRCSmell, SCLSmell)
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS smells (
+    key TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    smells TEXT NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+def _package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def analyzer_versions() -> dict[str, str]:
+    """Returns the versions of Python and every package that affects detection."""
+    versions = {name: _package_version(name) for name in VERSIONED_PACKAGES}
+    versions["python"] = ".".join(map(str, sys.version_info[:3]))
+    return versions
+
+
+def canonical_options(enabled_smells: dict[str, dict[str, int | str]] | list[str]) -> str:
+    """Serializes the resolved detection settings into a stable string.
+
+    Args:
+        enabled_smells: Dictionary or list specifying which smells to detect
+
+    Returns:
+        str: Canonical JSON of every enabled smell's analyzer, checker and options
+    """
+    registry = retrieve_smell_registry(enabled_smells)
+
+    resolved: dict[str, Any] = {}
+    for name, smell in registry.items():
+        if not smell["enabled"]:
+            continue
+
+        checker = smell["checker"]
+        resolved[name] = {
+            "id": smell["id"],
+            "analyzer_method": smell["analyzer_method"],
+            "checker": f"{checker.__module__}.{checker.__qualname__}" if checker else None,
+            "analyzer_options": smell["analyzer_options"],
+        }
+
+    return json.dumps(resolved, sort_keys=True, default=str)
+
+
+class SmellCache:
+    """Size-bounded LRU cache of detected smells stored in a SQLite database.
+
+    Entries are keyed by a hash of the file's path and content, the resolved
+    detection settings and the analyzer versions, so any change to one of them
+    results in a miss rather than stale smells.
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """Opens the cache database, creating it if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_entries: Maximum number of cached analyses
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.versions = json.dumps(analyzer_versions(), sort_keys=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def make_key(
+        self, file_path: Path, enabled_smells: dict[str, dict[str, int | str]] | list[str]
+    ) -> str:
+        """Builds the cache key for analyzing a file's current content.
+
+        Args:
+            file_path: Path to the Python file to analyze
+            enabled_smells: Dictionary or list specifying which smells to detect
+
+        Returns:
+            str: SHA-256 hex digest identifying the analysis
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        content_hash = hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+        key = hashlib.sha256()
+        for part in (
+            str(file_path.resolve()),
+            content_hash,
+            canonical_options(enabled_smells),
+            self.versions,
+        ):
+            key.update(part.encode("utf-8"))
+            key.update(b"\0")
+        return key.hexdigest()
+
+    def get(self, key: str) -> list[Smell] | None:
+        """Returns the cached smells for a key, marking the entry as recently used.
+
+        Args:
+            key: Key returned by `make_key`
+
+        Returns:
+            list[Smell]: The cached smells, or None on a miss
+        """
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT smells FROM smells WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE smells SET last_used = ? WHERE key = ?", (time.time(), key))
+
+        return [SMELL_MODELS[entry["model"]](**entry["data"]) for entry in json.loads(row[0])]
+
+    def put(self, key: str, file_path: Path, smells: list[Smell]) -> None:
+        """Stores the smells detected for a key, evicting the oldest entries if full.
+
+        Args:
+            key: Key returned by `make_key`
+            file_path: Path to the analyzed file
+            smells: Smells detected in the file
+        """
+        payload = json.dumps(
+            [{"model": type(smell).__name__, "data": smell.model_dump()} for smell in smells]
+        )
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO smells (key, file_path, smells, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, str(file_path.resolve()), payload, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM smells WHERE key IN ("
+                "SELECT key FROM smells ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, file_path: Path | None = None) -> int:
+        """Removes cached analyses of one file, or every cached analysis.
+
+        Args:
+            file_path: File whose entries are removed; all entries when omitted
+
+        Returns:
+            int: Number of entries removed
+        """
+        with closing(self._connect()) as conn, conn:
+            if file_path is None:
+                cursor = conn.execute("DELETE FROM smells")
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM smells WHERE file_path = ?", (str(file_path.resolve()),)
+                )
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM smells").fetchone()[0]
+
+
+_smell_cache: SmellCache | None = None
+
+
+def get_smell_cache() -> SmellCache | None:
+    """Returns the smell cache stored in the current log directory.
+
+    Returns:
+        SmellCache: The shared cache, or None until logging has been initialized
+    """
+    global _smell_cache
+
+    logging_manager = CONFIG["loggingManager"]
+    if logging_manager is None:
+        return None
+
+    db_path = logging_manager.logs_dir / CACHE_FILE_NAME
+    if _smell_cache is None or _smell_cache.db_path != db_path:
+        try:
+            _smell_cache = SmellCache(db_path)
+        except sqlite3.Error as e:
+            CONFIG["detectLogger"].error(f"❌ Could not open smell cache at {db_path}: {e}")
+            return None
+
+    return _smell_cache
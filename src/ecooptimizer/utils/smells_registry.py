@@ -3,6 +3,7 @@
 from copy import deepcopy
 from typing import Any
 
+from ecooptimizer.config import CONFIG
 from ecooptimizer.utils.smell_enums import CustomSmell, PylintSmell
 from ecooptimizer.analyzers.ast_analyzers.detect_long_element_chain import detect_long_element_chain
 from ecooptimizer.analyzers.ast_analyzers.detect_long_lambda_expression import (
@@ -13,6 +14,11 @@ from ecooptimizer.analyzers.astroid_analyzers.detect_string_concat_in_loop impor
     detect_string_concat_in_loop,
 )
 from ecooptimizer.analyzers.ast_analyzers.detect_repeated_calls import detect_repeated_calls
+from ecooptimizer.analyzers.ast_analyzers.detect_use_a_generator import detect_use_a_generator
+from ecooptimizer.analyzers.astroid_analyzers.detect_no_self_use import detect_no_self_use
+from ecooptimizer.analyzers.astroid_analyzers.detect_too_many_arguments import (
+    detect_too_many_arguments,
+)
 from ecooptimizer.refactorers.concrete.list_comp_any_all import UseAGeneratorRefactorer
 from ecooptimizer.refactorers.concrete.long_lambda_function import LongLambdaFunctionRefactorer
 from ecooptimizer.refactorers.concrete.long_element_chain import LongElementChainRefactorer
@@ -93,6 +99,37 @@ _SMELL_REGISTRY: dict[str, SmellRecord] = {
     },
 }
 
+# Detectors replacing Pylint for its smells when the native analysis backend is selected
+_NATIVE_SMELL_REGISTRY: dict[str, SmellRecord] = {
+    "use-a-generator": {
+        "id": PylintSmell.USE_A_GENERATOR.value,
+        "enabled": True,
+        "analyzer_method": "ast",
+        "checker": detect_use_a_generator,
+        "analyzer_options": {},
+        "refactorer": UseAGeneratorRefactorer,
+    },
+    "too-many-arguments": {
+        "id": PylintSmell.LONG_PARAMETER_LIST.value,
+        "enabled": True,
+        "analyzer_method": "astroid",
+        "checker": detect_too_many_arguments,
+        "analyzer_options": {"max_args": 6},
+        "refactorer": LongParameterListRefactorer,
+    },
+    "no-self-use": {
+        "id": PylintSmell.NO_SELF_USE.value,
+        "enabled": True,
+        "analyzer_method": "astroid",
+        "checker": detect_no_self_use,
+        "analyzer_options": {},
+        "refactorer": MakeStaticRefactorer,
+    },
+}
+
+# Supported values of the `analysisBackend` setting
+ANALYSIS_BACKENDS = ("pylint", "native")
+
 # Default configuration values for smell detection
 OPTIONS_CONFIG = {
     "too-many-arguments": {"max_args": 6},
@@ -103,17 +140,30 @@ OPTIONS_CONFIG = {
 }
 
 
-def retrieve_smell_registry(enabled_smells: dict[str, dict[str, int | str]] | list[str]):
+def retrieve_smell_registry(
+    enabled_smells: dict[str, dict[str, int | str]] | list[str], backend: str | None = None
+):
     """Returns a modified smell registry based on user preferences.
 
     Args:
         enabled_smells: Either a list of enabled smell names or a dictionary
                        with smell-specific configurations
+        backend: Analysis backend for Pylint's smells, 'pylint' or 'native';
+                defaults to the configured `analysisBackend`
 
     Returns:
         Dictionary containing only enabled smells with updated configurations
+
+    Raises:
+        ValueError: If the backend is not supported
     """
+    backend = backend or CONFIG["analysisBackend"]
+    if backend not in ANALYSIS_BACKENDS:
+        raise ValueError(f"Unknown analysis backend: {backend}")
+
     updated_registry = deepcopy(_SMELL_REGISTRY)
+    if backend == "native":
+        updated_registry.update(deepcopy(_NATIVE_SMELL_REGISTRY))
 
     if isinstance(enabled_smells, list):
         return {
@@ -0,0 +1,133 @@
+"""Opt-in tracing for analyzers and refactorers.
+
+Tracing is organized in categories, one per detector or refactorer, named after
+the smell symbol it handles (e.g. `string-concat-loop`). Categories are switched
+on for the duration of a request with `tracing`; everywhere else tracing is off.
+
+A detector asks for its tracer once, when it starts, and calls it with a message
+or a thunk producing the message. When the category is off, the tracer is a shared
+disabled instance: calling it returns immediately and thunks are never evaluated,
+so messages that render nodes to source cost nothing.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import time
+from typing import Any, NamedTuple
+
+# Category enabling every tracer
+ALL_CATEGORIES = "*"
+
+
+class TraceEvent(NamedTuple):
+    """A single structured trace event.
+
+    Attributes:
+        category: Category of the tracer that emitted the event
+        message: Rendered message
+        fields: Structured data attached to the event
+        timestamp: Time the event was emitted, in seconds since the epoch
+    """
+
+    category: str
+    message: str
+    fields: dict[str, Any]
+    timestamp: float
+
+
+TraceSink = Callable[[TraceEvent], None]
+
+
+class _TraceSettings(NamedTuple):
+    categories: frozenset[str]
+    sink: TraceSink | None
+
+
+_settings: ContextVar[_TraceSettings | None] = ContextVar("trace_settings", default=None)
+
+
+class Tracer:
+    """Emits trace events for one category.
+
+    A tracer is truthy only when enabled, so expensive preparation of fields can be
+    guarded with `if trace:`.
+    """
+
+    __slots__ = ("category", "enabled", "logger", "sink")
+
+    def __init__(
+        self,
+        category: str,
+        logger: logging.Logger | None = None,
+        sink: TraceSink | None = None,
+        enabled: bool = True,
+    ):
+        self.category = category
+        self.logger = logger
+        self.sink = sink
+        self.enabled = enabled
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    def __call__(self, message: str | Callable[[], str], **fields: Any) -> None:  # noqa: ANN401
+        """Emits an event if the tracer is enabled.
+
+        Args:
+            message: Message, or a thunk returning it, only called when enabled
+            **fields: Structured data attached to the event
+        """
+        if not self.enabled:
+            return
+
+        event = TraceEvent(
+            self.category,
+            message() if callable(message) else message,
+            fields,
+            time.time(),
+        )
+        if self.sink is not None:
+            self.sink(event)
+        elif self.logger is not None:
+            self.logger.debug(
+                "[%s] %s", event.category, event.message, extra={"trace_event": event._asdict()}
+            )
+
+
+_DISABLED = Tracer("", enabled=False)
+
+
+def get_tracer(category: str, logger: logging.Logger | None = None) -> Tracer:
+    """Returns the tracer of a category, as configured for the current request.
+
+    Args:
+        category: Trace category, usually the symbol of the smell being handled
+        logger: Logger receiving events when no sink is configured
+
+    Returns:
+        Tracer: An enabled tracer, or a shared disabled one if the category is off
+    """
+    settings = _settings.get()
+    if settings is None or (
+        category not in settings.categories and ALL_CATEGORIES not in settings.categories
+    ):
+        return _DISABLED
+    return Tracer(category, logger, settings.sink)
+
+
+@contextmanager
+def tracing(categories: Iterable[str] | None, sink: TraceSink | None = None) -> Iterator[None]:
+    """Enables trace categories for the current context, e.g. one request.
+
+    Args:
+        categories: Categories to enable, `*` enabling all of them; none leaves tracing off
+        sink: Receives structured events instead of the tracers' loggers
+    """
+    enabled = frozenset(categories or ())
+    token = _settings.set(_TraceSettings(enabled, sink) if enabled else None)
+    try:
+        yield
+    finally:
+        _settings.reset(token)
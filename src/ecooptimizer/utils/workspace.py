@@ -0,0 +1,88 @@
+"""Workspaces in which refactorings are made.
+
+A workspace mirrors a source tree with real directories and independent copies
+of its files, as refactorers write to it and measured workloads run in it: a
+workload appending to a log file must not change the original tree. Files are
+cloned where the file system supports reflinks (e.g. Btrfs, XFS), which costs no
+data copy. Elsewhere they are copied.
+"""
+
+from pathlib import Path
+import shutil
+import sys
+
+from ecooptimizer.config import CONFIG
+
+# `ioctl` request cloning a whole file on Linux, exposed by `fcntl` from Python 3.12
+FICLONE = 0x40049409
+
+# Names never mirrored into a workspace
+IGNORED_NAMES = shutil.ignore_patterns(".git*")
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    """Clones a file's data into a new file, returning False where reflinks are unsupported."""
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl
+
+    try:
+        with source.open("rb") as src, destination.open("xb") as dst:
+            fcntl.ioctl(dst.fileno(), getattr(fcntl, "FICLONE", FICLONE), src.fileno())
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, destination)
+    return True
+
+
+def _clone_file(source: Path, destination: Path) -> str:
+    """Copies a file into a workspace, returning how it was copied."""
+    if _reflink(source, destination):
+        return "reflink"
+    shutil.copy2(source, destination)
+    return "copy"
+
+
+class Workspace:
+    """Independent copy of a source tree.
+
+    Attributes:
+        root: Directory of the mirrored tree
+        source_dir: Directory mirrored, if the workspace was created from it
+    """
+
+    def __init__(self, root: Path, source_dir: Path | None = None):
+        """Opens a workspace.
+
+        Args:
+            root: Directory of the mirrored tree
+            source_dir: Directory mirrored, if known
+        """
+        self.root = root
+        self.source_dir = source_dir
+
+    @classmethod
+    def create(cls, source_dir: Path, root: Path) -> "Workspace":
+        """Mirrors a source tree, cloning its files where the file system allows it.
+
+        Args:
+            source_dir: Directory to mirror; it is only read
+            root: Directory created for the mirror, which must not exist
+
+        Returns:
+            Workspace: The new workspace
+
+        Raises:
+            OSError: If the mirror cannot be created
+        """
+        copies: dict[str, int] = {}
+
+        def clone(source: str, destination: str) -> None:
+            kind = _clone_file(Path(source), Path(destination))
+            copies[kind] = copies.get(kind, 0) + 1
+
+        shutil.copytree(source_dir, root, ignore=IGNORED_NAMES, copy_function=clone)
+        CONFIG["refactorLogger"].debug(f"Mirrored {source_dir} into {root}: {copies}")
+        return cls(root, source_dir)
@@ -0,0 +1,83 @@
+import ast
+import textwrap
+from pathlib import Path
+from unittest.mock import Mock
+
+from ecooptimizer.analyzers.ast_analyzer import (
+    ASTAnalyzer,
+    ASTDetector,
+    TraversalContext,
+    run_detectors,
+)
+from ecooptimizer.analyzers.ast_analyzers.detect_long_element_chain import (
+    detect_long_element_chain,
+)
+from ecooptimizer.analyzers.ast_analyzers.detect_long_message_chain import (
+    detect_long_message_chain,
+)
+from ecooptimizer.analyzers.ast_analyzers.detect_repeated_calls import detect_repeated_calls
+from ecooptimizer.utils.parsed_module import parse_source
+
+
+CODE = textwrap.dedent("""\
+    def process(data, obj):
+        value = data["a"]["b"]["c"]["d"]["e"]
+        for item in data:
+            result = obj.compute(item)
+            other = obj.compute(item)
+            text = item.strip().lower().upper().title().strip()
+        while True:
+            break
+    """)
+
+
+class ContextRecorder(ASTDetector):
+    def __init__(self, file_path: Path):
+        super().__init__(file_path)
+        self.contexts: dict[str, TraversalContext] = {}
+
+    def visit_Name(self, node: ast.Name, context: TraversalContext):
+        self.contexts.setdefault(node.id, context)
+
+
+def test_context_tracks_loops_and_functions():
+    tree = ast.parse(CODE)
+    recorder = ContextRecorder(Path("sample.py"))
+
+    run_detectors(tree, [recorder])
+
+    function = tree.body[0]
+    loop = function.body[1]
+    assert recorder.contexts["value"].function is function
+    assert recorder.contexts["value"].loop_depth == 0
+    assert recorder.contexts["value"].scopes == (function,)
+    assert recorder.contexts["result"].loop_depth == 1
+    assert recorder.contexts["result"].scopes == (function, loop)
+
+
+def test_fused_analysis_matches_standalone_detectors():
+    path = Path("sample.py")
+    parsed = parse_source(CODE)
+    options = [
+        (detect_long_element_chain, {"threshold": 5}),
+        (detect_repeated_calls, {"threshold": 2}),
+        (detect_long_message_chain, {"threshold": 3}),
+    ]
+
+    fused = ASTAnalyzer().analyze(path, options, parsed)
+    standalone = [
+        smell for detector, params in options for smell in detector(path, parsed.ast_tree, **params)
+    ]
+
+    assert [smell.messageId for smell in fused] == ["LEC001", "CRC001", "CRC001", "LMC001"]
+    assert fused == standalone
+
+
+def test_plain_detector_functions_still_called():
+    path = Path("sample.py")
+    parsed = parse_source(CODE)
+    plain_detector = Mock(return_value=[])
+
+    ASTAnalyzer().analyze(path, [(plain_detector, {"threshold": 1})], parsed)
+
+    plain_detector.assert_called_once_with(path, parsed.ast_tree, threshold=1)
@@ -0,0 +1,123 @@
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from ecooptimizer.analyzers.analyzer_controller import AnalyzerController
+from ecooptimizer.utils.smells_registry import retrieve_smell_registry
+
+INPUT_DIR = Path(__file__).parent.parent / "input"
+
+PYLINT_SMELLS = ["use-a-generator", "too-many-arguments", "no-self-use"]
+
+EDGE_CASES = {
+    "generator_keywords": """\
+        async def check(items, key):
+            return all([item for item in items], key=key), any([x async for x in items])
+        """,
+    "ignored_and_bound_arguments": """\
+        class Shape:
+            def method(self, a, b, c, d, e, f, g):
+                return self, a, b, c, d, e, f, g
+
+            @classmethod
+            def build(cls, a, b, c, d, e, f):
+                return cls, a, b, c, d, e, f
+
+            @staticmethod
+            def static(a, b, c, d, e, f, g):
+                return a, b, c, d, e, f, g
+
+        def skipped(a, b, c, d, e, f, _g, unused_h, *, ignored_i, j):
+            return a, b, c, d, e, f, j
+        """,
+    "self_use_exceptions": """\
+        import abc
+        from typing import Protocol
+
+
+        class Base:
+            def shared(self):
+                return 1
+
+
+        class Child(Base):
+            def shared(self):
+                return 2
+
+            def __str__(self):
+                return "child"
+
+            @property
+            def size(self):
+                return 3
+
+            def calls_super(self):
+                return super().shared()
+
+            def nested(self):
+                def inner():
+                    return self
+                return inner
+
+            def uses_lambda(self):
+                return lambda: 4
+
+            @abc.abstractmethod
+            def abstract(self):
+                raise NotImplementedError
+
+            class Inner:
+                def inner_method(other):
+                    return 5
+
+
+        class Proto(Protocol):
+            def required(self):
+                return 6
+        """,
+}
+
+
+def analyze(file_path: Path, backend: str, mocker) -> list[str]:
+    mocker.patch.dict("ecooptimizer.config.CONFIG", {"analysisBackend": backend})
+    smells = AnalyzerController().run_analysis(file_path, PYLINT_SMELLS)
+    return sorted(json.dumps(smell.model_dump(), sort_keys=True) for smell in smells)
+
+
+def test_native_backend_registers_ast_and_astroid_checkers():
+    registry = retrieve_smell_registry(PYLINT_SMELLS, "native")
+
+    assert {smell["analyzer_method"] for smell in registry.values()} == {"ast", "astroid"}
+    assert all(smell["checker"] is not None for smell in registry.values())
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown analysis backend"):
+        retrieve_smell_registry(PYLINT_SMELLS, "fast")
+
+
+def test_native_backend_honours_max_args(source_files, mocker):
+    file = source_files / "max_args.py"
+    file.write_text("def f(a, b, c, d):\n    return a, b, c, d\n")
+    mocker.patch.dict("ecooptimizer.config.CONFIG", {"analysisBackend": "native"})
+
+    smells = AnalyzerController().run_analysis(file, {"too-many-arguments": {"max_args": 3}})
+
+    assert [smell.message for smell in smells] == ["Too many arguments (4/3)"]
+
+
+@pytest.mark.parametrize("name", sorted(EDGE_CASES))
+def test_native_matches_pylint_on_edge_cases(source_files, mocker, name):
+    file = source_files / f"native_{name}.py"
+    file.write_text(textwrap.dedent(EDGE_CASES[name]))
+
+    assert analyze(file, "native", mocker) == analyze(file, "pylint", mocker)
+
+
+@pytest.mark.parametrize(
+    "file", sorted(INPUT_DIR.rglob("*.py")), ids=lambda file: str(file.relative_to(INPUT_DIR))
+)
+def test_native_matches_pylint_on_input(file, mocker):
+    assert analyze(file, "native", mocker) == analyze(file, "pylint", mocker)
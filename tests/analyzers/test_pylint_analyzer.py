@@ -0,0 +1,100 @@
+from io import StringIO
+import json
+import textwrap
+from pathlib import Path
+
+from pylint.lint import Run
+from pylint.reporters import CollectingReporter
+from pylint.reporters.json_reporter import JSON2Reporter
+import pytest
+
+from ecooptimizer.analyzers.pylint_analyzer import LINTER_POOL, PylintAnalyzer, PylintLinterPool
+
+OPTIONS = ["--disable=all", "--max-args=3", "--enable=too-many-arguments,use-a-generator"]
+
+CODE = textwrap.dedent("""\
+    def many(a, b, c, d, e):
+        return any([x for x in (a, b, c, d, e)])
+    """)
+
+
+@pytest.fixture
+def source_file(source_files):
+    file = source_files / "pylint_sample.py"
+    file.write_text(CODE)
+    return file
+
+
+def run_pylint_json(file_path: Path) -> list[dict]:
+    with StringIO() as buffer:
+        Run(
+            [str(file_path), *OPTIONS, "--clear-cache-post-run=True"],
+            reporter=JSON2Reporter(buffer),
+            exit=False,
+        )
+        return json.loads(buffer.getvalue())["messages"]
+
+
+def test_results_match_pylint_run(source_file):
+    expected = run_pylint_json(source_file)
+
+    smells = PylintAnalyzer().analyze(source_file, OPTIONS)
+
+    assert [smell.messageId for smell in smells] == ["R0913", "R1729"]
+    assert [
+        (smell.messageId, smell.message, smell.obj, smell.path, smell.occurences[0].line)
+        for smell in smells
+    ] == [(m["messageId"], m["message"], m["obj"], m["absolutePath"], m["line"]) for m in expected]
+
+
+def enabled_messages(linter) -> set[str]:
+    return {
+        msgid
+        for checker in linter.get_checkers()
+        for msgid in checker.msgs
+        if linter.is_message_enabled(msgid)
+    }
+
+
+def test_pooled_linter_is_configured_like_pylint_run(source_file):
+    # Breaks if a pylint upgrade changes the private steps `_LinterSetup` mirrors
+    options = [*OPTIONS, "--load-plugins=pylint.extensions.no_self_use"]
+    expected = Run([str(source_file), *options], reporter=CollectingReporter(), exit=False).linter
+
+    linter = PylintLinterPool().get(list(options))
+
+    expected_config, config = vars(expected.config), vars(linter.config)
+    assert sorted(config) == sorted(expected_config)
+    for name, value in expected_config.items():
+        if name != "files":
+            assert config[name] == value, f"option {name!r} differs from pylint's Run"
+    assert sorted(linter.get_checker_names()) == sorted(expected.get_checker_names())
+    # The plugin's no-self-use message is registered
+    assert any("R6301" in checker.msgs for checker in linter.get_checkers())
+    assert enabled_messages(linter) == enabled_messages(expected)
+
+
+def test_linter_reused_for_same_options(source_file):
+    analyzer = PylintAnalyzer()
+
+    analyzer.analyze(source_file, OPTIONS)
+    linter = LINTER_POOL.get(OPTIONS)
+    analyzer.analyze(source_file, OPTIONS)
+
+    assert LINTER_POOL.get(OPTIONS) is linter
+
+
+def test_modified_file_is_reanalyzed(source_file):
+    analyzer = PylintAnalyzer()
+    assert len(analyzer.analyze(source_file, OPTIONS)) == 2
+
+    source_file.write_text("def few(a):\n    return a\n")
+
+    assert analyzer.analyze(source_file, OPTIONS) == []
+
+
+def test_invalid_options_are_logged(source_file, mocker):
+    logger = mocker.patch.dict("ecooptimizer.config.CONFIG", {"detectLogger": mocker.Mock()})
+
+    assert PylintAnalyzer().analyze(source_file, ["--not-an-option"]) == []
+    logger["detectLogger"].error.assert_called_once()
@@ -130,3 +130,29 @@ def test_detects_repeated_method_call_with_different_objects():
     """)
     smells = run_detection_test(code)
     assert len(smells) == 0
+
+
+def test_distinguishes_equal_constants_of_different_types():
+    """Ensures calls whose arguments compare equal but render differently are NOT grouped."""
+    code = textwrap.dedent("""
+    def test_case():
+        result1 = expensive_function(1)
+        result2 = expensive_function(1.0)
+        result3 = expensive_function(True)
+    """)
+    smells = run_detection_test(code)
+    assert len(smells) == 0
+
+
+def test_reports_calls_with_source_quote_style():
+    """Reports repeated calls with the quotes used in the source."""
+    code = textwrap.dedent("""
+    def test_case(data):
+        result1 = data.get("key")
+        result2 = data.get("key")
+    """)
+    smells = run_detection_test(code)
+
+    assert len(smells) == 1
+    assert len(smells[0].occurences) == 2
+    assert smells[0].additionalInfo.callString == 'data.get("key")'
@@ -356,6 +356,38 @@ def test_ignores_access_inside_loop():
     assert len(smells) == 0
 
 
+def test_ignores_access_in_nested_function_inside_loop():
+    """Ensures that reading the concatenation variable from a nested lambda is NOT flagged."""
+    code = """
+    def test(callbacks):
+        result = ""
+        for i in range(5):
+            callbacks.append(lambda: result)
+            result += str(i)
+    """
+    with patch.object(Path, "read_text", return_value=code):
+        smells = detect_string_concat_in_loop(Path("fake.py"), parse(code))
+
+    assert len(smells) == 0
+
+
+def test_detects_concat_when_name_is_part_of_other_identifiers():
+    """Detects concatenation even when other names in the loop contain the target's name."""
+    code = """
+    def test(rows):
+        out = ""
+        outputs = []
+        for row in rows:
+            outputs.append(row)
+            out += str(row)
+    """
+    with patch.object(Path, "read_text", return_value=code):
+        smells = detect_string_concat_in_loop(Path("fake.py"), parse(code))
+
+    assert len(smells) == 1
+    assert smells[0].additionalInfo.concatTarget == "out"
+
+
 def test_ignores_regular_str_assign_inside_loop():
     """Ensures that regular string assignments are NOT flagged."""
     code = """
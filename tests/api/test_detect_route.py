@@ -4,7 +4,9 @@ from unittest.mock import patch
 from ecooptimizer.api.app import app
 from ecooptimizer.api.error_handler import AppError
 from ecooptimizer.data_types import Smell
+from ecooptimizer.data_types.project_analysis import ProjectAnalysis
 from ecooptimizer.data_types.custom_fields import Occurence
+from ecooptimizer.measurements.profiling import EnergyProfile, FunctionEnergy
 
 client = TestClient(app)
 
@@ -85,3 +87,97 @@ def test_detect_smells_internal_server_error():
 
             assert response.status_code == 500
             assert response.json()["detail"] == "Internal error"
+
+
+def test_detect_project_smells_success(tmp_path):
+    request_data = {
+        "root_path": str(tmp_path),
+        "enabled_smells": {"smell1": {"threshold": 3}},
+        "jobs": 2,
+    }
+    analysis = ProjectAnalysis.from_results(
+        str(tmp_path), {"a.py": [get_mock_smell()], "b.py": [get_mock_smell()]}, {}
+    )
+
+    with patch(
+        "ecooptimizer.analyzers.analyzer_controller.AnalyzerController.run_analysis_project"
+    ) as mock_run_analysis_project:
+        mock_run_analysis_project.return_value = analysis
+
+        response = client.post("/smells/project", json=request_data)
+
+        assert response.status_code == 200
+        assert response.json()["total_smells"] == 2
+        assert response.json()["smell_counts"] == {"smell-symbol": 2}
+        mock_run_analysis_project.assert_called_once_with(
+            tmp_path, request_data["enabled_smells"], 2
+        )
+
+
+def test_detect_project_smells_folder_not_found():
+    request_data = {
+        "root_path": "path/to/nonexistent/project",
+        "enabled_smells": {"smell1": {"threshold": 3}},
+    }
+
+    response = client.post("/smells/project", json=request_data)
+
+    assert response.status_code == 404
+    assert "Folder not found" in response.json()["detail"]
+
+
+def test_detect_smells_cache_hit_skips_analysis(tmp_path, mocker):
+    source_file = tmp_path / "cached.py"
+    source_file.write_text("x = 1\n")
+    mocker.patch(
+        "ecooptimizer.utils.smell_cache.CONFIG",
+        {"loggingManager": mocker.Mock(logs_dir=tmp_path)},
+    )
+    request_data = {
+        "file_path": str(source_file),
+        "enabled_smells": {"long-element-chain": {"threshold": 3}},
+    }
+
+    with patch(
+        "ecooptimizer.analyzers.analyzer_controller.AnalyzerController.run_analysis"
+    ) as mock_run_analysis:
+        mock_run_analysis.return_value = [get_mock_smell()]
+
+        first = client.post("/smells", json=request_data)
+        second = client.post("/smells", json=request_data)
+
+        assert first.json() == second.json()
+        mock_run_analysis.assert_called_once()
+
+        response = client.delete("/smells/cache", params={"file_path": str(source_file)})
+        assert response.json() == {"removed": 1}
+
+        client.post("/smells", json=request_data)
+        assert mock_run_analysis.call_count == 2
+
+
+def test_detect_smells_with_profile_sets_hotness(tmp_path):
+    source_file = tmp_path / "hot.py"
+    source_file.write_text("x = 1\n" * 10)
+    smell = get_mock_smell().model_copy(update={"path": str(source_file)})
+    profile = EnergyProfile([FunctionEnergy(source_file.resolve(), 1, "<module>", 1.0, 0.4, None)])
+    request_data = {
+        "file_path": str(source_file),
+        "enabled_smells": {"smell1": {"threshold": 3}},
+        "profile": True,
+    }
+
+    with (
+        patch(
+            "ecooptimizer.analyzers.analyzer_controller.AnalyzerController.run_analysis",
+            return_value=[smell],
+        ),
+        patch(
+            "ecooptimizer.api.routes.detect_smells.profile_energy", return_value=profile
+        ) as mock_profile,
+    ):
+        response = client.post("/smells", json=request_data)
+
+    assert response.status_code == 200
+    assert response.json()[0]["hotness"] == 0.4
+    assert mock_profile.call_args.args[2] == tmp_path
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+import shutil
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from ecooptimizer.api.app import app
+
+client = TestClient(app)
+
+
+def test_candidates_are_streamed_one_result_per_line(project, make_use_a_generator_smell):
+    target = project / "checks.py"
+    original = target.read_text()
+    request = {
+        "sourceDir": str(project),
+        "smells": [make_use_a_generator_smell(target, line).model_dump() for line in (2, 6)],
+        "jobs": 1,
+    }
+    # Baseline of the file, then each candidate
+    with patch(
+        "ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, 6.0, 12.0]
+    ) as mock_measure:
+        response = client.post("/refactor-candidates", json=request)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["smell"]["occurences"][0]["line"] for line in lines] == [2, 6]
+    assert lines[0]["result"]["energySaved"] == 4.0
+    assert lines[1]["result"] is None
+    assert lines[1]["error"] == "Energy was not saved after refactoring."
+    assert mock_measure.call_count == 3
+    assert "all(num >= 0" in Path(lines[0]["result"]["targetFile"]["refactored"]).read_text()
+    assert target.read_text() == original
+    shutil.rmtree(lines[0]["result"]["tempDir"])
+
+
+def test_candidate_smells_must_be_in_the_project(project, make_use_a_generator_smell, tmp_path):
+    outside = tmp_path / "outside.py"
+    outside.write_text((project / "checks.py").read_text())
+    request = {
+        "sourceDir": str(project),
+        "smells": [make_use_a_generator_smell(outside, 2).model_dump()],
+    }
+
+    response = client.post("/refactor-candidates", json=request)
+
+    assert response.status_code == 400
@@ -11,6 +11,7 @@ from ecooptimizer.api.app import app
 from ecooptimizer.api.error_handler import AppError
 from ecooptimizer.api.routes.refactor_smell import perform_refactoring
 from ecooptimizer.analyzers.analyzer_controller import AnalyzerController
+from ecooptimizer.config import CONFIG
 from ecooptimizer.data_types.custom_fields import Occurence
 from ecooptimizer.data_types.smell import Smell
 from ecooptimizer.refactorers.refactorer_controller import RefactorerController
@@ -72,7 +73,7 @@ def mock_refactor_success():
     with (
         patch.object(Path, "is_dir", return_value=True),
         patch.object(Path, "exists", return_value=True),
-        patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[10.0, 5.0]),
+        patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, 5.0]),
         patch.object(
             RefactorerController,
             "run_refactorer",
@@ -117,7 +118,7 @@ def test_refactor_source_dir_not_found(mock_dependencies):
     assert "Folder not found" in response.json()["detail"]
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[10.0, 15.0])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, 15.0])
 def test_refactor_energy_not_saved(mock_measure, mock_dependencies, mock_refactor_success):
     """Test the /refactor route when no energy is saved after refactoring."""
     request_data = {
@@ -131,7 +132,7 @@ def test_refactor_energy_not_saved(mock_measure, mock_dependencies, mock_refacto
     assert "Energy was not saved" in response.json()["detail"]
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", return_value=None)
+@patch("ecooptimizer.measurements.emissions.measure_energy", return_value=None)
 def test_refactor_initial_energy_not_retrieved(mock_measure, mock_dependencies):
     """Test the /refactor route when no energy is saved after refactoring."""
     Path.is_dir.return_value = True  # type: ignore
@@ -148,7 +149,7 @@ def test_refactor_initial_energy_not_retrieved(mock_measure, mock_dependencies):
     assert "Could not retrieve emissions" in response.json()["detail"]
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[10.0, None])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, None])
 def test_refactor_final_energy_not_retrieved(mock_measure, mock_dependencies):
     """Test the /refactor route when no energy is saved after refactoring."""
     Path.is_dir.return_value = True  # type: ignore
@@ -164,7 +165,7 @@ def test_refactor_final_energy_not_retrieved(mock_measure, mock_dependencies):
     assert "Could not retrieve emissions" in response.json()["detail"]
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", return_value=10.0)
+@patch("ecooptimizer.measurements.emissions.measure_energy", return_value=10.0)
 def test_refactor_unexpected_error(mock_measure, mock_dependencies):
     """Test the /refactor route when an unexpected error occurs during refactoring."""
     Path.is_dir.return_value = True  # type: ignore
@@ -195,11 +196,12 @@ def test_refactor_success(mock_dependencies, mock_refactor_success):
         "tempDir",
         "targetFile",
         "energySaved",
+        "energySavings",
         "affectedFiles",
     }
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[15, 10, 8])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[15, 10, 8])
 @patch.object(AnalyzerController, "run_analysis")
 def test_refactor_by_type_success(
     mock_run_analysis, mock_measure, mock_dependencies, mock_refactor_success
@@ -219,12 +221,13 @@ def test_refactor_by_type_success(
         "tempDir",
         "targetFile",
         "energySaved",
+        "energySavings",
         "affectedFiles",
     }
     assert response.json()["energySaved"] == 7
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[15, 10, 8, 6])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[15, 10, 8, 6])
 @patch.object(AnalyzerController, "run_analysis")
 def test_refactor_by_type_multiple_smells(
     mock_run_analysis, mock_measure, mock_dependencies, mock_refactor_success
@@ -243,7 +246,61 @@ def test_refactor_by_type_multiple_smells(
     assert response.json()["energySaved"] == 9.0
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", return_value=None)
+@patch.dict(CONFIG, {"measurementRepetitions": 5, "mode": "development"})
+@patch(
+    "ecooptimizer.api.routes.refactor_smell.measure_interleaved",
+    return_value=([15.0] * 5, [10.0] * 5),
+)
+@patch("ecooptimizer.api.routes.refactor_smell.measure_samples")
+def test_refactor_measures_repeated_baseline_only_interleaved(
+    mock_samples, mock_interleaved, mock_dependencies, mock_refactor_success
+):
+    """Test /refactor does not measure a baseline the interleaved measurement replaces."""
+    request_data = {
+        "sourceDir": SAMPLE_SOURCE_DIR,
+        "smell": SAMPLE_SMELL,
+    }
+
+    response = client.post("/refactor", json=request_data)
+
+    assert response.status_code == 200
+    assert response.json()["energySaved"] == 5.0
+    mock_samples.assert_not_called()
+    mock_interleaved.assert_called_once()
+
+
+@patch.dict(CONFIG, {"measurementRepetitions": 5, "mode": "development"})
+@patch(
+    "ecooptimizer.api.routes.refactor_smell.measure_interleaved",
+    side_effect=[([15.0] * 5, [10.0] * 5), ([16.0] * 5, [12.0] * 5)],
+)
+@patch(
+    "ecooptimizer.api.routes.refactor_smell.measure_samples",
+    side_effect=[[8.0] * 5, [7.0] * 5],
+)
+@patch.object(AnalyzerController, "run_analysis")
+def test_refactor_by_type_reports_overall_savings(
+    mock_run_analysis, mock_samples, mock_interleaved, mock_dependencies, mock_refactor_success
+):
+    """Test /refactor-by-type reports the savings of the original against the final code."""
+    mock_run_analysis.side_effect = [[SAMPLE_SMELL_MODEL], [SAMPLE_SMELL_MODEL], []]
+    request_data = {
+        "sourceDir": SAMPLE_SOURCE_DIR,
+        "smellType": "type",
+        "firstSmell": SAMPLE_SMELL,
+    }
+
+    response = client.post("/refactor-by-type", json=request_data)
+
+    assert response.status_code == 200
+    # The steps saved 5, 2 and 1, but the final interleaved measurement shows a saving of 4
+    assert response.json()["energySaved"] == 4.0
+    assert response.json()["energySavings"]["median"] == 4.0
+    # The original code is only measured interleaved, never on its own
+    assert all(call.args[1] != Path(SAMPLE_SOURCE_DIR) for call in mock_samples.call_args_list)
+
+
+@patch("ecooptimizer.measurements.emissions.measure_energy", return_value=None)
 def test_refactor_by_type_initial_energy_failure(
     mock_measure, mock_dependencies, mock_refactor_success
 ):
@@ -300,7 +357,7 @@ def test_refactor_by_type_refactoring_error(
     assert "Refactoring failed" in response.json()["detail"]
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[10.0, 15.0])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, 15.0])
 def test_refactor_by_type_no_energy_saved(mock_measure, mock_dependencies, mock_refactor_success):
     """Test /refactor-by-type when no energy is saved."""
     request_data = {
@@ -315,7 +372,7 @@ def test_refactor_by_type_no_energy_saved(mock_measure, mock_dependencies, mock_
     assert "Energy was not saved" in response.json()["detail"]
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[5.0])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[5.0])
 @patch.object(RefactorerController, "run_refactorer", return_value=[Path("modified_file.py")])
 @patch("shutil.copytree")
 @patch("ecooptimizer.api.routes.refactor_smell.mkdtemp", return_value="/fake/temp/dir")
@@ -325,7 +382,7 @@ def test_perform_refactoring_success(
     """Test the perform_refactoring helper function."""
     source_dir = Path(SAMPLE_SOURCE_DIR)
     smell = SAMPLE_SMELL_MODEL
-    result = perform_refactoring(source_dir, smell, 10.0)
+    result = perform_refactoring(source_dir, smell, [10.0])
 
     assert result.energySaved == 5.0
     mock_mkdtemp.assert_called_once_with(prefix="ecooptimizer-")
@@ -333,7 +390,7 @@ def test_perform_refactoring_success(
     assert len(result.affectedFiles) == 1
 
 
-@patch("ecooptimizer.api.routes.refactor_smell.measure_energy", side_effect=[5])
+@patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[5])
 @patch.object(RefactorerController, "run_refactorer", return_value=[Path("modified_file.py")])
 @patch.object(shutil, "copytree")
 def test_perform_refactoring_with_existing_temp_dir(
@@ -343,7 +400,7 @@ def test_perform_refactoring_with_existing_temp_dir(
     source_dir = Path(SAMPLE_SOURCE_DIR)
     smell = SAMPLE_SMELL_MODEL
     existing_dir = Path("/existing/temp/dir")
-    result = perform_refactoring(source_dir, smell, 10.0, existing_dir)
+    result = perform_refactoring(source_dir, smell, [10.0], existing_dir)
 
     assert result.energySaved == 5.0
     assert result.tempDir == str(Path("/existing/temp/dir"))
@@ -0,0 +1,72 @@
+from pathlib import Path
+import shutil
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import pytest
+
+from ecooptimizer.api.app import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def session_request(project, make_use_a_generator_smell) -> dict:
+    target = project / "checks.py"
+    return {
+        "sourceDir": str(project),
+        "smells": [make_use_a_generator_smell(target, line).model_dump() for line in (2, 6, 10)],
+        "bisect": True,
+    }
+
+
+def test_session_measures_a_saving_batch_once(project, session_request):
+    original = (project / "checks.py").read_text()
+    with patch(
+        "ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, 6.0]
+    ) as mock_measure:
+        response = client.post("/refactor-session", json=session_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["accepted"]) == 3
+    assert data["measurements"] == 1
+    assert data["energySaved"] == 4.0
+    assert mock_measure.call_count == 2
+    assert "[" not in Path(data["targetFile"]["refactored"]).read_text()
+    assert (project / "checks.py").read_text() == original
+    shutil.rmtree(data["tempDir"])
+
+
+def test_session_bisects_a_batch_to_find_the_culprit(session_request):
+    # Whole batch, first smell, last two smells, second smell, third smell
+    emissions = [10.0, 12.0, 8.0, 9.0, 7.0, 7.5]
+    with patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=emissions):
+        response = client.post("/refactor-session", json=session_request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [smell["occurences"][0]["line"] for smell in data["accepted"]] == [2, 6]
+    assert [smell["occurences"][0]["line"] for smell in data["rejected"]] == [10]
+    assert data["measurements"] == 5
+    assert data["energySaved"] == 3.0
+    refactored = Path(data["targetFile"]["refactored"]).read_text()
+    assert "all([num < 10 for num in numbers])" in refactored
+    shutil.rmtree(data["tempDir"])
+
+
+def test_session_without_bisect_rejects_the_batch(session_request):
+    session_request["bisect"] = False
+    with patch("ecooptimizer.measurements.emissions.measure_energy", side_effect=[10.0, 12.0]):
+        response = client.post("/refactor-session", json=session_request)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Energy was not saved after refactoring."
+
+
+def test_session_smells_must_share_a_file(project, session_request):
+    session_request["smells"][1]["path"] = str(project / "other.py")
+
+    response = client.post("/refactor-session", json=session_request)
+
+    assert response.status_code == 400
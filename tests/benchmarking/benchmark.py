@@ -4,9 +4,11 @@
 """
 Benchmarking script for ecooptimizer.
 This script benchmarks:
-    1) Detection/analyzer runtime (via AnalyzerController.run_analysis)
+    1) Detection/analyzer runtime (via AnalyzerController.run_analysis), including a
+       comparison of the pylint and native backends for Pylint's smells
     2) Refactoring runtime (via RefactorerController.run_refactorer)
-    3) Energy measurement time (via CodeCarbonEnergyMeter.measure_energy)
+    3) Energy measurement time and energy of the original and refactored code, measured in
+       interleaved order (via MeasurementScheduler.run)
 
 For each detected smell (grouped by smell type), refactoring is run multiple times to compute average times.
 Usage: python benchmark.py <source_file_path>
@@ -30,6 +32,9 @@ from tempfile import TemporaryDirectory
 from ecooptimizer.analyzers.analyzer_controller import AnalyzerController
 from ecooptimizer.refactorers.refactorer_controller import RefactorerController
 from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+from ecooptimizer.measurements.measurement_scheduler import MeasurementScheduler, Variant
+from ecooptimizer.config import CONFIG
+from ecooptimizer.utils.smells_registry import ANALYSIS_BACKENDS
 
 TEST_DIR = Path(__file__).parent.resolve()
 OUTPUT_DIR = TEST_DIR / "output"
@@ -87,20 +92,55 @@ def benchmark_detection(source_path: str, iterations: int = 10):
     return smells_data, avg_detection
 
 
+def benchmark_analysis_backends(source_path: str, iterations: int = 10):
+    """
+    Compares detection latency of the pylint and native analysis backends.
+    Runs analyzer_controller.run_analysis on the smells Pylint can detect with each backend
+    and returns the average detection time per backend.
+    The first run of each backend is reported separately, as it includes start-up costs.
+    """
+    pylint_smells = ["use-a-generator", "too-many-arguments", "no-self-use"]
+    backend_stats = {}
+    original_backend = CONFIG["analysisBackend"]
+    try:
+        for backend in ANALYSIS_BACKENDS:
+            CONFIG["analysisBackend"] = backend
+            analyzer_controller = AnalyzerController()
+            times = []
+            for _ in range(iterations + 1):
+                start = time.perf_counter()
+                analyzer_controller.run_analysis(Path(source_path), pylint_smells)
+                times.append(time.perf_counter() - start)
+            backend_stats[backend] = {
+                "first_run_time": times[0],
+                "average_time": statistics.mean(times[1:]),
+            }
+            logger.info(
+                f"Backend '{backend}': first run {times[0]:.6f} sec, "
+                f"average {backend_stats[backend]['average_time']:.6f} sec"
+            )
+    finally:
+        CONFIG["analysisBackend"] = original_backend
+    return backend_stats
+
+
 def benchmark_refactoring(smells_data, source_path: str, iterations: int = 10):
     """
     Benchmarks the refactoring phase for each smell type.
     For each smell in smells_data, runs refactoring (using refactorer_controller.run_refactorer)
-    repeatedly on a temporary copy of the source file. Also measures energy measurement time
-    (via energy_meter.measure_energy) after refactoring.
-    Returns two dictionaries:
+    repeatedly on a temporary copy of the source file. After refactoring, the original and
+    refactored files are measured in interleaved ABBA order (via MeasurementScheduler.run),
+    so that drift in machine state affects both alike.
+    Returns three dictionaries:
         - refactoring_stats: average refactoring time per smell type
         - energy_stats: average energy measurement time per smell type
+        - emissions_stats: median emissions of the original and refactored code per smell type
     """
     refactorer_controller = RefactorerController()
-    energy_meter = CodeCarbonEnergyMeter()
+    scheduler = MeasurementScheduler(CodeCarbonEnergyMeter(), rounds=2, warmups=0)
     refactoring_stats = {}  # smell_type -> average refactoring time
     energy_stats = {}  # smell_type -> average energy measurement time
+    emissions_stats = {}  # smell_type -> median emissions per variant
 
     # Group smells by type. (Assuming each smell has a 'messageId' attribute.)
     grouped_smells = {}
@@ -114,6 +154,7 @@ def benchmark_refactoring(smells_data, source_path: str, iterations: int = 10):
     for smell_type, smell_list in grouped_smells.items():
         ref_times = []
         eng_times = []
+        emissions = {"original": [], "refactored": []}
         logger.info(f"Benchmarking refactoring for smell type: {smell_type}")
         for smell in smell_list:
             for i in range(iterations):
@@ -138,12 +179,17 @@ def benchmark_refactoring(smells_data, source_path: str, iterations: int = 10):
                         f"Refactoring iteration {i+1}/{iterations} for smell type '{smell_type}' took {ref_time:.6f} seconds"
                     )
 
-                    # Measure energy measurement time immediately after refactoring.
+                    # Measure the original and refactored code, interleaving their runs.
                     start_eng = time.perf_counter()
-                    energy_meter.measure_energy(temp_source)
+                    samples = scheduler.run(
+                        [Variant("original", Path(source_path)), Variant("refactored", temp_source)]
+                    )
                     end_eng = time.perf_counter()
-                    eng_time = end_eng - start_eng
+                    runs = sum(len(variant_samples) for variant_samples in samples.values())
+                    eng_time = (end_eng - start_eng) / max(runs, 1)
                     eng_times.append(eng_time)
+                    for variant, variant_samples in samples.items():
+                        emissions[variant].extend(variant_samples)
                     logger.info(
                         f"Energy measurement iteration {i+1}/{iterations} for smell type '{smell_type}' took {eng_time:.6f} seconds"
                     )
@@ -153,11 +199,16 @@ def benchmark_refactoring(smells_data, source_path: str, iterations: int = 10):
         avg_eng_time = statistics.mean(eng_times) if eng_times else None
         refactoring_stats[smell_type] = avg_ref_time
         energy_stats[smell_type] = avg_eng_time
+        emissions_stats[smell_type] = {
+            variant: statistics.median(variant_samples) if variant_samples else None
+            for variant, variant_samples in emissions.items()
+        }
         logger.info(f"Smell Type: {smell_type} - Average Refactoring Time: {avg_ref_time:.6f} sec")
         logger.info(
             f"Smell Type: {smell_type} - Average Energy Measurement Time: {avg_eng_time:.6f} sec"
         )
-    return refactoring_stats, energy_stats
+        logger.info(f"Smell Type: {smell_type} - Median Emissions: {emissions_stats[smell_type]}")
+    return refactoring_stats, energy_stats, emissions_stats
 
 
 def main():
@@ -174,17 +225,22 @@ def main():
 
     logger.info(f"Starting benchmark on source file: {source_file_path!s}")
 
+    # Compare the detection latency of each analysis backend.
+    backend_stats = benchmark_analysis_backends(str(source_file_path))
+
     # Benchmark the detection phase.
     smells_data, avg_detection = benchmark_detection(str(source_file_path))
 
     # Benchmark the refactoring phase per smell type.
-    ref_stats, eng_stats = benchmark_refactoring(smells_data, str(source_file_path))
+    ref_stats, eng_stats, emissions_stats = benchmark_refactoring(smells_data, str(source_file_path))
 
     # Compile overall benchmark results.
     overall_stats = {
         "detection_average_time": avg_detection,
+        "analysis_backend_times": backend_stats,
         "refactoring_times": ref_stats,
         "energy_measurement_times": eng_stats,
+        "emissions": emissions_stats,
     }
     logger.info("Overall Benchmark Results:")
     logger.info(json.dumps(overall_stats, indent=4))
@@ -1,6 +1,26 @@
+from collections.abc import Callable
 from pathlib import Path
+import textwrap
+from typing import Optional
+
 import pytest
 
+from ecooptimizer.data_types import Occurence, UGESmell
+from ecooptimizer.utils.smell_enums import PylintSmell
+
+USE_A_GENERATOR_SOURCE = textwrap.dedent("""\
+    def all_non_negative(numbers):
+        return all([num >= 0 for num in numbers])
+
+
+    def any_negative(numbers):
+        return any([num < 0 for num in numbers])
+
+
+    def all_small(numbers):
+        return all([num < 10 for num in numbers])
+    """)
+
 
 # ===== FIXTURES ======================
 @pytest.fixture(scope="session")
@@ -11,3 +31,33 @@ def output_dir(tmp_path_factory) -> Path:
 @pytest.fixture(scope="session")
 def source_files(tmp_path_factory) -> Path:
     return tmp_path_factory.mktemp("input")
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    """Project whose `checks.py` has use-a-generator smells on lines 2, 6 and 10."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "checks.py").write_text(USE_A_GENERATOR_SOURCE)
+    return project
+
+
+@pytest.fixture
+def make_use_a_generator_smell() -> Callable[..., UGESmell]:
+    """Factory of use-a-generator smells detected in a file."""
+
+    def make(path: Path, line: int, end_line: Optional[int] = None) -> UGESmell:
+        return UGESmell(
+            path=str(path),
+            module=path.stem,
+            obj=None,
+            type="performance",
+            symbol="use-a-generator",
+            message="Consider using a generator expression instead of a list comprehension.",
+            messageId=PylintSmell.USE_A_GENERATOR.value,
+            confidence="INFERENCE",
+            occurences=[Occurence(line=line, endLine=end_line or line, column=999, endColumn=999)],
+            additionalInfo=None,
+        )
+
+    return make
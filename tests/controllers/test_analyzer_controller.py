@@ -11,6 +11,7 @@ from ecooptimizer.data_types.smell import Smell, CRCSmell
 from ecooptimizer.data_types.smell_record import SmellRecord
 from ecooptimizer.refactorers.concrete.repeated_calls import CacheRepeatedCallsRefactorer
 from ecooptimizer.refactorers.base_refactorer import BaseRefactorer
+from ecooptimizer.utils.edit_ranges import EditRange, compute_edit_ranges
 from ecooptimizer.utils.smell_enums import CustomSmell
 
 
@@ -245,3 +246,166 @@ def test_generate_pylint_options():
     assert "--disable=all" in options
     assert "--enable=use-a-generator,too-many-arguments" in options
     assert any(opt.startswith("--max-args=") for opt in options)
+
+
+@pytest.fixture
+def sample_project(tmp_path):
+    """Creates a small project with one smelly file and an ignored directory."""
+    repeated = textwrap.dedent("""\
+        def test_case():
+            result1 = expensive_function(42)
+            result2 = expensive_function(42)
+        """)
+    (tmp_path / "main.py").write_text(repeated)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "clean.py").write_text("x = 1\n")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "ignored.py").write_text(repeated)
+    return tmp_path
+
+
+def test_run_analysis_project_serial(sample_project):
+    """Ensures every non-ignored file is analyzed."""
+    controller = AnalyzerController()
+
+    analysis = controller.run_analysis_project(sample_project, ["cached-repeated-calls"], jobs=1)
+
+    assert list(analysis.files) == [
+        str(sample_project / "main.py"),
+        str(sample_project / "pkg" / "clean.py"),
+    ]
+    assert analysis.errors == {}
+    assert analysis.total_smells == 1
+    assert analysis.smell_counts == {"cached-repeated-calls": 1}
+    assert analysis.smells[0].path == str(sample_project / "main.py")
+
+
+def test_run_analysis_project_records_failures(sample_project, mocker):
+    """Ensures a failing file is reported without aborting the scan."""
+    controller = AnalyzerController()
+    mocker.patch.object(
+        controller,
+        "run_analysis",
+        side_effect=lambda file, _smells: [] if file.name == "main.py" else 1 / 0,
+    )
+
+    analysis = controller.run_analysis_project(sample_project, ["cached-repeated-calls"], jobs=1)
+
+    assert list(analysis.files) == [str(sample_project / "main.py")]
+    assert analysis.errors == {str(sample_project / "pkg" / "clean.py"): "division by zero"}
+
+
+def test_run_analysis_project_parallel_matches_serial(sample_project):
+    """Ensures the process pool returns the same results as an in-process scan."""
+    controller = AnalyzerController()
+
+    serial = controller.run_analysis_project(sample_project, ["cached-repeated-calls"], jobs=1)
+    parallel = controller.run_analysis_project(sample_project, ["cached-repeated-calls"], jobs=2)
+
+    assert parallel == serial
+
+
+def test_run_analysis_project_requires_smells(sample_project):
+    with pytest.raises(TypeError):
+        AnalyzerController().run_analysis_project(sample_project, [])
+
+
+INCREMENTAL_SOURCE = textwrap.dedent("""\
+    def first(data):
+        a = data.get("x")
+        b = data.get("x")
+        return a, b
+
+
+    def second(items):
+        return items[0][1][2][3]
+
+
+    class Third:
+        def run(self, obj):
+            return obj.value.strip().lower().split().pop()
+""")
+
+INCREMENTAL_ENABLED = ["cached-repeated-calls", "long-element-chain", "long-message-chain"]
+
+
+def _dumps(smells):
+    return sorted((s.model_dump() for s in smells), key=repr)
+
+
+def test_run_incremental_analysis_matches_full_analysis(tmp_path):
+    source_file = tmp_path / "incremental.py"
+    source_file.write_text(INCREMENTAL_SOURCE)
+    controller = AnalyzerController()
+    previous = controller.run_analysis(source_file, INCREMENTAL_ENABLED)
+
+    # Fix the repeated call, shortening the file by one line
+    new_source = INCREMENTAL_SOURCE.replace(
+        '    a = data.get("x")\n    b = data.get("x")\n    return a, b\n',
+        '    a = data.get("x")\n    return a, a\n',
+    )
+    source_file.write_text(new_source)
+
+    edit_ranges = compute_edit_ranges(INCREMENTAL_SOURCE, new_source)
+    with patch.object(controller, "run_analysis", wraps=controller.run_analysis) as full:
+        incremental = controller.run_incremental_analysis(
+            source_file, INCREMENTAL_ENABLED, previous, edit_ranges
+        )
+        full.assert_not_called()
+
+    expected = controller.run_analysis(source_file, INCREMENTAL_ENABLED)
+    assert _dumps(incremental) == _dumps(expected)
+    assert [s.symbol for s in incremental] == ["long-element-chain", "long-message-chain"]
+
+
+def test_run_incremental_analysis_reanalyzes_definition_losing_its_last_lines(tmp_path):
+    source = textwrap.dedent("""\
+        def a(o):
+            x = o.compute()
+            y = o.compute()
+            z = o.compute()
+
+
+        def b(items):
+            return items[0]
+    """)
+    source_file = tmp_path / "incremental.py"
+    source_file.write_text(source)
+    controller = AnalyzerController()
+    previous = controller.run_analysis(source_file, INCREMENTAL_ENABLED)
+
+    # Delete the last line of `a`
+    new_source = source.replace("    z = o.compute()\n", "")
+    source_file.write_text(new_source)
+    edit_ranges = compute_edit_ranges(source, new_source)
+    assert edit_ranges == [EditRange(4, 5, 4, 4)]
+
+    with patch.object(controller, "run_analysis", wraps=controller.run_analysis) as full:
+        incremental = controller.run_incremental_analysis(
+            source_file, INCREMENTAL_ENABLED, previous, edit_ranges
+        )
+        full.assert_not_called()
+
+    expected = controller.run_analysis(source_file, INCREMENTAL_ENABLED)
+    assert _dumps(incremental) == _dumps(expected)
+    assert [len(smell.occurences) for smell in incremental] == [2]
+
+
+def test_run_incremental_analysis_falls_back_for_module_level_edits(tmp_path):
+    source_file = tmp_path / "incremental.py"
+    source_file.write_text(INCREMENTAL_SOURCE)
+    controller = AnalyzerController()
+    previous = controller.run_analysis(source_file, INCREMENTAL_ENABLED)
+
+    new_source = "CONSTANT = 1\n" + INCREMENTAL_SOURCE
+    source_file.write_text(new_source)
+    edit_ranges = compute_edit_ranges(INCREMENTAL_SOURCE, new_source)
+
+    with patch.object(controller, "run_analysis", return_value=[]) as full:
+        assert (
+            controller.run_incremental_analysis(
+                source_file, INCREMENTAL_ENABLED, previous, edit_ranges
+            )
+            == []
+        )
+        full.assert_called_once_with(source_file, INCREMENTAL_ENABLED)
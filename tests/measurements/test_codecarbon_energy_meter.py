@@ -2,44 +2,34 @@ import math
 import pytest
 from unittest.mock import patch, MagicMock
 from pathlib import Path
-import pandas as pd
+import os
 import subprocess
+import sys
 
 from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+from ecooptimizer.measurements.script_runners import ResourceUsage, SubprocessRunner
 
 
 @pytest.fixture
 def mock_dependencies():
     """Fixture to mock all dependencies with proper subprocess mocking"""
     with (
-        patch("subprocess.run") as mock_subprocess,
-        patch("ecooptimizer.measurements.codecarbon_energy_meter.EmissionsTracker") as mock_tracker,
-        patch(
-            "ecooptimizer.measurements.codecarbon_energy_meter.TemporaryDirectory"
-        ) as mock_tempdir,
-        patch.object(Path, "exists") as mock_exists,
-        patch.object(CodeCarbonEnergyMeter, "_extract_emissions_data"),
+        patch("codecarbon.EmissionsTracker") as mock_tracker,
+        patch.object(SubprocessRunner, "run") as mock_subprocess,
     ):
-        # Setup default successful subprocess mock
-        process_mock = MagicMock()
-        process_mock.returncode = 0
-        mock_subprocess.return_value = process_mock
+        # Setup default successful run without resource usage
+        mock_subprocess.return_value = None
 
         # Setup tracker mock
         tracker_instance = MagicMock()
         mock_tracker.return_value = tracker_instance
 
-        # Setup tempdir mock
-        mock_tempdir.return_value.__enter__.return_value = "/fake/temp/dir"
-
-        mock_exists.return_value = True
+        tracker_instance.final_emissions_data.values = {"emissions": 1.23, "duration": 0.5}
 
         yield {
             "subprocess": mock_subprocess,
             "tracker": mock_tracker,
             "tracker_instance": tracker_instance,
-            "tempdir": mock_tempdir,
-            "exists": mock_exists,
         }
 
 
@@ -109,35 +99,63 @@ class TestCodeCarbonEnergyMeter:
         assert "Error executing file" in caplog.text
         assert meter.emissions == 1.23
 
-    def test_extract_emissions_data_success(self, meter, tmp_path):
-        """Test successful extraction of emissions data."""
-        test_data = [
-            {"timestamp": "2023-01-01", "emissions": 1.0},
-            {"timestamp": "2023-01-02", "emissions": 2.0},
-        ]
-        df = pd.DataFrame(test_data)
-        csv_path = tmp_path / "emissions.csv"
-        df.to_csv(csv_path, index=False)
-
-        result = meter._extract_emissions_data(csv_path)
-        assert result == test_data[-1]
-
-    def test_extract_emissions_data_failure(self, meter, tmp_path, caplog):
-        """Test failure to extract emissions data."""
-        csv_path = tmp_path / "nonexistent.csv"
-        result = meter._extract_emissions_data(csv_path)
-
-        assert result is None
-        assert "Failed to read emissions data" in caplog.text
-
-    def test_measure_energy_missing_emissions_file(self, meter, mock_dependencies, caplog):
-        """Test handling when emissions file is missing."""
+    def test_measure_energy_reads_tracker_record(self, meter, mock_dependencies):
+        """Test that the emissions record is read from the tracker, without output files."""
+        mock_dependencies["tracker_instance"].stop.return_value = 1.23
+
+        meter.measure_energy(Path("test.py"))
+
+        assert meter.emissions_data == {"emissions": 1.23, "duration": 0.5}
+        assert mock_dependencies["tracker"].call_args.kwargs["output_methods"] == []
+
+    def test_measure_energy_records_resource_usage(self, meter, mock_dependencies):
+        """Test that the resources used by the run are stored with the emissions."""
         mock_dependencies["tracker_instance"].stop.return_value = 1.23
-        mock_dependencies["exists"].return_value = False
+        mock_dependencies["subprocess"].return_value = ResourceUsage(0.5, 0.1, 2048, 3, 4, 5, 0)
+
+        meter.measure_energy(Path("test.py"))
+
+        assert meter.emissions_data["resource_usage"]["max_rss"] == 2048
+        assert meter.emissions_data["resource_usage"]["user_time"] == 0.5
+
+    def test_measure_energy_timeout(self, meter, mock_dependencies, caplog):
+        """Test that a run killed on timeout counts as a failed measurement."""
+        mock_dependencies["tracker_instance"].stop.return_value = 1.23
+        mock_dependencies["subprocess"].side_effect = subprocess.TimeoutExpired("test.py", 1.0)
+
+        meter.measure_energy(Path("test.py"))
+
+        assert "Error executing file" in caplog.text
+        assert len(meter.cache) == 0
+
+    def test_measure_energy_leaves_environment_unchanged(self, meter, mock_dependencies):
+        """Test that measuring does not redirect the process temporary directory."""
+        mock_dependencies["tracker_instance"].stop.return_value = 1.23
+
+        with patch.dict("os.environ", {"TMPDIR": "/original"}, clear=True):
+            meter.measure_energy(Path("test.py"))
+
+            assert dict(os.environ) == {"TMPDIR": "/original"}
+
+    def test_measure_energy_missing_emissions_data(self, meter, mock_dependencies, caplog):
+        """Test handling when the tracker produced no emissions record."""
+        mock_dependencies["tracker_instance"].stop.return_value = None
+        mock_dependencies["tracker_instance"].final_emissions_data = None
+
+        meter.measure_energy(Path("test.py"))
+
+        assert "Emissions data missing" in caplog.text
+        assert meter.emissions_data is None
+
 
-        with patch.object(Path, "exists", return_value=False):
-            test_file = Path("test.py")
-            meter.measure_energy(test_file)
+def test_codecarbon_is_imported_on_first_measurement():
+    """Test that importing the meter does not import CodeCarbon or pandas."""
+    code = (
+        "import sys; import ecooptimizer.measurements.codecarbon_energy_meter; "
+        "print('codecarbon' in sys.modules, 'pandas' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
 
-            assert "Emissions file missing" in caplog.text
-            assert meter.emissions_data is None
+    assert result.stdout.split() == ["False", "False"]
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.energy_meters import get_energy_meter, using_energy_meter
+from ecooptimizer.measurements.estimated_energy_meter import (
+    CALIBRATION_RUNS,
+    DEFAULT_CPU_JOULES_PER_SECOND,
+    EstimatedEnergyMeter,
+    host_key,
+    load_calibration,
+)
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.rapl_energy_meter import JOULES_PER_KWH
+from ecooptimizer.measurements.script_runners import ResourceUsage
+
+USAGE = ResourceUsage(
+    user_time=1.5,
+    system_time=0.5,
+    max_rss=0,
+    voluntary_context_switches=1,
+    involuntary_context_switches=2,
+    minor_page_faults=100,
+    major_page_faults=0,
+)
+
+
+class ReferenceMeter(BaseEnergyMeter):
+    """Reference drawing 20 W per CPU second."""
+
+    def __init__(self, usage: Optional[ResourceUsage] = USAGE):
+        super().__init__(MeasurementCache(ttl=0))
+        self.usage = usage
+        self.runs = 0
+
+    def _measure_once(self, file_path: Path) -> bool:  # noqa: ARG002
+        self.runs += 1
+        energy = 20 * (USAGE.user_time + USAGE.system_time) / JOULES_PER_KWH
+        self.emissions = energy
+        self.emissions_data = {"duration": 2.0, "energy_consumed": energy}
+        self._add_resource_usage(self.usage)
+        return True
+
+
+@pytest.fixture
+def runner():
+    runner = MagicMock()
+    runner.name = "mock"
+    runner.subtracts_overhead = False
+    runner.run.return_value = USAGE
+    return runner
+
+
+def test_estimates_energy_from_cpu_time(tmp_path, runner):
+    calibration_file = tmp_path / "calibration.json"
+    calibration_file.write_text(json.dumps({host_key(): {"cpuJoulesPerSecond": 10.0}}))
+    meter = EstimatedEnergyMeter(calibration_file, carbon_intensity=0.5, runner=runner)
+
+    meter.measure_energy(tmp_path / "main.py")
+
+    assert meter.emissions_data["cpu_energy"] == pytest.approx(20 / JOULES_PER_KWH)  # type: ignore
+    assert meter.emissions == pytest.approx(0.5 * 20 / JOULES_PER_KWH)
+    assert meter.emissions_data["resource_usage"]["user_time"] == 1.5  # type: ignore
+
+
+def test_calibration_is_derived_once_and_stored(tmp_path, runner):
+    calibration_file = tmp_path / "cache" / "calibration.json"
+    reference = ReferenceMeter()
+
+    meter = EstimatedEnergyMeter(calibration_file, reference=reference, runner=runner)
+    assert meter.cpu_joules_per_second == pytest.approx(20.0)
+    assert reference.runs == CALIBRATION_RUNS
+    assert load_calibration(calibration_file, host_key()) == pytest.approx(20.0)
+
+    other = EstimatedEnergyMeter(calibration_file, reference=reference, runner=runner)
+    assert other.cpu_joules_per_second == pytest.approx(20.0)
+    assert reference.runs == CALIBRATION_RUNS
+
+
+def test_failed_calibration_uses_default_without_storing(tmp_path, runner):
+    calibration_file = tmp_path / "calibration.json"
+    meter = EstimatedEnergyMeter(calibration_file, reference=ReferenceMeter(None), runner=runner)
+
+    assert meter.cpu_joules_per_second == DEFAULT_CPU_JOULES_PER_SECOND
+    assert not calibration_file.exists()
+
+
+def test_meter_is_selected_per_request():
+    with using_energy_meter("estimated"):
+        assert isinstance(get_energy_meter(), EstimatedEnergyMeter)
+    assert not isinstance(get_energy_meter(), EstimatedEnergyMeter)
@@ -0,0 +1,103 @@
+from pathlib import Path
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from ecooptimizer.measurements.codecarbon_energy_meter import CodeCarbonEnergyMeter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.script_runners import SubprocessRunner
+
+SETTINGS = {"meter": "test"}
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    (project / "main.py").write_text("from pkg.util import work\nwork()\n")
+    (project / "pkg" / "util.py").write_text("def work():\n    return sum(range(10))\n")
+    return project
+
+
+def test_key_is_shared_by_identical_copies(project, tmp_path):
+    copy = tmp_path / "copy" / "project"
+    shutil.copytree(project, copy)
+    cache = MeasurementCache(ttl=60)
+
+    assert cache.make_key(project / "main.py", project, SETTINGS) == cache.make_key(
+        copy / "main.py", copy, SETTINGS
+    )
+
+
+def test_key_changes_with_project_files_and_settings(project):
+    cache = MeasurementCache(ttl=60)
+    key = cache.make_key(project / "main.py", project, SETTINGS)
+
+    assert cache.make_key(project / "main.py", project, {"meter": "other"}) != key
+
+    (project / "pkg" / "util.py").write_text("def work():\n    return 0\n")
+    assert cache.make_key(project / "main.py", project, SETTINGS) != key
+
+
+def test_file_hashes_of_removed_copies_are_forgotten(project, tmp_path):
+    cache = MeasurementCache(ttl=60, max_file_hashes=2)
+    key = cache.make_key(project / "main.py", project, SETTINGS)
+
+    for copy_number in range(3):
+        copy = tmp_path / f"copy-{copy_number}" / "project"
+        shutil.copytree(project, copy)
+        assert cache.make_key(copy / "main.py", copy, SETTINGS) == key
+        shutil.rmtree(copy)
+
+    assert len(cache._file_hashes) == 2
+
+
+def test_entries_expire_after_ttl():
+    cache = MeasurementCache(ttl=10)
+    with patch("ecooptimizer.measurements.measurement_cache.time.time", return_value=100.0):
+        cache.put("key", 1.5)
+
+    with patch("ecooptimizer.measurements.measurement_cache.time.time", return_value=105.0):
+        assert cache.get("key").emissions == 1.5  # type: ignore
+    with patch("ecooptimizer.measurements.measurement_cache.time.time", return_value=110.0):
+        assert cache.get("key") is None
+
+
+def test_entries_are_dropped_when_load_profile_changes():
+    with patch(
+        "ecooptimizer.measurements.measurement_cache.load_profile", return_value=(4, 0)
+    ) as load_profile:
+        cache = MeasurementCache(ttl=60)
+        cache.put("key", 1.5)
+        assert cache.get("key") is not None
+
+        load_profile.return_value = (4, 2)
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+
+def test_zero_ttl_disables_caching():
+    cache = MeasurementCache(ttl=0)
+    cache.put("key", 1.5)
+
+    assert cache.get("key") is None
+
+
+def test_meter_reuses_measurement_of_unchanged_project(project):
+    with (
+        patch("codecarbon.EmissionsTracker") as tracker,
+        patch.object(SubprocessRunner, "run", return_value=None) as run,
+    ):
+        tracker.return_value.stop.return_value = 2.5
+        meter = CodeCarbonEnergyMeter(MeasurementCache(ttl=60))
+
+        meter.measure_energy(project / "main.py", project)
+        meter.emissions = None
+        meter.measure_energy(project / "main.py", project)
+        assert meter.emissions == 2.5
+        assert run.call_count == 1
+
+        (project / "main.py").write_text("print('changed')\n")
+        meter.measure_energy(project / "main.py", project)
+        assert run.call_count == 2
@@ -0,0 +1,118 @@
+from pathlib import Path
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ecooptimizer.api.routes.refactor_smell import perform_refactoring
+from ecooptimizer.data_types.custom_fields import Occurence
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.measurement_scheduler import (
+    MeasurementScheduler,
+    Variant,
+    interleaved_order,
+)
+from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+
+ORIGINAL = Path("original.py")
+REFACTORED = Path("refactored.py")
+
+
+class FakeEnergyMeter(BaseEnergyMeter):
+    """Meter whose readings drift upwards with every run, like a warming machine."""
+
+    def __init__(self, emissions: dict[Path, float], fail: Path | None = None):
+        super().__init__()
+        self.base_emissions = emissions
+        self.fail = fail
+        self.measured: list[Path] = []
+
+    def _measure_once(self, file_path: Path) -> bool:
+        self.measured.append(file_path)
+        self.emissions = self.base_emissions[file_path] + 0.1 * len(self.measured)
+        return file_path != self.fail
+
+
+def test_rounds_form_mirrored_blocks():
+    order = interleaved_order(2, 4, random.Random(3))
+
+    assert len(order) == 8
+    assert order[:4] in ([0, 1, 1, 0], [1, 0, 0, 1])
+    assert order[4:] in ([0, 1, 1, 0], [1, 0, 0, 1])
+
+
+def test_every_variant_is_measured_once_per_round():
+    order = interleaved_order(3, 5, random.Random(0))
+
+    assert sorted(order) == [0] * 5 + [1] * 5 + [2] * 5
+    assert order[3:6] == order[:3][::-1]
+
+
+def test_block_order_is_randomized():
+    orders = {tuple(interleaved_order(2, 2, random.Random(seed))) for seed in range(20)}
+
+    assert orders == {(0, 1, 1, 0), (1, 0, 0, 1)}
+
+
+def test_interleaving_spreads_drift_over_variants():
+    meter = FakeEnergyMeter({ORIGINAL: 10.0, REFACTORED: 10.0})
+    scheduler = MeasurementScheduler(meter, rounds=4, warmups=2, seed=1)
+
+    samples = scheduler.run([Variant("original", ORIGINAL), Variant("refactored", REFACTORED)])
+
+    assert len(meter.measured) == 12
+    assert len(samples["original"]) == len(samples["refactored"]) == 4
+    # Identical programs get identical totals despite the drift
+    assert sum(samples["original"]) == pytest.approx(sum(samples["refactored"]))
+
+
+def test_failed_variant_stops_measuring():
+    meter = FakeEnergyMeter({ORIGINAL: 10.0, REFACTORED: 8.0}, fail=REFACTORED)
+    scheduler = MeasurementScheduler(meter, rounds=4, warmups=0, seed=0)
+
+    samples = scheduler.run([Variant("original", ORIGINAL), Variant("refactored", REFACTORED)])
+
+    assert samples["refactored"] == []
+    assert meter.measured[-1] == REFACTORED
+    assert len(meter.measured) <= 2
+
+
+def test_new_workspace_is_measured_interleaved_with_original():
+    source_dir = Path("source_dir").absolute()
+    smell = Smell(
+        confidence="UNKNOWN",
+        message="message",
+        messageId="smellID",
+        module="module",
+        obj="obj",
+        path=str(source_dir / "file.py"),
+        symbol="smell-symbol",
+        type="type",
+        occurences=[Occurence(line=1, endLine=1, column=0, endColumn=1)],
+    )
+    scheduler = MagicMock()
+    scheduler.return_value.run.return_value = {
+        "original": [10.0, 10.2, 10.1, 10.3],
+        "refactored": [8.0, 8.1, 8.2, 7.9],
+    }
+
+    with (
+        patch.dict("ecooptimizer.config.CONFIG", {"measurementRepetitions": 4}),
+        patch("ecooptimizer.measurements.emissions.MeasurementScheduler", scheduler),
+        patch("ecooptimizer.measurements.emissions.get_energy_meter"),
+        patch("ecooptimizer.api.routes.refactor_smell.mkdtemp", return_value="/fake/temp/dir"),
+        patch.object(RefactorerController, "run_refactorer", return_value=[]),
+        patch("shutil.copytree"),
+    ):
+        result = perform_refactoring(source_dir, smell)
+
+    variants = scheduler.return_value.run.call_args.args[0]
+    assert [variant.file_path for variant in variants] == [
+        source_dir / "file.py",
+        Path("/fake/temp/dir/source_dir/file.py"),
+    ]
+    assert result.energySavings.baseline.samples == 4  # type: ignore
+    assert result.energySavings.significant  # type: ignore
+    assert result.initialSamples == [10.0, 10.2, 10.1, 10.3]
+    assert result.finalSamples == [8.0, 8.1, 8.2, 7.9]
@@ -0,0 +1,179 @@
+import marshal
+from pathlib import Path
+import subprocess
+
+import pytest
+
+from ecooptimizer.data_types.custom_fields import Occurence
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.base_energy_meter import BaseEnergyMeter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.profiling import EnergyProfile, FunctionEnergy, profile_energy
+from ecooptimizer.measurements.script_runners import RunLimits, SubprocessRunner
+
+PROGRAM = """\
+import functools
+
+
+def hot():
+    total = 0
+    for i in range(2_000_000):
+        total += i * i
+    return total
+
+
+@functools.lru_cache
+def cold():
+    return 1
+
+
+def never():
+    return 0
+
+
+hot()
+cold()
+"""
+
+
+BUILTIN_PROGRAM = """\
+def sorts():
+    data = [i * 7919 % 100_003 for i in range(100_000)]
+    for _ in range(10):
+        sorted(data)
+
+
+def light():
+    return sorted([3, 1, 2])
+
+
+sorts()
+light()
+"""
+
+
+class FixedEnergyMeter(BaseEnergyMeter):
+    """Meter running files for real and reading 2.0 kg CO2 for each."""
+
+    def __init__(self):
+        super().__init__(MeasurementCache(ttl=0), SubprocessRunner(RunLimits()))
+
+    def _measure_once(self, file_path: Path) -> bool:
+        try:
+            self.runner.run(file_path)
+        except subprocess.SubprocessError:
+            self.emissions = None
+            return False
+        self.emissions = 2.0
+        self.emissions_data = {"emissions": self.emissions}
+        return True
+
+
+def make_smell(path: Path, *lines: int) -> Smell:
+    return Smell(
+        confidence="UNDEFINED",
+        message="smell",
+        messageId="smell",
+        module=path.stem,
+        obj=None,
+        path=str(path),
+        symbol="smell",
+        type="performance",
+        occurences=[Occurence(line=line, endLine=None, column=0, endColumn=None) for line in lines],
+    )
+
+
+@pytest.fixture
+def program(tmp_path) -> Path:
+    program = tmp_path / "program.py"
+    program.write_text(PROGRAM)
+    return program
+
+
+def test_energy_is_apportioned_to_functions_by_cpu_time(program):
+    profile = profile_energy(FixedEnergyMeter(), program, program.parent)
+
+    assert profile is not None
+    assert profile.emissions == 2.0
+    assert profile.functions[0].name == "hot"
+    assert profile.functions[0].share > 0.5
+    assert profile.functions[0].emissions == pytest.approx(2.0 * profile.functions[0].share)
+    assert sum(function.share for function in profile.functions) <= 1.0
+
+
+def test_smells_are_scored_by_their_functions(program):
+    profile = profile_energy(FixedEnergyMeter(), program, program.parent)
+    assert profile is not None
+
+    hot, cold, never, both = profile.annotate(
+        [
+            make_smell(program, 7),
+            make_smell(program, 13),
+            make_smell(program, 17),
+            make_smell(program, 6, 7, 20),
+        ]
+    )
+
+    assert hot.hotness == profile.functions[0].share
+    assert cold.hotness is not None
+    assert cold.hotness < 0.1
+    assert never.hotness == 0
+    assert both.hotness == pytest.approx(hot.hotness + profile.hotness(make_smell(program, 20)))
+
+
+def test_failed_run_has_no_profile(tmp_path):
+    program = tmp_path / "fails.py"
+    program.write_text("raise ValueError('failed')\n")
+
+    assert profile_energy(FixedEnergyMeter(), program) is None
+
+
+def test_decorated_functions_match_their_profile_entry(program):
+    cold = FunctionEnergy(program.resolve(), 11, "cold", 1.0, 0.25, None)
+    profile = EnergyProfile([cold])
+
+    assert profile.function_at(program, 13) == cold
+    assert profile.function_at(program, 5) is None
+
+
+def test_time_in_built_ins_is_charged_to_their_callers(tmp_path):
+    program = tmp_path / "program.py"
+    program.write_text(BUILTIN_PROGRAM)
+
+    profile = profile_energy(FixedEnergyMeter(), program, program.parent)
+
+    assert profile is not None
+    assert profile.functions[0].name == "sorts"
+    assert profile.functions[0].share > 0.5
+    # Only the profiler's own calls, which have no caller, are left out
+    assert 0.95 < sum(function.share for function in profile.functions) <= 1.0
+
+
+def test_built_in_time_is_split_between_callers_by_calls(tmp_path):
+    first = (str(tmp_path / "program.py"), 1, "first")
+    second = (str(tmp_path / "program.py"), 5, "second")
+    builtin = ("~", 0, "<built-in method builtins.sorted>")
+    stats_file = tmp_path / "profile.stats"
+    with stats_file.open("wb") as file:
+        marshal.dump(
+            {
+                first: (1, 1, 1.0, 4.0, {}),
+                second: (1, 1, 1.0, 3.0, {}),
+                builtin: (
+                    4,
+                    4,
+                    4.0,
+                    4.0,
+                    {first: (3, 3, 3.0, 3.0), second: (1, 1, 1.0, 1.0)},
+                ),
+            },
+            file,
+        )
+
+    profile = EnergyProfile.from_stats(stats_file, 6.0)
+
+    assert [(function.name, function.cpu_time) for function in profile.functions] == [
+        ("first", 4.0),
+        ("second", 2.0),
+    ]
+    assert profile.functions[0].emissions == pytest.approx(4.0)
@@ -0,0 +1,89 @@
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ecooptimizer.measurements.energy_meters import create_energy_meter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.rapl_energy_meter import (
+    JOULES_PER_KWH,
+    RaplEnergyMeter,
+    energy_delta,
+    find_rapl_zones,
+)
+from ecooptimizer.measurements.script_runners import SubprocessRunner
+
+MAX_ENERGY = 1_000_000
+
+
+def make_zone(root: Path, zone: str, name: str, energy: int) -> Path:
+    zone_dir = root / zone
+    zone_dir.mkdir(parents=True)
+    (zone_dir / "name").write_text(f"{name}\n")
+    (zone_dir / "energy_uj").write_text(f"{energy}\n")
+    (zone_dir / "max_energy_range_uj").write_text(f"{MAX_ENERGY}\n")
+    return zone_dir / "energy_uj"
+
+
+@pytest.fixture
+def sysfs(tmp_path) -> Path:
+    root = tmp_path / "powercap"
+    make_zone(root, "intel-rapl:0", "package-0", 100)
+    make_zone(root, "intel-rapl:1", "package-1", 999_900)
+    make_zone(root, "intel-rapl:0:0", "core", 50)
+    return root
+
+
+def test_only_package_zones_are_read(sysfs):
+    zones = find_rapl_zones(sysfs)
+
+    assert [zone.name for zone in zones] == ["package-0", "package-1"]
+    assert all(zone.max_energy == MAX_ENERGY for zone in zones)
+
+
+def test_unreadable_root_has_no_zones(tmp_path):
+    assert find_rapl_zones(tmp_path / "missing") == []
+
+
+def test_energy_delta_handles_wraparound():
+    assert energy_delta(100, 400, MAX_ENERGY) == 300
+    assert energy_delta(999_900, 200, MAX_ENERGY) == 301
+
+
+def test_measures_energy_of_every_package(sysfs, tmp_path):
+    def run_workload(*args, **kwargs):  # noqa: ARG001
+        (sysfs / "intel-rapl:0" / "energy_uj").write_text("900100\n")
+        # Wraps around: 100 uJ to the maximum, 1 uJ to zero, then 200 uJ
+        (sysfs / "intel-rapl:1" / "energy_uj").write_text("200\n")
+        return None
+
+    meter = RaplEnergyMeter(sysfs, carbon_intensity=0.5, cache=MeasurementCache(ttl=0))
+    with patch.object(SubprocessRunner, "run", side_effect=run_workload) as run:
+        meter.measure_energy(tmp_path / "script.py")
+
+    run.assert_called_once()
+    package_0 = 0.9 / JOULES_PER_KWH
+    package_1 = 301 / 1e6 / JOULES_PER_KWH
+    assert meter.emissions_data["zones"]["package-0"] == pytest.approx(package_0)  # type: ignore
+    assert meter.emissions_data["zones"]["package-1"] == pytest.approx(package_1)  # type: ignore
+    assert meter.emissions == pytest.approx((package_0 + package_1) * 0.5)
+
+
+def test_falls_back_without_powercap(tmp_path):
+    fallback = MagicMock()
+    fallback._measure_once.return_value = True
+    fallback.emissions = 1.25
+    fallback.settings = {"meter": "fallback"}
+
+    meter = RaplEnergyMeter(tmp_path / "missing", fallback=fallback)
+    meter.measure_energy(tmp_path / "script.py")
+
+    fallback._measure_once.assert_called_once_with(tmp_path / "script.py")
+    assert meter.emissions == 1.25
+    assert meter.settings == {"meter": "fallback"}
+
+
+def test_meters_are_selected_by_name():
+    assert isinstance(create_energy_meter("rapl"), RaplEnergyMeter)
+    with pytest.raises(ValueError, match="Unknown energy meter"):
+        create_energy_meter("wattmeter")
@@ -0,0 +1,212 @@
+import os
+from pathlib import Path
+import subprocess
+import time
+
+import pytest
+
+from ecooptimizer.measurements.base_energy_meter import OVERHEAD_RUNS, BaseEnergyMeter
+from ecooptimizer.measurements.energy_meters import create_energy_meter
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.script_runners import (
+    BaseScriptRunner,
+    ForkServerRunner,
+    RunLimits,
+    SubprocessRunner,
+    create_script_runner,
+)
+
+requires_fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+requires_wait4 = pytest.mark.skipif(not hasattr(os, "wait4"), reason="requires os.wait4")
+
+
+@pytest.fixture
+def fork_server():
+    runner = ForkServerRunner()
+    yield runner
+    runner.close()
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    (tmp_path / "helper.py").write_text("EXIT_CODE = 3\n")
+    (tmp_path / "main.py").write_text(
+        "import atexit\n"
+        "import sys\n"
+        "from pathlib import Path\n"
+        "import helper\n"
+        "print('output that must not reach the server')\n"
+        "atexit.register(lambda: Path(sys.argv[0]).with_name('done').write_text(__name__))\n"
+        "sys.exit(helper.EXIT_CODE)\n"
+    )
+    (tmp_path / "fails.py").write_text("raise ValueError('failed')\n")
+    (tmp_path / "succeeds.py").write_text("print('ok')\n")
+    return tmp_path
+
+
+@requires_fork
+def test_fork_server_runs_script_like_an_interpreter(fork_server, project):
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        fork_server.run(project / "main.py")
+
+    assert error.value.returncode == 3
+    assert (project / "done").read_text() == "__main__"
+
+
+@requires_fork
+def test_fork_server_waits_for_non_daemon_threads(fork_server, project):
+    (project / "threads.py").write_text(
+        "import threading\n"
+        "import time\n"
+        "from pathlib import Path\n"
+        "def finish():\n"
+        "    time.sleep(0.3)\n"
+        "    Path(__file__).with_name('threaded').write_text('done')\n"
+        "threading.Thread(target=finish).start()\n"
+    )
+
+    fork_server.run(project / "threads.py")
+
+    assert (project / "threaded").read_text() == "done"
+
+
+@requires_fork
+def test_fork_server_reports_failures_and_keeps_serving(fork_server, project):
+    with pytest.raises(subprocess.CalledProcessError):
+        fork_server.run(project / "fails.py")
+
+    fork_server.run(project / "succeeds.py")
+    fork_server.run(fork_server.empty_script)
+
+
+@requires_fork
+def test_fork_server_restarts_after_close(fork_server, project):
+    fork_server.run(project / "succeeds.py")
+    empty_dir = fork_server.empty_script.parent
+    fork_server.close()
+
+    assert not empty_dir.exists()
+    fork_server.run(project / "succeeds.py")
+
+
+class CountingRunner(BaseScriptRunner):
+    name = "counting"
+    subtracts_overhead = True
+
+    def __init__(self, empty_script: Path):
+        self._empty_script = empty_script
+
+    @property
+    def empty_script(self) -> Path:
+        return self._empty_script
+
+    def run(self, file_path: Path) -> None:
+        pass
+
+
+class FixedEnergyMeter(BaseEnergyMeter):
+    """Meter reading 1.0 for the empty script and 5.0 for anything else."""
+
+    def __init__(self, runner: BaseScriptRunner):
+        super().__init__(MeasurementCache(ttl=0), runner)
+        self.runs: list[Path] = []
+
+    def _measure_once(self, file_path: Path) -> bool:
+        self.runs.append(file_path)
+        self.emissions = 1.0 if file_path.name == "empty.py" else 5.0
+        self.emissions_data = {"emissions": self.emissions}
+        return True
+
+
+def test_runner_overhead_is_measured_once_and_subtracted(tmp_path):
+    empty_script = tmp_path / "empty.py"
+    meter = FixedEnergyMeter(CountingRunner(empty_script))
+
+    assert meter.measure_samples(tmp_path / "main.py", repetitions=3, warmups=0) == [4.0] * 3
+    assert meter.runs.count(empty_script) == OVERHEAD_RUNS
+    assert meter.emissions_data == {"emissions": 4.0, "run_overhead": 1.0}
+    assert meter.settings["runner"] == "counting"
+
+
+def test_subprocess_runner_has_no_overhead_subtracted(tmp_path):
+    meter = FixedEnergyMeter(SubprocessRunner())
+    meter.measure_energy(tmp_path / "main.py")
+
+    assert meter.emissions == 5.0
+    assert meter.runs == [tmp_path / "main.py"]
+
+
+def test_runners_are_selected_by_name():
+    meter = create_energy_meter("codecarbon", "fork-server")
+
+    assert isinstance(meter.runner, ForkServerRunner if hasattr(os, "fork") else SubprocessRunner)
+    with pytest.raises(ValueError, match="Unknown script runner"):
+        create_script_runner("thread")
+
+
+SANDBOXED_RUNNERS = [
+    pytest.param(SubprocessRunner, marks=requires_wait4),
+    pytest.param(ForkServerRunner, marks=requires_fork),
+]
+
+
+@pytest.fixture(params=SANDBOXED_RUNNERS)
+def sandboxed_runner(request):
+    def create(limits: RunLimits) -> BaseScriptRunner:
+        runner = request.param(limits)
+        runners.append(runner)
+        return runner
+
+    runners: list[BaseScriptRunner] = []
+    yield create
+    for runner in runners:
+        runner.close()
+
+
+def test_runs_report_resource_usage(sandboxed_runner, tmp_path):
+    script = tmp_path / "allocates.py"
+    script.write_text("data = bytearray(64 * 1024 * 1024)\n")
+
+    usage = sandboxed_runner(RunLimits()).run(script)
+
+    assert usage.max_rss > 64 * 1024 * 1024  # type: ignore
+    assert usage.user_time + usage.system_time > 0  # type: ignore
+
+
+def test_timeout_kills_the_whole_process_group(sandboxed_runner, tmp_path):
+    marker = tmp_path / "survived"
+    script = tmp_path / "hangs.py"
+    grandchild = f"import time; time.sleep(1); open({str(marker)!r}, 'w').close()"
+    script.write_text(
+        "import subprocess, sys, time\n"
+        f"subprocess.Popen([sys.executable, '-c', {grandchild!r}])\n"
+        "time.sleep(30)\n"
+    )
+    runner = sandboxed_runner(RunLimits(timeout=0.5))
+
+    start = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run(script)
+
+    assert time.perf_counter() - start < 5
+    time.sleep(1.5)
+    assert not marker.exists()
+
+
+def test_memory_limit_fails_the_run(sandboxed_runner, tmp_path):
+    script = tmp_path / "leaks.py"
+    script.write_text("data = bytearray(1024 * 1024 * 1024)\n")
+
+    with pytest.raises(subprocess.CalledProcessError):
+        sandboxed_runner(RunLimits(memory=512 * 1024 * 1024)).run(script)
+
+
+@requires_wait4
+def test_failed_run_keeps_error_output(tmp_path):
+    script = tmp_path / "fails.py"
+    script.write_text("raise ValueError('details of the failure')\n")
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        SubprocessRunner(RunLimits()).run(script)
+
+    assert "details of the failure" in error.value.stderr
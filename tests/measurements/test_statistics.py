@@ -0,0 +1,107 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ecooptimizer.api.error_handler import EnergySavingsError
+from ecooptimizer.api.routes.refactor_smell import perform_refactoring
+from ecooptimizer.data_types.custom_fields import Occurence
+from ecooptimizer.data_types.smell import Smell
+from ecooptimizer.measurements.statistics import (
+    compare_measurements,
+    interquartile_range,
+    mann_whitney_greater,
+    student_t_sf,
+    summarize,
+    welch_greater,
+)
+from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+
+BASELINE = [10.2, 10.8, 10.5, 11.1, 10.4, 10.9]
+FASTER = [8.1, 8.4, 7.9, 8.6, 8.3, 8.0]
+NOISY_SAME = [10.0, 11.3, 9.8, 10.9, 10.6, 10.1]
+
+
+def test_student_t_tail_matches_tables():
+    assert student_t_sf(2.0, 10) == pytest.approx(0.03669, abs=1e-5)
+    assert student_t_sf(-1.0, 5) == pytest.approx(0.81839, abs=1e-5)
+
+
+def test_exact_mann_whitney_p_value():
+    # Every baseline sample is larger: 1 ordering out of C(6, 3) = 20
+    assert mann_whitney_greater([5, 6, 7], [1, 2, 3]) == pytest.approx(1 / 20)
+    assert mann_whitney_greater([1, 2, 3], [5, 6, 7]) == pytest.approx(1.0)
+
+
+def test_mann_whitney_handles_ties():
+    assert mann_whitney_greater([4, 4, 4], [4, 4, 4]) == 1.0
+    assert mann_whitney_greater([5, 5, 6, 7], [1, 1, 2, 5]) < 0.05
+
+
+def test_welch_separates_shifted_samples():
+    assert welch_greater(BASELINE, FASTER) < 0.001
+    assert welch_greater(BASELINE, NOISY_SAME) > 0.05
+
+
+def test_summary_reports_median_iqr_and_interval():
+    summary = summarize([1.0, 2.0, 3.0, 4.0, 100.0])
+
+    assert summary.samples == 5
+    assert summary.median == 3.0
+    assert summary.iqr == interquartile_range([1.0, 2.0, 3.0, 4.0, 100.0]) == 2.0
+    assert summary.low <= summary.median <= summary.high
+
+
+@pytest.mark.parametrize("test", ["mann-whitney", "welch"])
+def test_only_significant_savings_are_accepted(test):
+    accepted = compare_measurements(BASELINE, FASTER, test)
+    rejected = compare_measurements(BASELINE, NOISY_SAME, test)
+
+    assert accepted.significant
+    assert accepted.pValue < 0.05  # type: ignore
+    assert accepted.low <= accepted.median <= accepted.high
+    assert accepted.low > 0
+
+    # The median is lower, but not significantly so
+    assert rejected.median > 0
+    assert not rejected.significant
+
+
+def test_single_samples_fall_back_to_comparing_values():
+    savings = compare_measurements([10.0], [9.0])
+
+    assert savings.significant
+    assert savings.test is None
+    assert savings.pValue is None
+    assert (savings.low, savings.median, savings.high) == (1.0, 1.0, 1.0)
+
+
+def test_unknown_test_is_rejected():
+    with pytest.raises(ValueError, match="Unknown significance test"):
+        compare_measurements(BASELINE, FASTER, "sign")
+
+
+def test_refactoring_without_significant_savings_is_rejected():
+    smell = Smell(
+        confidence="UNKNOWN",
+        message="message",
+        messageId="smellID",
+        module="module",
+        obj="obj",
+        path=str(Path("source_dir/file.py").absolute()),
+        symbol="smell-symbol",
+        type="type",
+        occurences=[Occurence(line=1, endLine=1, column=0, endColumn=1)],
+    )
+
+    with (
+        patch.dict(
+            "ecooptimizer.config.CONFIG", {"mode": "production", "measurementRepetitions": 6}
+        ),
+        patch("ecooptimizer.measurements.emissions.get_energy_meter") as get_energy_meter,
+        patch.object(RefactorerController, "run_refactorer", return_value=[]),
+        patch("shutil.rmtree"),
+    ):
+        get_energy_meter.return_value.measure_samples.return_value = NOISY_SAME
+        with pytest.raises(EnergySavingsError):
+            perform_refactoring(Path("source_dir").absolute(), smell, BASELINE, Path("/existing"))
@@ -0,0 +1,88 @@
+from pathlib import Path
+import subprocess
+
+import pytest
+
+from ecooptimizer.config import CONFIG
+from ecooptimizer.measurements.measurement_cache import MeasurementCache
+from ecooptimizer.measurements.script_runners import RunLimits, SubprocessRunner
+from ecooptimizer.measurements.workloads import find_importing_tests, workload_script
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    project = tmp_path / "project"
+    (project / "pkg" / "tests").mkdir(parents=True)
+    (project / "pkg" / "__init__.py").write_text("")
+    (project / "pkg" / "tests" / "__init__.py").write_text("")
+    (project / "pkg" / "shapes.py").write_text("def area(side):\n    return side * side\n")
+    (project / "pkg" / "other.py").write_text("VALUE = 1\n")
+    (project / "pkg" / "tests" / "test_relative.py").write_text(
+        "from ..shapes import area\n\ndef test_area():\n    assert area(3) == 9\n"
+    )
+    (project / "test_absolute.py").write_text(
+        "import pkg.shapes\n\ndef test_area():\n    assert pkg.shapes.area(2) == 4\n"
+    )
+    (project / "test_other.py").write_text("from pkg import other\n")
+    return project
+
+
+@pytest.fixture
+def workload(monkeypatch):
+    def select(name: str, tests: str = "", command: str = "") -> None:
+        monkeypatch.setitem(CONFIG, "workload", name)
+        monkeypatch.setitem(CONFIG, "workloadTests", tests)
+        monkeypatch.setitem(CONFIG, "workloadCommand", command)
+
+    return select
+
+
+def test_finds_tests_importing_a_module(project):
+    assert find_importing_tests(project / "pkg" / "shapes.py", project) == [
+        project / "pkg" / "tests" / "test_relative.py",
+        project / "test_absolute.py",
+    ]
+
+
+def test_script_workload_executes_the_module(project, workload):
+    workload("script")
+    assert workload_script(project / "pkg" / "shapes.py", project) == project / "pkg" / "shapes.py"
+
+
+def test_tests_workload_runs_the_importing_tests(project, workload):
+    workload("tests")
+    driver = workload_script(project / "pkg" / "shapes.py", project)
+
+    assert "test_absolute.py" in driver.read_text()
+    assert "test_other.py" not in driver.read_text()
+    SubprocessRunner(RunLimits()).run(driver)
+
+    (project / "pkg" / "shapes.py").write_text("def area(side):\n    return side\n")
+    with pytest.raises(subprocess.CalledProcessError):
+        SubprocessRunner(RunLimits()).run(driver)
+    assert not (project / ".pytest_cache").exists()
+
+
+def test_tests_workload_without_tests_executes_the_module(project, workload):
+    (project / "pkg" / "unused.py").write_text("VALUE = 2\n")
+    workload("tests")
+
+    assert workload_script(project / "pkg" / "unused.py", project) == project / "pkg" / "unused.py"
+
+
+def test_command_workload_runs_from_the_project(project, workload):
+    workload("command", command="python -c \"open('ran', 'w').write('{file}')\"")
+    driver = workload_script(project / "pkg" / "shapes.py", project)
+
+    SubprocessRunner(RunLimits()).run(driver)
+    assert (project / "ran").read_text() == str((project / "pkg" / "shapes.py").resolve())
+
+
+def test_driver_key_changes_with_the_project(project, workload):
+    workload("tests")
+    driver = workload_script(project / "pkg" / "shapes.py", project)
+    cache = MeasurementCache(ttl=60)
+    key = cache.make_key(driver, project, {"meter": "test"})
+
+    (project / "pkg" / "shapes.py").write_text("def area(side):\n    return side**2\n")
+    assert cache.make_key(driver, project, {"meter": "test"}) != key
@@ -0,0 +1,71 @@
+from pathlib import Path
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ecooptimizer.refactorers.candidate_pipeline import Candidate, CandidatePipeline
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_every_smell_is_refactored_in_its_own_workspace(make_use_a_generator_smell, project, jobs):
+    target = project / "checks.py"
+    original = target.read_text()
+    smells = [make_use_a_generator_smell(target, 2), make_use_a_generator_smell(target, 6)]
+    candidates: list[Candidate] = []
+
+    results = list(CandidatePipeline(candidates.append, jobs).run(project, smells))
+
+    assert results == [None, None]
+    assert sorted(candidate.smell.occurences[0].line for candidate in candidates) == [2, 6]
+    assert len({candidate.temp_dir for candidate in candidates}) == 2
+    for candidate in candidates:
+        assert candidate.error is None
+        refactored = candidate.target_file.read_text()
+        assert refactored.count("[") == 2
+        assert candidate.target_file.is_relative_to(candidate.source_copy)
+        shutil.rmtree(candidate.temp_dir)
+    assert target.read_text() == original
+
+
+def test_failed_refactorings_are_still_evaluated(make_use_a_generator_smell, project):
+    smell = make_use_a_generator_smell(project / "checks.py", 2)
+    smell.symbol = "unknown-smell"
+
+    results = list(CandidatePipeline(lambda candidate: candidate, 1).run(project, [smell]))
+
+    assert len(results) == 1
+    assert results[0].error is not None
+    shutil.rmtree(results[0].temp_dir)
+
+
+def test_workspaces_of_unconsumed_candidates_are_removed(
+    make_use_a_generator_smell, project, tmp_path
+):
+    target = project / "checks.py"
+    smells = [
+        make_use_a_generator_smell(target, 2),
+        make_use_a_generator_smell(target, 6),
+        make_use_a_generator_smell(target, 2),
+    ]
+    temp_root = tmp_path / "temp"
+    temp_root.mkdir()
+
+    def evaluate(candidate: Candidate) -> Path:
+        shutil.rmtree(candidate.temp_dir)
+        return candidate.temp_dir
+
+    with patch(
+        "ecooptimizer.refactorers.candidate_pipeline.mkdtemp",
+        side_effect=lambda prefix: tempfile.mkdtemp(prefix=prefix, dir=temp_root),
+    ):
+        results = CandidatePipeline(evaluate, 2).run(project, smells)
+        next(results)
+        results.close()
+
+    deadline = time.monotonic() + 60
+    while any(temp_root.iterdir()) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not any(temp_root.iterdir())
@@ -0,0 +1,123 @@
+from pathlib import Path
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+from ecooptimizer.refactorers.refactoring_session import (
+    RefactoringSession,
+    apply_smells,
+    relocate_smell,
+)
+from ecooptimizer.utils.edit_ranges import EditRange
+from ecooptimizer.utils.workspace import Workspace
+
+SOURCE = textwrap.dedent("""\
+    def all_non_negative(numbers):
+        return all([num >= 0 for num in numbers])
+
+
+    def any_negative(numbers):
+        return any(
+            [num < 0 for num in numbers]
+        )
+
+
+    def all_small(numbers):
+        return all([num < 10 for num in numbers])
+    """)
+
+
+@pytest.fixture
+def project(project: Path) -> Path:
+    # The smell of `any_negative` spans several lines
+    (project / "checks.py").write_text(SOURCE)
+    return project
+
+
+def test_smells_are_shifted_past_earlier_edits(make_use_a_generator_smell, project):
+    smell = make_use_a_generator_smell(project / "checks.py", 10, 12)
+    # Two lines inserted above the smell, then one line replaced by three below it
+    edits = [[EditRange(2, 2, 2, 4)], [EditRange(20, 21, 20, 23)]]
+
+    relocated = relocate_smell(smell, edits)
+
+    assert relocated is not None
+    assert (relocated.occurences[0].line, relocated.occurences[0].endLine) == (12, 14)
+    assert smell.occurences[0].line == 10
+
+
+def test_smells_touched_by_earlier_edits_conflict(make_use_a_generator_smell, project):
+    smell = make_use_a_generator_smell(project / "checks.py", 5, 7)
+
+    assert relocate_smell(smell, [[EditRange(6, 7, 6, 6)]]) is None
+    assert relocate_smell(smell, [[EditRange(6, 6, 6, 8)]]) is None
+    assert relocate_smell(smell, [[EditRange(5, 5, 5, 6)]]) is not None
+
+
+def test_smells_are_applied_in_one_workspace(make_use_a_generator_smell, project, tmp_path):
+    target = project / "checks.py"
+    smells = [
+        make_use_a_generator_smell(target, 2),
+        make_use_a_generator_smell(target, 6, 8),
+        make_use_a_generator_smell(target, 12),
+    ]
+
+    workspace = Workspace.create(project, tmp_path / "workspace" / "project")
+
+    result = apply_smells(RefactorerController(), project, target, smells, workspace)
+
+    assert result.applied == smells
+    refactored = result.target_file.read_text()
+    assert "all(num >= 0 for num in numbers)" in refactored
+    assert "all(num < 10 for num in numbers)" in refactored
+    assert "[" not in refactored
+    assert result.modified_files == [result.target_file.resolve()]
+    assert target.read_text() == SOURCE
+
+
+def test_conflicting_smells_are_skipped(make_use_a_generator_smell, project, tmp_path):
+    target = project / "checks.py"
+    first, duplicate = make_use_a_generator_smell(target, 2), make_use_a_generator_smell(target, 2)
+
+    workspace = Workspace.create(project, tmp_path / "workspace")
+
+    result = apply_smells(RefactorerController(), project, target, [first, duplicate], workspace)
+
+    assert result.applied == [first]
+    assert result.conflicts == [duplicate]
+
+
+def test_rejected_batches_are_reverted_in_one_workspace(
+    make_use_a_generator_smell, project, tmp_path
+):
+    target = project / "checks.py"
+    smells = [
+        make_use_a_generator_smell(target, 2),
+        make_use_a_generator_smell(target, 6, 8),
+        make_use_a_generator_smell(target, 12),
+    ]
+    workspace_dir = tmp_path / "session"
+    workspace_dir.mkdir()
+    # Whole batch, first smell, last two smells, second smell, third smell
+    samples = [[12.0], [8.0], [9.0], [7.0], [7.5]]
+
+    with (
+        patch(
+            "ecooptimizer.refactorers.refactoring_session.mkdtemp",
+            return_value=str(workspace_dir),
+        ) as mock_mkdtemp,
+        patch("ecooptimizer.refactorers.refactoring_session.measure_samples", side_effect=samples),
+    ):
+        session = RefactoringSession(RefactorerController(), project, target, [10.0], True)
+        session.settle(smells)
+
+    mock_mkdtemp.assert_called_once()
+    assert session.accepted == smells[:2]
+    assert session.rejected == smells[2:]
+    refactored = (workspace_dir / project.name / "checks.py").read_text()
+    assert "all(num >= 0 for num in numbers)" in refactored
+    assert "any(\n        num < 0 for num in numbers\n    )" in refactored
+    assert "all([num < 10 for num in numbers])" in refactored
+    assert target.read_text() == SOURCE
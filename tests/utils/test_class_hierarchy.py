@@ -0,0 +1,95 @@
+import os
+from pathlib import Path
+import shutil
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from ecooptimizer.utils import class_hierarchy
+from ecooptimizer.utils.class_hierarchy import ClassHierarchyIndex
+
+SHAPES = textwrap.dedent("""\
+    class Shape:
+        def area(self):
+            return 0
+
+        def describe(self):
+            return "shape"
+
+
+    class Square(Shape):
+        def area(self):
+            return 4
+    """)
+
+CIRCLE = textwrap.dedent("""\
+    import shapes
+
+
+    class Circle(shapes.Shape):
+        pass
+
+
+    class Ring(Shape, metaclass=Meta):
+        async def describe(self):
+            return "ring"
+    """)
+
+
+@pytest.fixture
+def project(tmp_path) -> Path:
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "shapes.py").write_text(SHAPES)
+    (project / "circle.py").write_text(CIRCLE)
+    return project
+
+
+def files(project: Path) -> list[Path]:
+    return sorted(project.glob("*.py"))
+
+
+def test_hierarchy_records_bases_methods_and_locations(project):
+    hierarchy = ClassHierarchyIndex().hierarchy(project, files(project))
+
+    assert [(info.name, info.line) for info in hierarchy.subclasses("Shape")] == [
+        ("Ring", 8),
+        ("Square", 9),
+    ]
+    assert [info.name for info in hierarchy.subclasses("shapes.Shape")] == ["Circle"]
+    assert hierarchy.classes["Shape"][0].methods == ("area", "describe")
+    assert hierarchy.classes["Ring"][0].methods == ("describe",)
+    assert hierarchy.files_defining("Square") == [project.absolute() / "shapes.py"]
+
+
+def test_index_is_persisted_and_shared_by_identical_files(project, tmp_path):
+    db_path = tmp_path / "class_hierarchy.sqlite3"
+    ClassHierarchyIndex(db_path).hierarchy(project, files(project))
+    workspace = tmp_path / "workspace"
+    shutil.copytree(project, workspace)
+
+    with patch.object(
+        class_hierarchy, "collect_classes", wraps=class_hierarchy.collect_classes
+    ) as mock_collect:
+        index = ClassHierarchyIndex(db_path)
+        index.hierarchy(project, files(project))
+        hierarchy = index.hierarchy(workspace, files(workspace))
+
+    mock_collect.assert_not_called()
+    assert hierarchy.files_defining("Circle") == [workspace.absolute() / "circle.py"]
+
+
+def test_changed_files_are_parsed_again(project):
+    index = ClassHierarchyIndex()
+    index.hierarchy(project, files(project))
+    shapes = project / "shapes.py"
+    shapes.write_text(SHAPES.replace("class Square(Shape)", "class Square"))
+    # Make sure the rewrite is visible even on coarse modification times
+    stat = shapes.stat()
+    os.utime(shapes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    hierarchy = index.hierarchy(project, files(project))
+
+    assert [info.name for info in hierarchy.subclasses("Shape")] == ["Ring"]
+    assert len(index) == 3
@@ -0,0 +1,26 @@
+from ecooptimizer.utils.edit_ranges import EditRange, compute_edit_ranges, shift_line
+
+OLD_SOURCE = "a = 1\nb = 2\nc = 3\nd = 4\n"
+
+
+def test_compute_edit_ranges_identical_source():
+    assert compute_edit_ranges(OLD_SOURCE, OLD_SOURCE) == []
+
+
+def test_compute_edit_ranges_replacement_and_insertion():
+    new_source = "a = 1\nb = 20\nc = 3\nx = 0\ny = 0\nd = 4\n"
+
+    assert compute_edit_ranges(OLD_SOURCE, new_source) == [
+        EditRange(2, 3, 2, 3),
+        EditRange(4, 4, 4, 6),
+    ]
+
+
+def test_shift_line_across_edits():
+    new_source = "a = 1\nd = 4\nz = 0\n"
+    edit_ranges = compute_edit_ranges(OLD_SOURCE, new_source)
+
+    assert shift_line(1, edit_ranges) == 1
+    assert shift_line(2, edit_ranges) is None
+    assert shift_line(3, edit_ranges) is None
+    assert shift_line(4, edit_ranges) == 2
@@ -0,0 +1,84 @@
+import ast
+import textwrap
+
+import pytest
+
+from ecooptimizer.utils.parsed_module import (
+    ParsedModuleCache,
+    PARSED_MODULE_CACHE,
+    get_parsed_module,
+    get_source,
+)
+
+
+SOURCE = textwrap.dedent("""\
+    def add(a, b):
+        return a + b
+    """)
+
+
+@pytest.fixture
+def cache():
+    return ParsedModuleCache(maxsize=2)
+
+
+def test_same_source_returns_shared_module(cache):
+    first = cache.get(SOURCE)
+    second = cache.get(SOURCE)
+
+    assert first is second
+    assert first.ast_tree is second.ast_tree
+
+
+def test_trees_are_built_lazily(cache):
+    module = cache.get(SOURCE)
+
+    assert "ast_tree" not in module.__dict__
+    assert "cst_module" not in module.__dict__
+
+    assert isinstance(module.ast_tree, ast.Module)
+    assert module.cst_module.code == SOURCE
+    assert module.astroid_module.body[0].name == "add"
+
+
+def test_lines_split_like_readlines(cache):
+    module = cache.get("a = 1\x0cb = 2\nc = 3")
+
+    assert module.lines == ["a = 1\x0cb = 2\n", "c = 3"]
+
+
+def test_least_recently_used_entry_evicted(cache):
+    first = cache.get("a = 1\n")
+    cache.get("b = 2\n")
+    cache.get("a = 1\n")
+    cache.get("c = 3\n")
+
+    assert len(cache) == 2
+    assert cache.get("a = 1\n") is first
+    assert cache.find_by_tree(first.ast_tree) is first
+
+
+def test_find_by_tree_unknown_tree(cache):
+    assert isinstance(cache.get(SOURCE).ast_tree, ast.Module)
+
+    assert cache.find_by_tree(ast.parse(SOURCE)) is None
+
+
+def test_changed_file_gets_new_module(tmp_path):
+    file = tmp_path / "module.py"
+    file.write_text(SOURCE)
+    before = get_parsed_module(file)
+
+    file.write_text(SOURCE + "\nx = add(1, 2)\n")
+    after = get_parsed_module(file)
+
+    assert before is not after
+    assert get_source(file, after.ast_tree) == after.source
+    PARSED_MODULE_CACHE.clear()
+
+
+def test_get_source_falls_back_to_file(tmp_path):
+    file = tmp_path / "module.py"
+    file.write_text(SOURCE)
+
+    assert get_source(file, ast.parse(SOURCE)) == SOURCE
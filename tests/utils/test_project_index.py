@@ -0,0 +1,113 @@
+from collections.abc import Iterator
+from pathlib import Path
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from ecooptimizer.data_types import LPLSmell, Occurence
+from ecooptimizer.refactorers.concrete.long_parameter_list import LongParameterListRefactorer
+from ecooptimizer.utils.project_index import (
+    PROJECT_INDEXES,
+    ProjectIndex,
+    collect_symbols,
+    get_project_index,
+)
+from ecooptimizer.utils.smell_enums import PylintSmell
+
+SOURCE = textwrap.dedent("""\
+    import os.path
+    from shop.models import Order as O
+
+
+    class Cart(Base):
+        def total(self, items):
+            return sum(item.price for item in items)
+
+
+    def checkout(cart):
+        return cart.total(load(os.path.sep))
+    """)
+
+
+@pytest.fixture
+def project(tmp_path) -> Iterator[Path]:
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    (project / "pkg" / "cart.py").write_text(SOURCE)
+    (project / "pkg" / "other.py").write_text("def unrelated():\n    return 1\n")
+    broken = project / "broken.py"
+    broken.write_text("def broken(:\n")
+    yield project
+    # Kept temporary directories must still compile
+    broken.unlink()
+
+
+def test_symbols_record_definitions_references_and_imports():
+    symbols = collect_symbols(SOURCE)
+
+    assert symbols.classes == {"Cart"}
+    assert symbols.functions == {"total", "checkout"}
+    assert symbols.calls == {"sum": (7,), "total": (11,), "load": (11,)}
+    assert {"price", "total", "path", "sep"} <= symbols.attributes
+    assert {"Base", "cart", "load"} <= symbols.names
+    assert symbols.imports == {"os.path", "os", "shop.models", "Order", "O"}
+    assert not symbols.mentions("Order_")
+
+
+def test_files_referencing_include_unparsable_files(project):
+    index = ProjectIndex(project)
+
+    referencing = index.files_referencing(["total"])
+
+    assert sorted(file.name for file in referencing) == ["broken.py", "cart.py"]
+    assert index.files_referencing([]) == []
+
+
+def test_rewritten_files_are_reindexed(project):
+    index = get_project_index(project)
+    other = project / "pkg" / "other.py"
+    assert not index.symbols(other).mentions("total")
+
+    PROJECT_INDEXES.invalidate(other)
+    other.write_text("def unrelated(cart):\n    return cart.total()\n")
+
+    assert index.symbols(other).mentions("total")
+    assert get_project_index(project) is index
+
+
+def test_refactorer_only_processes_referencing_files(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    target = project / "report.py"
+    target.write_text(
+        textwrap.dedent("""\
+        def report(a, b, c, d, e, f, g, unused):
+            return a + b + c + d + e + f + g
+        """)
+    )
+    caller = project / "caller.py"
+    caller.write_text("from report import report\n\nreport(1, 2, 3, 4, 5, 6, 7, 8)\n")
+    (project / "unrelated.py").write_text("def other():\n    return 1\n")
+    smell = LPLSmell(
+        path=str(target),
+        module="report",
+        obj=None,
+        type="refactor",
+        symbol="too-many-arguments",
+        message="Too many arguments (8/6)",
+        messageId=PylintSmell.LONG_PARAMETER_LIST.value,
+        confidence="UNDEFINED",
+        occurences=[Occurence(line=1, endLine=2, column=0, endColumn=0)],
+    )
+    refactorer = LongParameterListRefactorer()
+
+    with patch.object(refactorer, "_process_file", wraps=refactorer._process_file) as mock_process:
+        refactorer.refactor(target, project, smell, tmp_path / "out.py")
+
+    assert sorted(call.args[0].name for call in mock_process.call_args_list) == [
+        "caller.py",
+        "report.py",
+    ]
+    assert "report(DataParams_report_1(1, 2, 3, 4, 5, 6, 7))" in caller.read_text()
+    assert refactorer.modified_files == [caller.resolve()]
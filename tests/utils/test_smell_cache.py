@@ -0,0 +1,107 @@
+import textwrap
+
+import pytest
+
+from ecooptimizer.data_types.custom_fields import AdditionalInfo, CRCInfo, Occurence
+from ecooptimizer.data_types.smell import CRCSmell, Smell
+from ecooptimizer.utils.smell_cache import SmellCache, canonical_options
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SmellCache(tmp_path / "cache.sqlite3", max_entries=2)
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    file = tmp_path / "sample.py"
+    file.write_text(
+        textwrap.dedent("""\
+        def test_case():
+            result1 = expensive_function(42)
+            result2 = expensive_function(42)
+        """)
+    )
+    return file
+
+
+def make_smells(path):
+    occurence = Occurence(line=2, endLine=2, column=14, endColumn=36)
+    return [
+        CRCSmell(
+            confidence="MEDIUM",
+            message="Repeated function call detected",
+            messageId="CRC001",
+            module="sample",
+            obj=None,
+            path=str(path),
+            symbol="cached-repeated-calls",
+            type="performance",
+            occurences=[occurence, occurence],
+            additionalInfo=CRCInfo(callString="expensive_function(42)", repetitions=2),
+        ),
+        Smell(
+            confidence="UNDEFINED",
+            message="Dictionary chain too long (5/5)",
+            messageId="LEC001",
+            module="sample",
+            obj=None,
+            path=str(path),
+            symbol="long-element-chain",
+            type="convention",
+            occurences=[occurence],
+            additionalInfo=AdditionalInfo(),
+        ),
+    ]
+
+
+def test_round_trip_preserves_smell_models(cache, source_file):
+    key = cache.make_key(source_file, ["cached-repeated-calls"])
+    smells = make_smells(source_file)
+
+    assert cache.get(key) is None
+    cache.put(key, source_file, smells)
+
+    cached = cache.get(key)
+    assert cached == smells
+    assert isinstance(cached[0], CRCSmell)
+
+
+def test_key_depends_on_content_and_options(cache, source_file):
+    key = cache.make_key(source_file, ["cached-repeated-calls"])
+
+    assert cache.make_key(source_file, ["cached-repeated-calls"]) == key
+    assert cache.make_key(source_file, {"cached-repeated-calls": {"threshold": 3}}) != key
+
+    source_file.write_text(source_file.read_text() + "\n")
+    assert cache.make_key(source_file, ["cached-repeated-calls"]) != key
+
+
+def test_canonical_options_ignore_order():
+    first = canonical_options({"long-element-chain": {}, "cached-repeated-calls": {}})
+    second = canonical_options({"cached-repeated-calls": {}, "long-element-chain": {}})
+
+    assert first == second
+
+
+def test_least_recently_used_entry_evicted(cache, source_file):
+    cache.put("a", source_file, [])
+    cache.put("b", source_file, [])
+    cache.get("a")
+    cache.put("c", source_file, [])
+
+    assert len(cache) == 2
+    assert cache.get("a") == []
+    assert cache.get("b") is None
+
+
+def test_invalidate(cache, source_file, tmp_path):
+    other_file = tmp_path / "other.py"
+    other_file.write_text("x = 1\n")
+    cache.put("a", source_file, [])
+    cache.put("b", other_file, [])
+
+    assert cache.invalidate(source_file) == 1
+    assert cache.get("a") is None
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
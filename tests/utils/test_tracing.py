@@ -0,0 +1,79 @@
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+from astroid import parse
+
+from ecooptimizer.analyzers.astroid_analyzers.detect_string_concat_in_loop import (
+    detect_string_concat_in_loop,
+)
+from ecooptimizer.utils.tracing import TraceEvent, get_tracer, tracing
+
+CONCAT_CODE = """
+def test():
+    result = ""
+    for i in range(10):
+        result += str(i)
+"""
+
+
+def detect(code: str):
+    with patch.object(Path, "read_text", return_value=code):
+        return detect_string_concat_in_loop(Path("fake.py"), parse(code))
+
+
+def fail(message: str) -> str:
+    raise AssertionError(message)
+
+
+def test_tracer_is_disabled_outside_tracing():
+    trace = get_tracer("string-concat-loop")
+
+    assert not trace
+    trace(lambda: fail("thunk evaluated while tracing is off"))
+
+
+def test_only_enabled_categories_are_traced():
+    events: list[TraceEvent] = []
+
+    with tracing(["string-concat-loop"], events.append):
+        enabled = get_tracer("string-concat-loop")
+        disabled = get_tracer("cached-repeated-calls")
+        enabled(lambda: "rendered", line=3)
+        disabled(lambda: fail("thunk evaluated for a disabled category"))
+
+    assert [(event.category, event.message, event.fields) for event in events] == [
+        ("string-concat-loop", "rendered", {"line": 3})
+    ]
+    assert not get_tracer("string-concat-loop")
+
+
+def test_wildcard_enables_every_category():
+    with tracing(["*"]):
+        assert get_tracer("no-self-use")
+        assert get_tracer("string-concat-loop")
+
+
+def test_events_are_logged_with_their_structured_data(caplog):
+    logger = logging.getLogger("trace-test")
+
+    with caplog.at_level(logging.DEBUG, logger="trace-test"), tracing(["no-self-use"]):
+        get_tracer("no-self-use", logger)("Modifying method", line=7)
+
+    record = caplog.records[-1]
+    assert record.getMessage() == "[no-self-use] Modifying method"
+    assert record.trace_event["fields"] == {"line": 7}  # type: ignore
+
+
+def test_detector_traces_only_when_its_category_is_enabled():
+    untraced = detect(CONCAT_CODE)
+
+    events: list[TraceEvent] = []
+    with tracing(["string-concat-loop"], events.append):
+        traced = detect(CONCAT_CODE)
+
+    assert traced == untraced
+    assert any(
+        event.message == "Creating smell for node: result = result + str(i)" for event in events
+    )
+    assert {event.category for event in events} == {"string-concat-loop"}
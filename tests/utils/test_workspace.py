@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pytest
+
+from ecooptimizer.measurements.script_runners import RunLimits, SubprocessRunner
+from ecooptimizer.refactorers.refactorer_controller import RefactorerController
+from ecooptimizer.utils.workspace import Workspace
+
+
+@pytest.fixture
+def project(project: Path) -> Path:
+    (project / "pkg").mkdir()
+    (project / "checks.py").rename(project / "pkg" / "checks.py")
+    (project / ".git").mkdir()
+    (project / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (project / "data.bin").write_bytes(b"\0" * 4096)
+    return project
+
+
+def test_workspace_files_do_not_share_the_original(project, tmp_path):
+    workspace = Workspace.create(project, tmp_path / "workspace" / "project")
+
+    copy = workspace.root / "data.bin"
+    assert copy.read_bytes() == (project / "data.bin").read_bytes()
+    assert copy.stat().st_ino != (project / "data.bin").stat().st_ino
+    assert (workspace.root / "pkg" / "checks.py").stat().st_nlink == 1
+    assert not (workspace.root / ".git").exists()
+
+
+def test_workloads_writing_to_the_workspace_leave_the_original_untouched(project, tmp_path):
+    (project / "log.txt").write_text("original\n")
+    (project / "append.py").write_text(
+        "from pathlib import Path\n\n"
+        "with (Path(__file__).parent / 'log.txt').open('a') as log:\n"
+        "    log.write('measured\\n')\n"
+    )
+    workspace = Workspace.create(project, tmp_path / "workspace" / "project")
+
+    SubprocessRunner(RunLimits()).run(workspace.root / "append.py")
+
+    assert (workspace.root / "log.txt").read_text() == "original\nmeasured\n"
+    assert (project / "log.txt").read_text() == "original\n"
+
+
+def test_refactoring_a_workspace_leaves_the_original_untouched(
+    make_use_a_generator_smell, project, tmp_path
+):
+    original = (project / "pkg" / "checks.py").read_text()
+    workspace = Workspace.create(project, tmp_path / "workspace" / "project")
+    target = workspace.root / "pkg" / "checks.py"
+    smell = make_use_a_generator_smell(target, 2)
+
+    RefactorerController().run_refactorer(target, workspace.root, smell)
+
+    assert "all(num >= 0 for num in numbers)" in target.read_text()
+    assert (project / "pkg" / "checks.py").read_text() == original